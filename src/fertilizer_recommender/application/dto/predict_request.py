@@ -0,0 +1,30 @@
+"""
+predict_request.py
+
+Pourquoi ce fichier existe ?
+- Définir l'entrée d'une prédiction indépendamment du transport (HTTP, CLI…).
+
+À quoi ça sert réellement ?
+- Une observation = un dictionnaire {nom de colonne: valeur brute}
+  (mêmes colonnes que test.csv, hors id).
+- Un batch = une liste d'observations, scorées en un seul predict_proba.
+
+Très utile ?
+OUI. C'est le contrat d'entrée de l'API.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass(frozen=True)
+class PredictRequest:
+    """Une observation à scorer."""
+    features: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class BatchPredictRequest:
+    """Plusieurs observations scorées ensemble."""
+    records: List[PredictRequest] = field(default_factory=list)
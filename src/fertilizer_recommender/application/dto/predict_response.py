@@ -0,0 +1,31 @@
+"""
+predict_response.py
+
+Pourquoi ce fichier existe ?
+- Définir la sortie d'une prédiction indépendamment du transport (HTTP, CLI…).
+
+À quoi ça sert réellement ?
+- Top-K labels ordonnés + probabilités associées, pour une observation.
+
+Très utile ?
+OUI. C'est le contrat de sortie de l'API.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass(frozen=True)
+class PredictResponse:
+    """Recommandation top-K pour une observation."""
+    labels: List[str]
+    probabilities: List[float]
+
+    def as_kaggle_string(self) -> str:
+        return " ".join(self.labels)
+
+
+@dataclass(frozen=True)
+class BatchPredictResponse:
+    predictions: List[PredictResponse] = field(default_factory=list)
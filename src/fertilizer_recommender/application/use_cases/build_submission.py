@@ -10,32 +10,136 @@ Pourquoi ce fichier existe ?
 - Prédire TOP-3 sur test
 - Générer submission.csv
 
+Deux modes :
+- `execute` : test complet en mémoire, retourne la submission.
+- `execute_streaming` : test lu par blocs, predict + top-k par bloc, écriture
+  incrémentale du CSV. Mémoire bornée par la taille d'un bloc, et un thread
+  de prefetch optionnel lit le bloc suivant pendant le calcul.
+  Le fichier produit est identique octet pour octet au mode complet.
+
+Déduplication optionnelle (`deduplicator`) : seules les lignes aux features
+uniques sont prédites (par bloc en streaming), sortie inchangée.
+
 Est-ce critique ?
 OUI. Une virgule mal placée = submission rejetée.
 """
 
 from __future__ import annotations
+import queue
+import threading
+from typing import Any, Iterable, Iterator, Optional
+
 import pandas as pd
 
 from fertilizer_recommender.application.use_cases.predict_topk import PredictTopKUseCase
+from fertilizer_recommender.domain.interfaces.row_deduplicator import RowDeduplicator
+from fertilizer_recommender.domain.services.ranking_service import join_top_k_labels
+
+_SUBMISSION_COLUMNS = ["id", "Fertilizer Name"]
+_END_OF_STREAM = object()
 
 
 class BuildSubmissionUseCase:
-    def __init__(self, model_repository, id_col: str, top_k: int):
+    def __init__(
+        self,
+        model_repository,
+        id_col: str,
+        top_k: int,
+        prefetch: bool = True,
+        deduplicator: Optional[RowDeduplicator] = None,
+    ):
         self.model_repository = model_repository
         self.id_col = id_col
         self.top_k = top_k
+        self.prefetch = prefetch
+        self.deduplicator = deduplicator
 
     def execute(self, model_name: str, test_df: pd.DataFrame, output_path: str):
         pipeline = self.model_repository.load(model_name)
+        predictor = PredictTopKUseCase(pipeline, self.top_k, deduplicator=self.deduplicator)
+
+        submission = self._build_rows(predictor, test_df)
+        submission.to_csv(output_path, index=False)
+        return submission
+
+    def execute_streaming(
+        self,
+        model_name: str,
+        test_batches: Iterable[pd.DataFrame],
+        output_path: str,
+    ) -> int:
+        """
+        Submission par blocs (ex: `dataset_repository.iter_test_dataset(100_000)`).
+
+        Returns:
+            int: nombre de lignes écrites
+        """
+        pipeline = self.model_repository.load(model_name)
+        predictor = PredictTopKUseCase(pipeline, self.top_k, deduplicator=self.deduplicator)
 
-        predictor = PredictTopKUseCase(pipeline, self.top_k)
-        topk_preds = predictor.execute(test_df)
+        batches = _prefetched(test_batches) if self.prefetch else iter(test_batches)
+        n_rows = 0
 
-        submission = pd.DataFrame({
+        # newline="" : même fin de ligne que to_csv(path) en mode complet
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            pd.DataFrame(columns=_SUBMISSION_COLUMNS).to_csv(f, index=False)
+            for test_df in batches:
+                if len(test_df) == 0:
+                    continue
+                self._build_rows(predictor, test_df).to_csv(f, index=False, header=False)
+                n_rows += len(test_df)
+
+        return n_rows
+
+    def _build_rows(self, predictor: PredictTopKUseCase, test_df: pd.DataFrame) -> pd.DataFrame:
+        topk_idx = predictor.execute_indices(test_df)
+
+        # Les labels ne sont matérialisés qu'ici, au format Kaggle
+        return pd.DataFrame({
             "id": test_df[self.id_col],
-            "Fertilizer Name": [" ".join(preds) for preds in topk_preds],
+            "Fertilizer Name": join_top_k_labels(topk_idx, predictor.pipeline.classes_),
         })
 
-        submission.to_csv(output_path, index=False)
-        return submission
\ No newline at end of file
+
+def _prefetched(items: Iterable[Any], depth: int = 1) -> Iterator[Any]:
+    """
+    Lit `items` dans un thread dédié, `depth` éléments d'avance.
+
+    L'I/O (lecture CSV/Parquet, qui relâche le GIL) recouvre ainsi le calcul.
+    Les exceptions du producteur sont relancées côté consommateur.
+    """
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        # put interruptible : le consommateur peut abandonner à tout moment
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_END_OF_STREAM)
+        except BaseException as exc:  # relancée dans le thread principal
+            put(exc)
+
+    producer = threading.Thread(target=produce, name="submission-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
@@ -16,8 +16,11 @@ OUI. Sans ce use case, ton évaluation est dispersée et fragile.
 from __future__ import annotations
 from typing import Dict
 
-from fertilizer_recommender.domain.services.metric_service import map_at_k
-from fertilizer_recommender.domain.services.ranking_service import predict_top_k
+from fertilizer_recommender.domain.services.metric_service import map_at_k_indices
+from fertilizer_recommender.domain.services.ranking_service import (
+    encode_labels,
+    top_k_indices,
+)
 
 
 class EvaluateModelUseCase:
@@ -27,13 +30,10 @@ class EvaluateModelUseCase:
 
     def execute(self, X_df, y_true) -> Dict[str, float]:
         proba = self.pipeline.predict_proba(X_df)
-        topk = predict_top_k(
-            proba=proba,
-            class_labels=self.pipeline.classes_,
-            k=self.top_k,
-        )
+        topk_idx = top_k_indices(proba, k=self.top_k)
 
-        score = map_at_k(y_true, topk, k=self.top_k)
+        y_idx = encode_labels(y_true, self.pipeline.classes_)
+        score = map_at_k_indices(y_idx, topk_idx, k=self.top_k)
 
         return {
             f"map@{self.top_k}": score
@@ -0,0 +1,120 @@
+"""
+optimize_blend_weights.py
+
+Pourquoi ce fichier existe ?
+- Régler les poids d'un ensemble sans relancer aucun modèle.
+
+À quoi ça sert réellement ?
+- Relire les OOF de plusieurs runs de CV (OOFStore, sans copie).
+- Les aligner (mêmes lignes, mêmes classes).
+- Chercher les poids maximisant le MAP@3 OOF (blend_optimizer.py).
+- Retourner une config d'ensemble pondéré (membres + poids) prête à servir.
+
+Très utile ?
+OUI. Le réglage d'un blend prend quelques secondes au lieu de plusieurs heures.
+"""
+
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from fertilizer_recommender.domain.entities.oof_predictions import OOFPredictions
+from fertilizer_recommender.domain.interfaces.oof_store import OOFStore
+from fertilizer_recommender.domain.services.blend_optimizer import optimize_blend_weights
+
+
+@dataclass(frozen=True)
+class BlendResult:
+    members: List[str]
+    weights: List[float]
+    score: float
+    uniform_score: float
+    n_evaluations: int
+    seconds: float
+
+    def as_config(self) -> Dict[str, Any]:
+        """Section `ensemble` pondérée (voir build_probability_ensemble)."""
+        return {
+            "members": list(self.members),
+            "weights": [round(w, 6) for w in self.weights],
+            "oof_map_at_k": round(self.score, 6),
+        }
+
+
+class OptimizeBlendWeightsUseCase:
+    def __init__(self, oof_store: OOFStore, top_k: int = 3, **search_params):
+        self.oof_store = oof_store
+        self.top_k = top_k
+        self.search_params = search_params
+        self.logger = logger
+
+    def execute(
+        self,
+        run_names: Sequence[str],
+        model_names: Optional[Sequence[str]] = None,
+    ) -> BlendResult:
+        """
+        Args:
+            run_names: runs de CV dont les OOF sont blendés
+            model_names: modèles persistés correspondants (défaut : run_names)
+        """
+        model_names = list(model_names or run_names)
+        if len(model_names) != len(run_names):
+            raise ValueError("Un nom de modèle par run de CV est attendu.")
+
+        runs = [self.oof_store.load(name) for name in run_names]
+        probas, y_idx = _align(runs)
+
+        start = time.perf_counter()
+        search = optimize_blend_weights(probas, y_idx, k=self.top_k, **self.search_params)
+        seconds = time.perf_counter() - start
+
+        self.logger.success(
+            f"Blend OOF MAP@{self.top_k} = {search.score:.5f} "
+            f"(moyenne simple : {search.uniform_score:.5f}) — "
+            f"{search.n_evaluations} pondérations en {seconds:.1f}s"
+        )
+        return BlendResult(
+            members=model_names,
+            weights=search.weights.tolist(),
+            score=search.score,
+            uniform_score=search.uniform_score,
+            n_evaluations=search.n_evaluations,
+            seconds=seconds,
+        )
+
+
+def _align(runs: List[OOFPredictions]):
+    """Empile les OOF (m, n, c) dans l'ordre des lignes et des classes de la 1re run."""
+    if not runs:
+        raise ValueError("Aucune run OOF fournie.")
+
+    reference = runs[0]
+    row_index = np.asarray(reference.row_index)
+    probas = np.empty((len(runs), reference.n_rows, len(reference.classes)), dtype=np.float32)
+
+    for i, run in enumerate(runs):
+        proba = run.proba
+        if run.classes != reference.classes:
+            if sorted(run.classes) != sorted(reference.classes):
+                raise ValueError(f"Classes différentes entre {reference.run_name} et {run.run_name}.")
+            proba = proba[:, [run.classes.index(c) for c in reference.classes]]
+
+        if not np.array_equal(run.row_index, row_index):
+            # Mêmes lignes dans un autre ordre : réalignement sur la 1re run
+            order = np.argsort(run.row_index)
+            found = np.searchsorted(run.row_index, row_index, sorter=order)
+            positions = order[np.clip(found, 0, len(order) - 1)]
+            if run.n_rows != reference.n_rows or not np.array_equal(
+                np.asarray(run.row_index)[positions], row_index
+            ):
+                raise ValueError(f"Lignes OOF différentes entre {reference.run_name} et {run.run_name}.")
+            proba = np.asarray(proba)[positions]
+
+        probas[i] = proba
+
+    return probas, np.asarray(reference.y_idx)
@@ -8,24 +8,43 @@ Pourquoi ce fichier existe ?
 À quoi ça sert réellement ?
 - Prédire TOP-3 à partir d’un ensemble de modèles.
 - Réutilisable pour CV, test, submission.
+- Déduplication optionnelle (`deduplicator`) : l'ensemble ne prédit que les
+  lignes uniques (sortie identique).
 
 Très utile ?
 OUI.
 """
 
 from __future__ import annotations
-from fertilizer_recommender.domain.services.ranking_service import predict_top_k
+from typing import Optional
+
+import numpy as np
+
+from fertilizer_recommender.domain.interfaces.row_deduplicator import RowDeduplicator
+
+from fertilizer_recommender.domain.services.ranking_service import (
+    indices_to_labels,
+    top_k_indices,
+)
 
 
 class PredictEnsembleTopKUseCase:
-    def __init__(self, ensemble, top_k: int):
+    def __init__(self, ensemble, top_k: int, deduplicator: Optional[RowDeduplicator] = None):
         self.ensemble = ensemble
         self.top_k = top_k
+        self.deduplicator = deduplicator
 
     def execute(self, X_df):
+        """Top-K labels par ligne (listes de strings)."""
+        topk_idx = self.execute_indices(X_df)
+        return indices_to_labels(topk_idx, self.ensemble.classes_).tolist()
+
+    def execute_indices(self, X_df) -> np.ndarray:
+        """Top-K compact (n, k) : indices dans `ensemble.classes_`."""
+        if self.deduplicator is not None:
+            return self.deduplicator.apply(X_df, self._top_k)
+        return self._top_k(X_df)
+
+    def _top_k(self, X_df) -> np.ndarray:
         proba = self.ensemble.predict_proba(X_df)
-        return predict_top_k(
-            proba=proba,
-            class_labels=self.ensemble.classes_,
-            k=self.top_k,
-        )
\ No newline at end of file
+        return top_k_indices(proba, k=self.top_k)
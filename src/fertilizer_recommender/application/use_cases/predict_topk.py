@@ -8,24 +8,70 @@ Pourquoi ce fichier existe ?
 À quoi ça sert réellement ?
 - Prédire les TOP-K labels.
 - Réutilisable pour évaluation et submission.
+- Déduplication optionnelle (`deduplicator`) : predict + top-k sur les
+  lignes uniques seulement, puis retour à l'ordre d'origine (sortie identique).
 
 Est-ce critique ?
 OUI.
 """
 
 from __future__ import annotations
-from fertilizer_recommender.domain.services.ranking_service import predict_top_k
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fertilizer_recommender.application.dto.predict_request import PredictRequest
+from fertilizer_recommender.application.dto.predict_response import PredictResponse
+from fertilizer_recommender.domain.interfaces.row_deduplicator import RowDeduplicator
+from fertilizer_recommender.domain.services.ranking_service import (
+    indices_to_labels,
+    top_k_indices,
+)
 
 
 class PredictTopKUseCase:
-    def __init__(self, pipeline, k: int):
+    def __init__(self, pipeline, k: int, deduplicator: Optional[RowDeduplicator] = None):
         self.pipeline = pipeline
         self.k = k
+        self.deduplicator = deduplicator
 
     def execute(self, X_df):
+        """Top-K labels par ligne (listes de strings)."""
+        topk_idx = self.execute_indices(X_df)
+        return indices_to_labels(topk_idx, self.pipeline.classes_).tolist()
+
+    def execute_indices(self, X_df) -> np.ndarray:
+        """Top-K compact (n, k) : indices dans `pipeline.classes_`."""
+        if self.deduplicator is not None:
+            # Top-k calculé sur les lignes uniques : seul (n, k) est ré-indexé
+            return self.deduplicator.apply(X_df, self._top_k)
+        return self._top_k(X_df)
+
+    def _top_k(self, X_df) -> np.ndarray:
         proba = self.pipeline.predict_proba(X_df)
-        return predict_top_k(
-            proba=proba,
-            class_labels=self.pipeline.classes_,
-            k=self.k,
-        )
+        return top_k_indices(proba, k=self.k)
+
+    def predict(self, requests: Sequence[PredictRequest]) -> List[PredictResponse]:
+        """
+        Score un lot d'observations (DTO) en UN seul predict_proba.
+
+        Utilisé par l'API : les requêtes unitaires y sont regroupées en micro-batchs.
+        """
+        if not requests:
+            return []
+
+        records = [request.features for request in requests]
+        if hasattr(self.pipeline, "predict_proba_records"):
+            # pipeline compilé (compiled_pipeline.py) : pas de DataFrame
+            proba = self.pipeline.predict_proba_records(records)
+        else:
+            proba = self.pipeline.predict_proba(pd.DataFrame.from_records(records))
+        topk_idx = top_k_indices(proba, k=self.k)
+
+        labels = indices_to_labels(topk_idx, self.pipeline.classes_).tolist()
+        scores = np.take_along_axis(proba, topk_idx.astype(np.intp), axis=1).tolist()
+        return [
+            PredictResponse(labels=row_labels, probabilities=row_scores)
+            for row_labels, row_scores in zip(labels, scores)
+        ]
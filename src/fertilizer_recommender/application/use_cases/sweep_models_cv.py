@@ -0,0 +1,411 @@
+"""
+sweep_models_cv.py
+
+Pourquoi ce fichier existe ?
+- Comparer N modèles = N CV complètes : N fois les splits, le feature
+  engineering et le preprocessing de chaque fold, pour des matrices identiques.
+
+À quoi ça sert ?
+- Une seule passe sur les folds partagés, pour une liste de modèles :
+    splits + features pré-calculées : une fois
+    preprocessing de fold : une fois par profil (signature du FeaturePipeline),
+    partagé par tous les modèles de ce profil (ex: les 3 boosters en "native")
+    fit + predict : chaque modèle, éventuellement en parallèle (threads)
+- Tracking : une run parente (le sweep) + une run enfant par modèle
+  (scores par fold, moyenne, temps, OOF).
+- Tableau comparatif : MAP@3 (moyenne, écart-type), temps de fit et de
+  predict, itérations retenues par l'early stopping.
+
+Très utile ?
+OUI pour choisir les modèles d'un ensemble : même folds, même preprocessing,
+un seul passage sur les données.
+"""
+from __future__ import annotations
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from fertilizer_recommender.application.use_cases.train_with_cv import (
+    CVResult,
+    FoldResult,
+    aggregate_best_iterations,
+)
+from fertilizer_recommender.domain.interfaces.fold_executor import FoldExecutor
+from fertilizer_recommender.domain.interfaces.oof_store import OOFStore
+from fertilizer_recommender.domain.services.metric_service import map_at_k_indices
+from fertilizer_recommender.domain.services.ranking_service import (
+    encode_labels,
+    top_k_indices,
+)
+from fertilizer_recommender.domain.services.experiment_tracking_service import (
+    ExperimentTrackingService
+)
+
+
+@dataclass(frozen=True)
+class SweepFoldResult:
+    fold: int
+    results: Dict[str, FoldResult]
+    # Preprocessing partagé (fit + transform train / validation) du fold
+    preprocess_seconds: float
+    n_preprocessings: int
+
+
+@dataclass(frozen=True)
+class ModelSweepSummary:
+    model: str
+    fold_scores: List[float]
+    mean_score: float
+    std_score: float
+    # Totaux sur les folds, modèle seul (hors preprocessing partagé)
+    fit_seconds: float
+    predict_seconds: float
+    best_iterations: List[int] = field(default_factory=list)
+    final_n_iterations: Optional[int] = None
+
+    def as_cv_result(self) -> CVResult:
+        return CVResult(
+            fold_scores=self.fold_scores,
+            mean_score=self.mean_score,
+            best_iterations=self.best_iterations,
+            final_n_iterations=self.final_n_iterations,
+        )
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    summaries: List[ModelSweepSummary]
+    preprocess_seconds: float
+    top_k: int = 3
+
+    def to_frame(self) -> pd.DataFrame:
+        """Tableau comparatif, meilleur MAP@K en premier."""
+        metric = f"map_{self.top_k}"
+        rows = [
+            {
+                "model": s.model,
+                f"{metric}_mean": s.mean_score,
+                f"{metric}_std": s.std_score,
+                "fit_seconds": s.fit_seconds,
+                "predict_seconds": s.predict_seconds,
+                "final_n_iterations": s.final_n_iterations,
+            }
+            for s in self.summaries
+        ]
+        frame = pd.DataFrame(rows)
+        if frame.empty:
+            return frame
+        return frame.sort_values(f"{metric}_mean", ascending=False, kind="stable").reset_index(drop=True)
+
+    def summary(self, model: str) -> ModelSweepSummary:
+        for s in self.summaries:
+            if s.model == model:
+                return s
+        raise KeyError(model)
+
+
+class SweepModelsCVUseCase:
+    """
+    CV de plusieurs modèles sur les mêmes folds, en une passe.
+
+    `pipeline_factories` : nom du modèle -> factory de TrainingPipeline (même
+    contrat que TrainWithCVUseCase). Dans chaque fold, les pipelines dont le
+    FeaturePipeline a la même `signature` partagent un seul preprocessing
+    appris ; un pipeline sans signature apprend le sien.
+
+    Parallélisme :
+    - `fold_executor` (optionnel) : folds dans des process séparés, comme
+      TrainWithCVUseCase (chaque worker traite tous les modèles du fold) ;
+    - `model_workers` > 1 : modèles d'un même fold dans un pool de threads
+      (les boosters libèrent le GIL ; borner leurs threads en conséquence).
+
+    Les logs suivent l'ordre des folds. Les runs enfants (une par modèle) sont
+    écrites à la fin du sweep : une run MLflow enfant ne peut pas rester
+    ouverte pendant que l'on écrit dans une autre.
+    """
+
+    def __init__(
+        self,
+        experiment_service: ExperimentTrackingService,
+        splitter_factory: Callable[[], Any],
+        pipeline_factories: Mapping[str, Callable[[], Any]],
+        top_k: int = 3,
+        fold_executor: Optional[FoldExecutor] = None,
+        feature_precomputer: Optional[Callable[[Any], Any]] = None,
+        oof_store: Optional[OOFStore] = None,
+        early_stopping: bool = False,
+        iteration_scale: float = 1.0,
+        model_workers: int = 1,
+        report_dir: Optional[Path] = None,
+    ):
+        if not pipeline_factories:
+            raise ValueError("Au moins un modèle est requis pour un sweep.")
+
+        self.experiment_service = experiment_service
+        self.splitter_factory = splitter_factory
+        self.pipeline_factories = dict(pipeline_factories)
+        self.top_k = top_k
+        self.fold_executor = fold_executor
+        self.feature_precomputer = feature_precomputer
+        self.oof_store = oof_store
+        self.early_stopping = early_stopping
+        self.iteration_scale = iteration_scale
+        self.model_workers = model_workers
+        self.report_dir = report_dir
+        self.logger = logger
+
+    @property
+    def model_names(self) -> List[str]:
+        return list(self.pipeline_factories)
+
+    def execute(
+        self,
+        X_df,
+        y,
+        *,
+        experiment_name: str,
+        run_name: str,
+        params: Dict[str, Any],
+    ) -> SweepResult:
+        splitter = self.splitter_factory()
+        y_array = np.array(y)
+
+        if self.feature_precomputer is not None:
+            X_df = self.feature_precomputer(X_df)
+
+        # Splits calculés une seule fois, dans le process parent
+        splits = list(splitter.split(X_df, y_array))
+        folds = list(range(1, len(splits) + 1))
+
+        def run_fold(fold: int) -> SweepFoldResult:
+            return self._run_fold(fold, X_df, y_array, *splits[fold - 1])
+
+        results: Dict[str, List[FoldResult]] = {name: [] for name in self.model_names}
+        preprocess_seconds = 0.0
+
+        with self.experiment_service.experiment(
+            experiment_name=experiment_name,
+            run_name=run_name,
+        ):
+            self.experiment_service.log_training_context(
+                model_name="sweep",
+                params={**params, "models": ",".join(self.model_names)},
+            )
+
+            oof_writers = {}
+            if self.oof_store is not None:
+                classes = np.unique(y_array)
+                for name in self.model_names:
+                    oof_writers[name] = self.oof_store.open_writer(
+                        f"{run_name}_{name}",
+                        row_index=np.asarray(X_df.index),
+                        y_idx=encode_labels(y_array, classes),
+                        classes=classes.tolist(),
+                    )
+
+            if self.fold_executor is None:
+                completed = ((fold, run_fold(fold)) for fold in folds)
+            else:
+                completed = self.fold_executor.map_folds(run_fold, folds)
+
+            try:
+                # Même réordonnancement que TrainWithCVUseCase
+                pending: Dict[int, SweepFoldResult] = {}
+                next_fold = 1
+                for fold, sweep_fold in completed:
+                    pending[fold] = sweep_fold
+                    while next_fold in pending:
+                        sweep_fold = pending.pop(next_fold)
+                        self._log_fold(sweep_fold)
+                        preprocess_seconds += sweep_fold.preprocess_seconds
+                        for name, result in sweep_fold.results.items():
+                            results[name].append(result)
+                            if name in oof_writers:
+                                oof_writers[name].write_fold(
+                                    result.fold, splits[result.fold - 1][1],
+                                    result.proba, result.classes,
+                                )
+                        next_fold += 1
+            except BaseException:
+                for writer in oof_writers.values():
+                    writer.abort()
+                raise
+
+            summaries = []
+            for name in self.model_names:
+                summary = self._summarize(name, results[name])
+                summaries.append(summary)
+                manifest = oof_writers[name].close() if name in oof_writers else None
+                self._log_model_run(f"{run_name}_{name}", summary, params, manifest)
+
+            sweep = SweepResult(
+                summaries=summaries,
+                preprocess_seconds=preprocess_seconds,
+                top_k=self.top_k,
+            )
+            self._log_sweep(run_name, sweep)
+
+        return sweep
+
+    # ------------------------------------------------------------------
+    # Fold
+    # ------------------------------------------------------------------
+
+    def _run_fold(self, fold: int, X_df, y_array, tr_idx, va_idx) -> SweepFoldResult:
+        X_train_df, X_val_df = X_df.iloc[tr_idx], X_df.iloc[va_idx]
+        y_train, y_val = y_array[tr_idx], y_array[va_idx]
+        pipelines = {name: factory() for name, factory in self.pipeline_factories.items()}
+
+        # Preprocessing (et compaction des doublons) appris une fois par
+        # signature, partagé par les modèles
+        start = time.perf_counter()
+        matrices: Dict[Any, tuple] = {}
+        keys: Dict[str, Any] = {}
+        for name, pipeline in pipelines.items():
+            key = getattr(pipeline.transformer, "signature", None)
+            compactor = getattr(pipeline, "compactor", None)
+            key = (key, compactor.signature if compactor is not None else None)
+            keys[name] = key = key if key[0] is not None else ("model", name)
+            if key in matrices:
+                pipeline.transformer = matrices[key][0]
+                continue
+
+            if compactor is None:
+                X_train = pipeline.transformer.fit_transform(X_train_df)
+                y_fit, sample_weight = y_train, None
+            else:
+                # Comme TrainingPipeline.fit : preprocessing appris sur les lignes d'origine
+                X_unique_df, y_fit, sample_weight = compactor.compact(X_train_df, y_train)
+                pipeline.transformer.fit(X_train_df)
+                X_train = pipeline.transformer.transform(X_unique_df, reuse_buffer=False)
+            # Pas de buffer partagé : plusieurs modèles lisent cette matrice
+            X_val = pipeline.transformer.transform(X_val_df, reuse_buffer=False)
+            matrices[key] = (pipeline.transformer, X_train, X_val, y_fit, sample_weight)
+        preprocess_seconds = time.perf_counter() - start
+
+        def run_model(name: str) -> FoldResult:
+            pipeline = pipelines[name]
+            _, X_train, X_val, y_fit, sample_weight = matrices[keys[name]]
+
+            start = time.perf_counter()
+            eval_set = (X_val, y_val) if self.early_stopping else None
+            pipeline.fit_features(X_train, y_fit, eval_set=eval_set, sample_weight=sample_weight)
+            fit_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            proba = pipeline.predict_proba_features(X_val)
+            topk_idx = top_k_indices(proba, k=self.top_k)
+            y_idx = encode_labels(y_val, pipeline.classes_)
+            score = map_at_k_indices(y_idx, topk_idx, k=self.top_k)
+            predict_seconds = time.perf_counter() - start
+
+            keep_oof = self.oof_store is not None
+            return FoldResult(
+                fold=fold,
+                score=float(score),
+                n_train=len(tr_idx),
+                n_val=len(va_idx),
+                fit_seconds=fit_seconds,
+                predict_seconds=predict_seconds,
+                best_iteration=getattr(pipeline, "best_iteration_", None),
+                proba=np.asarray(proba, dtype=np.float32) if keep_oof else None,
+                classes=list(pipeline.classes_) if keep_oof else None,
+            )
+
+        names = list(pipelines)
+        if self.model_workers > 1 and len(names) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.model_workers, len(names))) as pool:
+                fold_results = dict(zip(names, pool.map(run_model, names)))
+        else:
+            fold_results = {name: run_model(name) for name in names}
+
+        return SweepFoldResult(
+            fold=fold,
+            results=fold_results,
+            preprocess_seconds=preprocess_seconds,
+            n_preprocessings=len(matrices),
+        )
+
+    # ------------------------------------------------------------------
+    # Agrégation + tracking
+    # ------------------------------------------------------------------
+
+    def _summarize(self, name: str, fold_results: List[FoldResult]) -> ModelSweepSummary:
+        scores = [r.score for r in fold_results]
+        best_iterations = [r.best_iteration for r in fold_results if r.best_iteration is not None]
+        return ModelSweepSummary(
+            model=name,
+            fold_scores=scores,
+            mean_score=float(np.mean(scores)) if scores else 0.0,
+            std_score=float(np.std(scores)) if scores else 0.0,
+            fit_seconds=float(sum(r.fit_seconds for r in fold_results)),
+            predict_seconds=float(sum(r.predict_seconds for r in fold_results)),
+            best_iterations=best_iterations,
+            final_n_iterations=aggregate_best_iterations(best_iterations, self.iteration_scale),
+        )
+
+    def _log_fold(self, sweep_fold: SweepFoldResult) -> None:
+        self.logger.info(
+            f"[Fold {sweep_fold.fold}] Preprocessing partagé : "
+            f"{sweep_fold.n_preprocessings} pour {len(sweep_fold.results)} modèles "
+            f"({sweep_fold.preprocess_seconds:.1f}s)"
+        )
+        for name, result in sweep_fold.results.items():
+            self.logger.success(
+                f"[Fold {sweep_fold.fold}] {name} : MAP@{self.top_k} = {result.score:.4f} "
+                f"(fit={result.fit_seconds:.1f}s, predict={result.predict_seconds:.1f}s)"
+            )
+
+    def _log_model_run(
+        self,
+        child_run_name: str,
+        summary: ModelSweepSummary,
+        params: Dict[str, Any],
+        oof_manifest: Optional[str],
+    ) -> None:
+        with self.experiment_service.child_run(run_name=child_run_name):
+            self.experiment_service.log_training_context(
+                model_name=summary.model,
+                params={**params, "model": summary.model},
+            )
+
+            metrics: Dict[str, float] = {
+                f"map_{self.top_k}_fold{fold}": score
+                for fold, score in enumerate(summary.fold_scores, start=1)
+            }
+            metrics.update({
+                f"map_{self.top_k}_mean": summary.mean_score,
+                f"map_{self.top_k}_std": summary.std_score,
+                "fit_seconds": summary.fit_seconds,
+                "predict_seconds": summary.predict_seconds,
+            })
+            if summary.final_n_iterations is not None:
+                metrics["final_n_iterations"] = summary.final_n_iterations
+            self.experiment_service.log_evaluation(metrics)
+
+            if oof_manifest is not None:
+                self.experiment_service.log_artifact(oof_manifest)
+
+    def _log_sweep(self, run_name: str, sweep: SweepResult) -> None:
+        table = sweep.to_frame()
+        self.logger.info(
+            f"Sweep '{run_name}' (preprocessing partagé : {sweep.preprocess_seconds:.1f}s)\n"
+            f"{table.to_string(index=False, float_format=lambda v: f'{v:.4f}')}"
+        )
+
+        self.experiment_service.log_evaluation({
+            f"map_{self.top_k}_mean_{s.model}": s.mean_score for s in sweep.summaries
+        })
+        self.experiment_service.log_evaluation({"preprocess_seconds": sweep.preprocess_seconds})
+
+        if self.report_dir is not None:
+            self.report_dir.mkdir(parents=True, exist_ok=True)
+            report_path = self.report_dir / f"{run_name}_sweep.csv"
+            table.to_csv(report_path, index=False)
+            self.experiment_service.log_artifact(str(report_path))
@@ -8,12 +8,18 @@ Pourquoi ce fichier existe ?
 À quoi ça sert réellement ?
 - Produire LE modèle qui sera utilisé pour Kaggle ou la prod.
 - Séparer clairement CV (étape 3) et entraînement final.
+- Reprendre le nombre d'itérations trouvé par l'early stopping de la CV
+  (CVResult.final_n_iterations) au lieu du budget complet du YAML.
 
 Est-ce critique ?
 OUI. C’est la version “gold” du modèle.
 """
 
 from __future__ import annotations
+from typing import Optional
+
+from loguru import logger
+
 from fertilizer_recommender.domain.interfaces.model_repository import ModelRepository
 
 
@@ -21,8 +27,17 @@ class TrainFinalModelUseCase:
     def __init__(self, pipeline, model_repository: ModelRepository):
         self.pipeline = pipeline
         self.model_repository = model_repository
+        self.logger = logger
 
-    def execute(self, X_df, y, model_name: str):
+    def execute(self, X_df, y, model_name: str, n_iterations: Optional[int] = None):
+        """
+        Args:
+            n_iterations: itérations du booster (ex: CVResult.final_n_iterations) ;
+                None = budget de configs/models.yaml
+        """
+        if n_iterations is not None:
+            self.logger.info(f"Entraînement final de {model_name} : {n_iterations} itérations")
+            self.pipeline.set_n_iterations(n_iterations)
         self.pipeline.fit(X_df, y)
         self.model_repository.save(self.pipeline, model_name)
         return self.pipeline
\ No newline at end of file
@@ -6,36 +6,138 @@ Pourquoi ce fichier existe ?
 - Le notebook/CLI appelle un seul use case, pas 20 bouts de code.
 
 À quoi ça sert ?
-- Lance une CV complète
+- Lance une CV complète (séquentielle ou parallèle via un FoldExecutor)
 - Calcule MAP@3 par fold + moyenne
 - Log MLflow via ExperimentTracker (port)
+- Conserve les probabilités out-of-fold dans un OOFStore (optionnel),
+  pour blender / stacker sans relancer la CV
+- Early stopping par fold (optionnel) : le fold de validation sert d'eval_set,
+  le meilleur nombre d'itérations est agrégé pour l'entraînement final
+- Checkpoint par fold (optionnel) : une CV interrompue reprend aux folds
+  manquants, dans la même run du tracker
 
 Très utile ?
 Oui. C’est le “cerveau” de ton expérimentation.
 """
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Callable, Dict, Any, List
+import hashlib
+import itertools
+import json
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Any, List, Mapping, Optional
 
 import numpy as np
+import pandas as pd
 from loguru import logger
 
-from fertilizer_recommender.domain.services.metric_service import map_at_k
-from fertilizer_recommender.domain.services.ranking_service import predict_top_k
+from fertilizer_recommender.domain.interfaces.cv_checkpoint_store import CVCheckpointStore
+from fertilizer_recommender.domain.interfaces.fold_executor import FoldExecutor
+from fertilizer_recommender.domain.interfaces.oof_store import OOFStore
+from fertilizer_recommender.domain.services.metric_service import map_at_k_indices
+from fertilizer_recommender.domain.services.ranking_service import (
+    encode_labels,
+    top_k_indices,
+)
 from fertilizer_recommender.domain.services.experiment_tracking_service import (
     ExperimentTrackingService
 )
 
 
+@dataclass(frozen=True)
+class FoldResult:
+    fold: int
+    score: float
+    n_train: int
+    n_val: int
+    fit_seconds: float
+    predict_seconds: float
+    # Nombre d'itérations retenu par l'early stopping (None si désactivé)
+    best_iteration: Optional[int] = None
+    # Probabilités de validation (float32), seulement si un OOFStore est branché
+    proba: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    classes: Optional[List[str]] = field(default=None, repr=False, compare=False)
+
+
+@dataclass(frozen=True)
+class FoldCheckpoint:
+    """Ce qu'un fold terminé laisse sur disque : résultat (OOF inclus) + pipeline appris."""
+    result: FoldResult
+    pipeline: Any = field(repr=False, compare=False)
+
+
 @dataclass(frozen=True)
 class CVResult:
     fold_scores: List[float]
     mean_score: float
+    best_iterations: List[int] = field(default_factory=list)
+    # Itérations à utiliser pour le modèle final (TrainFinalModelUseCase)
+    final_n_iterations: Optional[int] = None
+
+
+def cv_checkpoint_key(
+    X_df,
+    y: np.ndarray,
+    splits,
+    config: Mapping[str, Any],
+) -> str:
+    """
+    Clé de checkpoint : config de la run + empreinte des données et des folds.
+
+    Même clé = mêmes lignes (valeurs + index), mêmes labels, mêmes splits et
+    même config : les folds sauvegardés sont réutilisables tels quels.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    digest.update(pd.util.hash_pandas_object(X_df, index=True).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(pd.Series(y), index=False).to_numpy().tobytes())
+    for _, va_idx in splits:
+        digest.update(np.asarray(va_idx, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def aggregate_best_iterations(best_iterations: List[int], scale: float = 1.0) -> Optional[int]:
+    """
+    Moyenne des meilleures itérations des folds, multipliée par `scale`.
+
+    Le modèle final voit tout le train (n_splits / (n_splits - 1) fois plus de
+    lignes qu'un fold) : un `scale` un peu > 1 compense, 1.0 reste prudent.
+    """
+    if not best_iterations:
+        return None
+    return max(1, int(round(float(np.mean(best_iterations)) * scale)))
 
 
 class TrainWithCVUseCase:
     """
     Orchestration complète d'une cross-validation + tracking d'expérience.
+
+    Les folds sont exécutés par un `FoldExecutor` optionnel (ex: process pool),
+    sinon un par un dans le process courant. Dans les deux cas, les logs et les
+    appels au tracker suivent l'ordre des folds : un fold est loggé dès que
+    lui et tous les folds précédents sont terminés.
+
+    `feature_precomputer` (optionnel) enrichit le dataset complet UNE fois avant
+    la CV (features sans état, identiques d'un fold à l'autre) ; les folds
+    découpent ensuite ce DataFrame et seul le preprocessing avec état est réappris.
+
+    `oof_store` (optionnel) reçoit les probabilités de validation de chaque fold,
+    écrites dans l'ordre des folds, puis la run est publiée et son manifeste
+    loggé comme artefact.
+
+    `early_stopping` : le fold de validation est passé en eval_set au pipeline.
+    Le score du fold reste calculé sur ces mêmes lignes (légèrement optimiste,
+    comme tout early stopping sur la validation) ; la moyenne des meilleures
+    itérations x `iteration_scale` est retournée dans `CVResult.final_n_iterations`.
+
+    `checkpoint_store` (optionnel) : chaque fold terminé est sauvegardé
+    (FoldCheckpoint) par le worker qui l'a calculé, sous une clé = run_name +
+    params + `checkpoint_config` + empreinte des données et des splits.
+    `execute(..., resume=True)` relit les folds déjà sauvegardés, ne calcule
+    que les autres et rouvre la même run du tracker ; sans `resume`, les
+    checkpoints de la même clé sont effacés. L'état du checkpoint garde les
+    folds (et les agrégats) déjà loggés : une reprise ne les relogge pas.
+    Une CV terminée (OOF publié, agrégats loggés) efface ses checkpoints.
     """
 
     def __init__(
@@ -44,11 +146,25 @@ class TrainWithCVUseCase:
         splitter_factory: Callable[[], Any],
         pipeline_factory: Callable[[], Any],
         top_k: int = 3,
+        fold_executor: Optional[FoldExecutor] = None,
+        feature_precomputer: Optional[Callable[[Any], Any]] = None,
+        oof_store: Optional[OOFStore] = None,
+        early_stopping: bool = False,
+        iteration_scale: float = 1.0,
+        checkpoint_store: Optional[CVCheckpointStore] = None,
+        checkpoint_config: Optional[Mapping[str, Any]] = None,
     ):
         self.experiment_service = experiment_service
         self.splitter_factory = splitter_factory
         self.pipeline_factory = pipeline_factory
         self.top_k = top_k
+        self.fold_executor = fold_executor
+        self.feature_precomputer = feature_precomputer
+        self.oof_store = oof_store
+        self.early_stopping = early_stopping
+        self.iteration_scale = iteration_scale
+        self.checkpoint_store = checkpoint_store
+        self.checkpoint_config = dict(checkpoint_config or {})
         self.logger = logger
 
     def execute(
@@ -59,63 +175,207 @@ class TrainWithCVUseCase:
         experiment_name: str,
         run_name: str,
         params: Dict[str, Any],
+        resume: bool = False,
     ) -> CVResult:
         splitter = self.splitter_factory()
         y_array = np.array(y)
 
+        # Splits calculés une seule fois, dans le process parent
+        splits = list(splitter.split(X_df, y_array))
+        folds = list(range(1, len(splits) + 1))
+
+        checkpoint = None
+        restored: Dict[int, FoldResult] = {}
+        run_id = None
+        run_state: Dict[str, Any] = {}
+        if self.checkpoint_store is not None:
+            key = cv_checkpoint_key(
+                X_df, y_array, splits,
+                config={
+                    "run_name": run_name,
+                    "params": params,
+                    "top_k": self.top_k,
+                    "early_stopping": self.early_stopping,
+                    **self.checkpoint_config,
+                },
+            )
+            checkpoint = self.checkpoint_store.open(run_name, key)
+            if resume:
+                restored = {
+                    fold: checkpoint.load_fold(fold).result
+                    for fold in checkpoint.completed_folds() if fold in folds
+                }
+                run_state = checkpoint.load_state()
+                run_id = run_state.get("run_id")
+                self.logger.info(
+                    f"Reprise de '{run_name}' : folds déjà faits = {sorted(restored)}"
+                )
+            else:
+                checkpoint.clear()
+
+        # Métriques déjà écrites dans la run rouverte : jamais reloggées
+        logged_folds = set(run_state.get("logged_folds", [])) if run_id is not None else set()
+        summary_logged = bool(run_state.get("summary_logged")) if run_id is not None else False
+
+        def save_state() -> None:
+            if checkpoint is not None:
+                checkpoint.save_state({
+                    "run_name": run_name,
+                    "run_id": self.experiment_service.run_id,
+                    "logged_folds": sorted(logged_folds),
+                    "summary_logged": summary_logged,
+                })
+
+        if self.feature_precomputer is not None:
+            X_df = self.feature_precomputer(X_df)
+
+        def run_fold(fold: int) -> FoldResult:
+            tr_idx, va_idx = splits[fold - 1]
+
+            start = time.perf_counter()
+            pipeline = self.pipeline_factory()
+            eval_set = (X_df.iloc[va_idx], y_array[va_idx]) if self.early_stopping else None
+            pipeline.fit(X_df.iloc[tr_idx], y_array[tr_idx], eval_set=eval_set)
+            fit_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            proba = pipeline.predict_proba(X_df.iloc[va_idx])
+            topk_idx = top_k_indices(proba, k=self.top_k)
+            y_idx = encode_labels(y_array[va_idx], pipeline.classes_)
+            score = map_at_k_indices(y_idx, topk_idx, k=self.top_k)
+            predict_seconds = time.perf_counter() - start
+
+            # Le checkpoint garde toujours l'OOF du fold (reprise avec OOFStore)
+            keep_oof = self.oof_store is not None or checkpoint is not None
+            result = FoldResult(
+                fold=fold,
+                score=float(score),
+                n_train=len(tr_idx),
+                n_val=len(va_idx),
+                fit_seconds=fit_seconds,
+                predict_seconds=predict_seconds,
+                best_iteration=getattr(pipeline, "best_iteration_", None),
+                proba=np.asarray(proba, dtype=np.float32) if keep_oof else None,
+                classes=list(pipeline.classes_) if keep_oof else None,
+            )
+            if checkpoint is not None:
+                # Dans le worker : le pipeline ne transite pas par le process parent
+                checkpoint.save_fold(fold, FoldCheckpoint(result=result, pipeline=pipeline))
+            if self.oof_store is None:
+                # Sans OOFStore, l'OOF ne remonte pas au process parent
+                result = replace(result, proba=None, classes=None)
+            return result
+
         fold_scores: List[float] = []
+        best_iterations: List[int] = []
 
         # Important ici:
         with self.experiment_service.experiment(
             experiment_name=experiment_name,
             run_name=run_name,
+            run_id=run_id,
         ):
-            self.experiment_service.log_training_context(
-                model_name=params.get("model", "unknown_model"),
-                params=params,
-            )
-
-            for fold, (tr_idx, va_idx) in enumerate(
-                splitter.split(X_df, y_array), start=1
-            ):
-                X_tr = X_df.iloc[tr_idx]
-                y_tr = y_array[tr_idx]
-                X_va = X_df.iloc[va_idx]
-                y_va = y_array[va_idx]
+            if run_id is None:
+                self.experiment_service.log_training_context(
+                    model_name=params.get("model", "unknown_model"),
+                    params=params,
+                )
+            save_state()
 
-                self.logger.info(
-                    f"[Fold {fold}] Démarrage "
-                    f"(train={len(tr_idx)} obs, val={len(va_idx)} obs)"
+            oof_writer = None
+            if self.oof_store is not None:
+                classes = np.unique(y_array)
+                oof_writer = self.oof_store.open_writer(
+                    run_name,
+                    row_index=np.asarray(X_df.index),
+                    y_idx=encode_labels(y_array, classes),
+                    classes=classes.tolist(),
                 )
 
-                self.logger.info(f"[Fold {fold}] Entraînement du modèle")
-                pipeline = self.pipeline_factory()
-                pipeline.fit(X_tr, y_tr)
+            remaining = [fold for fold in folds if fold not in restored]
+            if self.fold_executor is None or not remaining:
+                computed = ((fold, run_fold(fold)) for fold in remaining)
+            else:
+                computed = self.fold_executor.map_folds(run_fold, remaining)
+            completed = itertools.chain(restored.items(), computed)
 
-                logger.info(f"[Fold {fold}] Prédiction et calcul du top-{self.top_k}")
-                proba = pipeline.predict_proba(X_va)
-                topk = predict_top_k(
-                    proba=proba,
-                    class_labels=pipeline.classes_,
-                    k=self.top_k,
-                )
+            try:
+                # Les folds peuvent finir dans le désordre : on bufferise et on
+                # logge dans l'ordre, dès que le préfixe de folds est complet.
+                pending: Dict[int, FoldResult] = {}
+                next_fold = 1
+                for fold, result in completed:
+                    pending[fold] = result
+                    while next_fold in pending:
+                        result = pending.pop(next_fold)
+                        self._log_fold(
+                            result,
+                            restored=next_fold in restored,
+                            track=next_fold not in logged_folds,
+                        )
+                        if next_fold not in logged_folds:
+                            logged_folds.add(next_fold)
+                            save_state()
+                        if oof_writer is not None:
+                            oof_writer.write_fold(
+                                result.fold, splits[result.fold - 1][1],
+                                result.proba, result.classes,
+                            )
+                        fold_scores.append(result.score)
+                        if result.best_iteration is not None:
+                            best_iterations.append(result.best_iteration)
+                        next_fold += 1
+            except BaseException:
+                if oof_writer is not None:
+                    oof_writer.abort()
+                raise
 
-                score = map_at_k(y_va.tolist(), topk, k=self.top_k)
-                fold_scores.append(score)
+            if oof_writer is not None:
+                self.experiment_service.log_artifact(oof_writer.close())
 
-                self.logger.success(
-                    f"[Fold {fold}] Score MAP@{self.top_k} = {score:.4f}"
-                )
-                self.experiment_service.log_evaluation(
-                    {f"map_{self.top_k}_fold{fold}": score}
+            mean_score = float(np.mean(fold_scores)) if fold_scores else 0.0
+            final_n_iterations = aggregate_best_iterations(best_iterations, self.iteration_scale)
+            if final_n_iterations is not None:
+                self.logger.info(
+                    f"Early stopping : itérations par fold = {best_iterations} "
+                    f"-> modèle final = {final_n_iterations}"
                 )
 
-            mean_score = float(np.mean(fold_scores)) if fold_scores else 0.0
-            self.experiment_service.log_evaluation(
-                {f"map_{self.top_k}_mean": mean_score}
-            )
+            # Agrégats loggés une seule fois par run, même après plusieurs reprises
+            if not summary_logged:
+                summary = {f"map_{self.top_k}_mean": mean_score}
+                if restored:
+                    summary["resumed_folds"] = len(restored)
+                if final_n_iterations is not None:
+                    summary["final_n_iterations"] = final_n_iterations
+                self.experiment_service.log_evaluation(summary)
+                summary_logged = True
+                save_state()
+
+        if checkpoint is not None:
+            # CV complète : OOF publié, métriques écrites, plus rien à reprendre
+            checkpoint.clear()
 
         return CVResult(
             fold_scores=fold_scores,
             mean_score=mean_score,
-        )
\ No newline at end of file
+            best_iterations=best_iterations,
+            final_n_iterations=final_n_iterations,
+        )
+
+    def _log_fold(self, result: FoldResult, restored: bool = False, track: bool = True) -> None:
+        """Console ; métriques du fold envoyées au tracker si `track` (pas déjà loggées)."""
+        self.logger.info(
+            f"[Fold {result.fold}] {'Repris du checkpoint' if restored else 'Terminé'} "
+            f"(train={result.n_train} obs, val={result.n_val} obs, "
+            f"fit={result.fit_seconds:.1f}s, predict={result.predict_seconds:.1f}s)"
+        )
+        self.logger.success(
+            f"[Fold {result.fold}] Score MAP@{self.top_k} = {result.score:.4f}"
+        )
+        if not track:
+            return
+        metrics = {f"map_{self.top_k}_fold{result.fold}": result.score}
+        if result.best_iteration is not None:
+            metrics[f"best_iteration_fold{result.fold}"] = result.best_iteration
+        self.experiment_service.log_evaluation(metrics)
@@ -19,21 +19,41 @@ AUCUN pandas / sklearn direct.
 
 from __future__ import annotations
 
+import os
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Callable
+from typing import Callable, List, Optional
 
 # =========================
 # Utils & config
 # =========================
-from fertilizer_recommender.infrastructure.utils.config_loader import load_yaml_config
+from fertilizer_recommender.infrastructure.utils.config_loader import load_yaml_config, save_yaml_config
+from fertilizer_recommender.infrastructure.utils.app_config import (
+    AppConfig,
+    FeaturesConfig,
+    InferenceConfig,
+    load_app_config,
+    load_inference_config,
+)
 from fertilizer_recommender.infrastructure.utils.seed import set_global_seed
 
 # =========================
 # Repositories & tracking
 # =========================
-from fertilizer_recommender.infrastructure.repositories.dataset_repository_impl import CsvDatasetRepository
-from fertilizer_recommender.infrastructure.repositories.model_repository_impl import JoblibModelRepository
-from fertilizer_recommender.infrastructure.tracking.mlflow_tracker import MLflowExperimentTracker
+from fertilizer_recommender.infrastructure.repositories.dataset_repository_impl import (
+    CsvDatasetRepository,
+    ParquetDatasetRepository,
+    convert_csv_dataset_to_parquet,
+)
+from fertilizer_recommender.infrastructure.repositories.oof_store_impl import NpyOOFStore
+from fertilizer_recommender.infrastructure.repositories.cv_checkpoint_store_impl import JoblibCVCheckpointStore
+from fertilizer_recommender.infrastructure.repositories.model_repository_impl import (
+    CachedJoblibModelRepository,
+    JoblibModelRepository,
+)
+from fertilizer_recommender.infrastructure.tracking.tracker_registry import TRACKER_REGISTRY
+from fertilizer_recommender.infrastructure.tracking.buffered_tracker import BufferedExperimentTracker
+from fertilizer_recommender.domain.services.experiment_tracking_service import ExperimentTrackingService
 
 # =========================
 # Domain entities
@@ -45,43 +65,80 @@ from fertilizer_recommender.domain.entities.fertilizer_features import Fertilize
 # =========================
 from fertilizer_recommender.application.use_cases.prepare_dataset import PrepareDatasetUseCase
 from fertilizer_recommender.application.use_cases.train_with_cv import TrainWithCVUseCase
+from fertilizer_recommender.application.use_cases.sweep_models_cv import SweepModelsCVUseCase
 from fertilizer_recommender.application.use_cases.train_final_model import TrainFinalModelUseCase
 from fertilizer_recommender.application.use_cases.build_submission import BuildSubmissionUseCase
 from fertilizer_recommender.application.use_cases.evaluate_model import EvaluateModelUseCase
+from fertilizer_recommender.application.use_cases.predict_topk import PredictTopKUseCase
+from fertilizer_recommender.application.use_cases.predict_ensemble_topk import PredictEnsembleTopKUseCase
+from fertilizer_recommender.application.use_cases.optimize_blend_weights import (
+    BlendResult,
+    OptimizeBlendWeightsUseCase,
+)
 
 # =========================
 # ML building blocks
 # =========================
-from fertilizer_recommender.infrastructure.ml.cv.splitter import make_stratified_kfold
-from fertilizer_recommender.infrastructure.ml.preprocessors.sklearn_transformer import SklearnFeatureTransformer
+from fertilizer_recommender.infrastructure.ml.cv.fold_executor import (
+    ProcessPoolFoldExecutor,
+    default_threads_per_worker,
+)
+from fertilizer_recommender.infrastructure.ml.preprocessors.native_categorical_transformer import (
+    NativeCategoricalTransformer,
+)
 from fertilizer_recommender.infrastructure.ml.preprocessors.feature_engineering import FeatureEngineer
 from fertilizer_recommender.infrastructure.ml.preprocessors.feature_pipeline import FeaturePipeline
+from fertilizer_recommender.infrastructure.ml.preprocessors.feature_cache import FeatureCache
+from fertilizer_recommender.infrastructure.ml.preprocessors.duplicate_compactor import DuplicateRowCompactor
 from fertilizer_recommender.infrastructure.ml.pipelines.training_pipeline import TrainingPipeline
+from fertilizer_recommender.infrastructure.ml.pipelines.compiled_pipeline import compile_pipeline
+from fertilizer_recommender.infrastructure.ml.pipelines.deduplicated_inference import HashRowDeduplicator
+from fertilizer_recommender.infrastructure.ml.ensemble.probability_ensemble import ProbabilityEnsemble
 
-from fertilizer_recommender.infrastructure.ml.models.baseline_logreg import BaselineLogisticRegression
-from fertilizer_recommender.infrastructure.ml.models.catboost_multiclass import CatBoostMulticlass
-from fertilizer_recommender.infrastructure.ml.models.lightgbm_multiclass import LightGBMMulticlass
-from fertilizer_recommender.infrastructure.ml.models.xgboost_multiclass import XGBoostMulticlass
+from fertilizer_recommender.infrastructure.ml.models.booster_dataset_cache import BoosterDatasetCache
+from fertilizer_recommender.infrastructure.ml.models.model_registry import MODEL_REGISTRY
+
+# sklearn (transformer one-hot, splitter), les librairies de modèles et mlflow
+# sont importés au premier usage : importer ce module reste rapide
+# (voir tests/test_import_budget.py).
+
+
+# Cache process-wide des features pré-calculées (réutilisé entre CV successives)
+_FEATURE_CACHE = FeatureCache(max_entries=1)
 
 
 # ======================================================
 # 1. Chargement des configs + seed
 # ======================================================
 
-def load_all_configs(
+# Dernière config ayant fixé les seeds (une fois par config chargée, pas par builder)
+_SEEDED_CONFIG: AppConfig | None = None
+
+
+def load_config(
     training_cfg: str = "configs/training.yaml",
     models_cfg: str = "configs/models.yaml",
     features_cfg: str = "configs/features.yaml",
     mlflow_cfg: str = "configs/mlflow.yaml",
-):
-    cfg_train = load_yaml_config(training_cfg)
-    cfg_models = load_yaml_config(models_cfg)
-    cfg_features = load_yaml_config(features_cfg)
-    cfg_mlflow = load_yaml_config(mlflow_cfg)
+) -> AppConfig:
+    """
+    Config typée et validée, mémoïsée par (chemin, mtime) : appeler ceci
+    dans chaque builder ne coûte qu'un stat() par fichier.
+    Les seeds sont fixées au premier chargement (ou rechargement) seulement.
+    """
+    global _SEEDED_CONFIG
+
+    config = load_app_config(training_cfg, models_cfg, features_cfg, mlflow_cfg)
+    if config is not _SEEDED_CONFIG:
+        set_global_seed(config.project.seed)
+        _SEEDED_CONFIG = config
+    return config
 
-    set_global_seed(cfg_train["project"]["seed"])
 
-    return cfg_train, cfg_models, cfg_features, cfg_mlflow
+def _inference(inference_cfg: InferenceConfig | str) -> InferenceConfig:
+    if isinstance(inference_cfg, InferenceConfig):
+        return inference_cfg
+    return load_inference_config(inference_cfg)
 
 
 # ======================================================
@@ -109,26 +166,57 @@ def build_feature_schema() -> FertilizerFeaturesSchema:
 # 3. Dataset repository
 # ======================================================
 
-def build_dataset_repository(cfg_train) -> CsvDatasetRepository:
+def build_dataset_repository(config: AppConfig | None = None):
+    """
+    data.format = "csv" (défaut) ou "parquet" (types compacts, projection de colonnes).
+    """
+    config = config or load_config()
+    if config.data.format == "parquet":
+        return build_parquet_dataset_repository(config)
+
     return CsvDatasetRepository(
-        data_dir=Path(cfg_train["paths"]["data_raw_dir"]),
-        train_file=cfg_train["data"]["train_file"],
-        test_file=cfg_train["data"]["test_file"],
+        data_dir=config.paths.data_raw_dir,
+        train_file=config.data.train_file,
+        test_file=config.data.test_file,
+    )
+
+
+def build_parquet_dataset_repository(config: AppConfig | None = None) -> ParquetDatasetRepository:
+    config = config or load_config()
+    return ParquetDatasetRepository(
+        data_dir=config.paths.data_processed_dir,
+        train_file=config.data.train_parquet_file,
+        test_file=config.data.test_parquet_file,
+        schema=build_feature_schema(),
+        target_col=config.data.target_col,
+        id_col=config.data.id_col,
+    )
+
+
+def convert_raw_dataset_to_parquet(config: AppConfig | None = None) -> None:
+    """Conversion one-shot data/raw/*.csv -> data/processed/*.parquet."""
+    config = config or load_config()
+    csv_repo = CsvDatasetRepository(
+        data_dir=config.paths.data_raw_dir,
+        train_file=config.data.train_file,
+        test_file=config.data.test_file,
     )
+    convert_csv_dataset_to_parquet(csv_repo, build_parquet_dataset_repository(config))
 
 
 # ======================================================
 # 4. PrepareDataset use case
 # ======================================================
 
-def build_prepare_dataset_use_case(cfg_train) -> PrepareDatasetUseCase:
+def build_prepare_dataset_use_case(config: AppConfig | None = None) -> PrepareDatasetUseCase:
+    config = config or load_config()
     schema = build_feature_schema()
-    repo = build_dataset_repository(cfg_train)
+    repo = build_dataset_repository(config)
 
     return PrepareDatasetUseCase(
         dataset_repository=repo,
         schema=schema,
-        target_col=cfg_train["data"]["target_col"],
+        target_col=config.data.target_col,
     )
 
 
@@ -136,27 +224,38 @@ def build_prepare_dataset_use_case(cfg_train) -> PrepareDatasetUseCase:
 # 5. Feature pipeline (FE + preprocessing)
 # ======================================================
 
-def build_feature_pipeline(cfg_train, cfg_features) -> FeaturePipeline:
+def build_feature_engineer(features: FeaturesConfig) -> FeatureEngineer:
+    return FeatureEngineer(
+        enable_ratios=features.enable_ratios,
+        enable_interactions=features.enable_interactions,
+        enable_transforms=features.enable_transforms,
+    )
+
+
+def build_feature_pipeline(features: FeaturesConfig, profile: str = "one_hot") -> FeaturePipeline:
+    """profile : "one_hot" ou "native" (voir FeaturesConfig.profile)."""
     schema = build_feature_schema()
+    feature_engineer = build_feature_engineer(features)
 
-    feature_engineer = FeatureEngineer(
-        enable_ratios=cfg_features["feature_engineering"]["enable_ratios"],
-        enable_interactions=cfg_features["feature_engineering"]["enable_interactions"],
-    )
+    # Les noms des features dérivées viennent du FeatureEngineer lui-même
+    numeric_features = schema.numeric_features + feature_engineer.feature_names
 
-    numeric_features = (
-        schema.numeric_features
-        + [
-            "N_to_P", "N_to_K", "P_to_K",
-            "NPK_sum", "N_ratio", "P_ratio", "K_ratio",
-            "Temp_x_Humidity", "Humidity_x_Moisture", "Temp_x_Moisture",
-        ]
-    )
+    if profile == "one_hot":
+        from fertilizer_recommender.infrastructure.ml.preprocessors.sklearn_transformer import (
+            SklearnFeatureTransformer,
+        )
 
-    transformer = SklearnFeatureTransformer(
-        numeric_features=numeric_features,
-        categorical_features=schema.categorical_features,
-    )
+        transformer = SklearnFeatureTransformer(
+            numeric_features=numeric_features,
+            categorical_features=schema.categorical_features,
+        )
+    elif profile == "native":
+        transformer = NativeCategoricalTransformer(
+            numeric_features=numeric_features,
+            categorical_features=schema.categorical_features,
+        )
+    else:
+        raise ValueError(f"Profil de preprocessing inconnu: {profile}")
 
     return FeaturePipeline(
         feature_engineer=feature_engineer,
@@ -168,48 +267,87 @@ def build_feature_pipeline(cfg_train, cfg_features) -> FeaturePipeline:
 # 6. Pipeline factories (modèles interchangeables)
 # ======================================================
 
+def _with_threads(model_cfg, key: str, n_threads: int | None):
+    if n_threads is None:
+        return model_cfg
+    return {**model_cfg, key: n_threads}
+
+
+def _native_categorical_params(categorical: str | None, transformer) -> dict:
+    """Déclare au booster les colonnes de codes du profil "native"."""
+    if not isinstance(transformer, NativeCategoricalTransformer):
+        return {}
+
+    indices = transformer.categorical_indices
+    if categorical == "cat_features":
+        return {"cat_features": indices}
+    if categorical == "categorical_feature":
+        return {"categorical_feature": indices}
+    if categorical == "feature_types":
+        feature_types = ["q"] * len(transformer.feature_names_out)
+        for i in indices:
+            feature_types[i] = "c"
+        return {"enable_categorical": True, "feature_types": feature_types}
+    return {}
+
+
+@lru_cache(maxsize=None)
+def _booster_dataset_cache(max_entries: int) -> BoosterDatasetCache:
+    # Process-wide : réutilisé entre CV successives (sweeps d'hyperparamètres)
+    return BoosterDatasetCache(max_entries=max_entries)
+
+
 def make_pipeline_factory(
     model_name: str,
-    cfg_train,
-    cfg_models,
-    cfg_features,
-    n_classes: int,
+    config: AppConfig,
+    n_classes: int | None,
+    n_threads: int | None = None,
+    dataset_cache: BoosterDatasetCache | None = None,
 ) -> Callable[[], TrainingPipeline]:
+    """
+    model_name : nom enregistré dans MODEL_REGISTRY (le wrapper et sa
+    librairie ne sont importés qu'à la création du premier pipeline).
+    n_threads : si fourni, borne le nombre de threads du modèle
+    (utile quand plusieurs folds tournent en parallèle).
+    dataset_cache : datasets binnés LightGBM / XGBoost réutilisés entre fits.
+    """
+
+    # Modèle inconnu : erreur dès la construction de la factory
+    spec = MODEL_REGISTRY.spec(model_name)
+    options = spec.options
+
+    # Profil de preprocessing du modèle (configs/features.yaml)
+    profile = config.features.profile(model_name)
+
+    # Doublons (8 entrées brutes + cible) regroupés en sample_weight au fit
+    compactor = None
+    if config.training.compact_duplicates:
+        schema = build_feature_schema()
+        compactor = DuplicateRowCompactor(
+            columns=schema.numeric_features + schema.categorical_features
+        )
 
     def factory() -> TrainingPipeline:
-        feature_pipeline = build_feature_pipeline(cfg_train, cfg_features)
-
-        if model_name == "logreg":
-            model = BaselineLogisticRegression(
-                random_state=cfg_train["project"]["seed"]
-            )
-
-        elif model_name == "catboost":
-            model = CatBoostMulticlass(
-                random_state=cfg_train["project"]["seed"],
-                **cfg_models["catboost"],
-            )
-
-        elif model_name == "lightgbm":
-            model = LightGBMMulticlass(
-                num_class=n_classes,
-                random_state=cfg_train["project"]["seed"],
-                **cfg_models["lightgbm"],
-            )
-
-        elif model_name == "xgboost":
-            model = XGBoostMulticlass(
-                num_class=n_classes,
-                random_state=cfg_train["project"]["seed"],
-                **cfg_models["xgboost"],
-            )
-
-        else:
-            raise ValueError(f"Modèle inconnu: {model_name}")
+        feature_pipeline = build_feature_pipeline(config.features, profile=profile)
+
+        params = {"random_state": config.project.seed}
+        if options["config_key"] is not None:
+            model_cfg = config.models.model_params(options["config_key"])
+            if options["threads_param"] is not None:
+                model_cfg = _with_threads(model_cfg, options["threads_param"], n_threads)
+            params.update(model_cfg)
+        params.update(_native_categorical_params(options["categorical"], feature_pipeline.transformer))
+        if options["num_class"]:
+            params["num_class"] = n_classes
+        if options["dataset_cache"]:
+            params["dataset_cache"] = dataset_cache
+
+        model = MODEL_REGISTRY.create(model_name, **params)
 
         return TrainingPipeline(
             transformer=feature_pipeline,
             model=model,
+            compactor=compactor,
         )
 
     return factory
@@ -219,53 +357,211 @@ def make_pipeline_factory(
 # 7. TrainWithCV use case
 # ======================================================
 
+def build_experiment_service(
+    tracker: str = "mlflow",
+    config: AppConfig | None = None,
+) -> ExperimentTrackingService:
+    """
+    Tracker créé (et mlflow importé) seulement par les use cases qui tracent.
+    mlflow.buffering.enabled : écritures par lots hors du chemin critique
+    (si le tracker sait écrire par run_id, voir buffered_tracker.py).
+    """
+    config = config or load_config()
+    experiment_tracker = TRACKER_REGISTRY.create(tracker)
+
+    buffering = config.mlflow.buffering
+    if buffering.enabled and callable(getattr(experiment_tracker, "log_batch", None)):
+        experiment_tracker = BufferedExperimentTracker(
+            experiment_tracker,
+            max_batch_size=buffering.max_batch_size,
+            flush_interval_s=buffering.flush_interval_s,
+        )
+    return ExperimentTrackingService(experiment_tracker)
+
+
 def build_train_with_cv_use_case(
     model_name: str,
     X,
+    config: AppConfig | None = None,
 ):
-    cfg_train, cfg_models, cfg_features, cfg_mlflow = load_all_configs()
+    config = config or load_config()
+    training_cfg = config.training
 
-    tracker = MLflowExperimentTracker(cfg_mlflow["mlflow"]["tracking_uri"])
-    tracker.set_experiment(cfg_mlflow["mlflow"]["experiment_name"])
+    experiment_service = build_experiment_service(config=config)
 
     def splitter_factory():
+        from fertilizer_recommender.infrastructure.ml.cv.splitter import make_stratified_kfold
+
         return make_stratified_kfold(
-            n_splits=cfg_train["training"]["n_splits"],
-            seed=cfg_train["project"]["seed"],
+            n_splits=training_cfg.n_splits,
+            seed=config.project.seed,
+        )
+
+    # Parallélisme des folds (1 = exécution séquentielle historique)
+    fold_workers = training_cfg.fold_workers
+    threads_per_worker = training_cfg.threads_per_worker
+    fold_executor = None
+    n_threads = None
+    if fold_workers > 1:
+        n_threads = threads_per_worker or default_threads_per_worker(fold_workers)
+        fold_executor = ProcessPoolFoldExecutor(
+            n_workers=fold_workers,
+            threads_per_worker=n_threads,
         )
 
+    # Datasets binnés (LightGBM / XGBoost) partagés entre folds et essais
+    dataset_cache = None
+    if training_cfg.booster_dataset_cache:
+        dataset_cache = _booster_dataset_cache(training_cfg.booster_dataset_cache)
+
     pipeline_factory = make_pipeline_factory(
         model_name=model_name,
-        cfg_train=cfg_train,
-        cfg_models=cfg_models,
-        cfg_features=cfg_features,
-        n_classes=len(set(X[cfg_train["data"]["target_col"]])),
+        config=config,
+        n_classes=len(set(X[config.data.target_col])),
+        n_threads=n_threads,
+        dataset_cache=dataset_cache,
     )
 
+    # Feature engineering calculé une fois pour tous les folds
+    feature_precomputer = None
+    if training_cfg.precompute_features:
+        feature_precomputer = partial(
+            _FEATURE_CACHE.get_or_compute,
+            build_feature_engineer(config.features),
+        )
+
+    # Probabilités out-of-fold conservées pour le blending / stacking
+    oof_store = None
+    if training_cfg.save_oof:
+        oof_store = build_oof_store(config)
+
+    # Checkpoint par fold : execute(..., resume=True) reprend une CV interrompue.
+    # La clé inclut la config du modèle et des features (+ empreinte des données).
+    checkpoint_store = None
+    if training_cfg.checkpoint_folds:
+        checkpoint_store = JoblibCVCheckpointStore(config.paths.checkpoints_dir)
+
     return TrainWithCVUseCase(
-        tracker=tracker,
+        experiment_service=experiment_service,
         splitter_factory=splitter_factory,
         pipeline_factory=pipeline_factory,
-        top_k=cfg_train["training"]["top_k"],
+        top_k=training_cfg.top_k,
+        fold_executor=fold_executor,
+        feature_precomputer=feature_precomputer,
+        oof_store=oof_store,
+        # Early stopping par fold -> CVResult.final_n_iterations
+        early_stopping=training_cfg.early_stopping,
+        iteration_scale=training_cfg.final_iteration_scale,
+        checkpoint_store=checkpoint_store,
+        checkpoint_config={
+            "model": model_name,
+            "model_params": config.models.model_params(model_name),
+            "features": config.features.as_dict(),
+            "seed": config.project.seed,
+        },
     )
 
 
+def build_cv_sweep_use_case(
+    model_names: List[str],
+    X,
+    model_workers: int | None = None,
+    config: AppConfig | None = None,
+) -> SweepModelsCVUseCase:
+    """
+    CV de plusieurs modèles sur les mêmes folds, en une passe
+    (configs chargées une fois, preprocessing de fold partagé par profil).
+
+    model_workers : modèles d'un fold entraînés en parallèle (threads) ;
+    défaut = training.sweep_model_workers.
+    """
+    config = config or load_config()
+    training_cfg = config.training
+
+    def splitter_factory():
+        from fertilizer_recommender.infrastructure.ml.cv.splitter import make_stratified_kfold
+
+        return make_stratified_kfold(
+            n_splits=training_cfg.n_splits,
+            seed=config.project.seed,
+        )
+
+    if model_workers is None:
+        model_workers = training_cfg.sweep_model_workers
+
+    # Cœurs partagés entre workers de folds ET modèles parallèles d'un fold
+    fold_workers = training_cfg.fold_workers
+    fold_executor = None
+    n_threads = None
+    if fold_workers > 1 or model_workers > 1:
+        n_threads = training_cfg.threads_per_worker or default_threads_per_worker(
+            fold_workers * model_workers
+        )
+    if fold_workers > 1:
+        fold_executor = ProcessPoolFoldExecutor(
+            n_workers=fold_workers,
+            threads_per_worker=n_threads * model_workers,
+        )
+
+    dataset_cache = None
+    if training_cfg.booster_dataset_cache:
+        dataset_cache = _booster_dataset_cache(training_cfg.booster_dataset_cache)
+
+    n_classes = len(set(X[config.data.target_col]))
+    pipeline_factories = {
+        name: make_pipeline_factory(
+            model_name=name,
+            config=config,
+            n_classes=n_classes,
+            n_threads=n_threads,
+            dataset_cache=dataset_cache,
+        )
+        for name in model_names
+    }
+
+    feature_precomputer = None
+    if training_cfg.precompute_features:
+        feature_precomputer = partial(
+            _FEATURE_CACHE.get_or_compute,
+            build_feature_engineer(config.features),
+        )
+
+    oof_store = build_oof_store(config) if training_cfg.save_oof else None
+
+    return SweepModelsCVUseCase(
+        experiment_service=build_experiment_service(config=config),
+        splitter_factory=splitter_factory,
+        pipeline_factories=pipeline_factories,
+        top_k=training_cfg.top_k,
+        fold_executor=fold_executor,
+        feature_precomputer=feature_precomputer,
+        oof_store=oof_store,
+        early_stopping=training_cfg.early_stopping,
+        iteration_scale=training_cfg.final_iteration_scale,
+        model_workers=model_workers,
+        report_dir=config.paths.reports_dir,
+    )
+
+
+def build_oof_store(config: AppConfig | None = None) -> NpyOOFStore:
+    config = config or load_config()
+    return NpyOOFStore(oof_dir=config.paths.oof_dir)
+
+
 # ======================================================
 # 8. Entraînement final + persistance
 # ======================================================
 
-def build_train_final_model_use_case(model_name: str):
-    cfg_train, cfg_models, cfg_features, _ = load_all_configs()
+def build_train_final_model_use_case(model_name: str, config: AppConfig | None = None):
+    config = config or load_config()
 
     model_repo = JoblibModelRepository(
-        models_dir=Path(cfg_train["paths"]["models_dir"])
+        models_dir=config.paths.models_dir
     )
 
     pipeline_factory = make_pipeline_factory(
         model_name=model_name,
-        cfg_train=cfg_train,
-        cfg_models=cfg_models,
-        cfg_features=cfg_features,
+        config=config,
         n_classes=None,  # pas nécessaire ici
     )
 
@@ -281,23 +577,175 @@ def build_train_final_model_use_case(model_name: str):
 # 9. Évaluation & submission
 # ======================================================
 
-def build_evaluate_model_use_case(pipeline):
-    cfg_train, _, _, _ = load_all_configs()
+def build_evaluate_model_use_case(pipeline, config: AppConfig | None = None):
+    config = config or load_config()
     return EvaluateModelUseCase(
         pipeline=pipeline,
-        top_k=cfg_train["training"]["top_k"],
+        top_k=config.training.top_k,
     )
 
 
-def build_submission_use_case():
-    cfg_train, _, _, _ = load_all_configs()
+@lru_cache(maxsize=None)
+def _cached_model_repository(
+    models_dir: str, max_bytes: int, mmap_mode: str | None, load_workers: int
+) -> CachedJoblibModelRepository:
+    # Une instance par configuration : le LRU survit aux appels des builders
+    return CachedJoblibModelRepository(
+        models_dir=Path(models_dir),
+        max_bytes=max_bytes,
+        mmap_mode=mmap_mode,
+        load_workers=load_workers,
+    )
 
-    model_repo = JoblibModelRepository(
-        models_dir=Path(cfg_train["paths"]["models_dir"])
+
+def build_inference_model_repository(
+    inference_cfg: InferenceConfig | str = "configs/inference.yaml",
+    config: AppConfig | None = None,
+) -> CachedJoblibModelRepository:
+    """Repository d'inférence : mmap + LRU partagé + chargement parallèle."""
+    config = config or load_config()
+    cache_cfg = _inference(inference_cfg).model_cache
+
+    return _cached_model_repository(
+        models_dir=str(config.paths.models_dir),
+        max_bytes=int(cache_cfg.max_mb * 1024 ** 2),
+        mmap_mode=cache_cfg.mmap_mode,
+        load_workers=cache_cfg.load_workers,
+    )
+
+
+def build_row_deduplicator(
+    inference_cfg: InferenceConfig | str = "configs/inference.yaml",
+) -> HashRowDeduplicator | None:
+    """Inférence sur les lignes uniques (features brutes du schéma, jamais l'id)."""
+    dedup_cfg = _inference(inference_cfg).dedup
+    if not dedup_cfg.enabled:
+        return None
+
+    schema = build_feature_schema()
+    return HashRowDeduplicator(
+        columns=schema.numeric_features + schema.categorical_features,
+        min_ratio=dedup_cfg.min_ratio,
     )
 
+
+def build_submission_use_case(
+    inference_cfg: InferenceConfig | str = "configs/inference.yaml",
+    config: AppConfig | None = None,
+):
+    config = config or load_config()
+    inference = _inference(inference_cfg)
+
     return BuildSubmissionUseCase(
-        model_repository=model_repo,
-        id_col=cfg_train["data"]["id_col"],
-        top_k=cfg_train["training"]["top_k"],
-    )
\ No newline at end of file
+        model_repository=build_inference_model_repository(inference, config),
+        id_col=config.data.id_col,
+        top_k=config.training.top_k,
+        prefetch=inference.submission.prefetch,
+        deduplicator=build_row_deduplicator(inference),
+    )
+
+
+def build_test_batches(
+    inference_cfg: InferenceConfig | str = "configs/inference.yaml",
+    config: AppConfig | None = None,
+):
+    """Blocs du test pour BuildSubmissionUseCase.execute_streaming."""
+    config = config or load_config()
+
+    repo = build_dataset_repository(config)
+    return repo.iter_test_dataset(_inference(inference_cfg).submission.batch_size)
+
+
+def build_inference_predictor(
+    model_name: str,
+    inference_cfg: InferenceConfig | str = "configs/inference.yaml",
+    config: AppConfig | None = None,
+) -> PredictTopKUseCase:
+    """
+    Pipeline chargé UNE fois + top-K, pour l'API d'inférence.
+
+    api.compiled = true : features préparées en NumPy pur (compiled_pipeline.py).
+    """
+    config = config or load_config()
+    inference = _inference(inference_cfg)
+
+    pipeline = build_inference_model_repository(inference, config).load(model_name)
+    if inference.api is not None and inference.api.compiled:
+        pipeline = compile_pipeline(pipeline)
+
+    return PredictTopKUseCase(
+        pipeline=pipeline,
+        k=config.training.top_k,
+    )
+
+
+def build_probability_ensemble(
+    model_names: Optional[List[str]] = None,
+    inference_cfg: InferenceConfig | str = "configs/inference.yaml",
+    config: AppConfig | None = None,
+) -> ProbabilityEnsemble:
+    """
+    Ensemble de pipelines chargés en parallèle (démarrage ≈ modèle le plus lent),
+    prédits en parallèle avec un budget de threads (ensemble.* de inference.yaml).
+
+    model_names = None : membres et poids lus dans ensemble.blend_config
+    (généré par optimize_blend_weights).
+    """
+    inference = _inference(inference_cfg)
+    ensemble_cfg = inference.ensemble
+
+    weights = None
+    if model_names is None:
+        # Généré par optimize_blend_weights : relu à chaque appel (pas une config statique)
+        blend = load_yaml_config(ensemble_cfg.blend_config)
+        model_names, weights = blend["members"], blend["weights"]
+
+    pipelines = build_inference_model_repository(inference, config).load_many(model_names)
+
+    return ProbabilityEnsemble(
+        [pipelines[name] for name in model_names],
+        n_workers=ensemble_cfg.n_workers,
+        thread_budget=ensemble_cfg.thread_budget or os.cpu_count(),
+        weights=weights,
+    )
+
+
+def build_ensemble_topk_use_case(
+    model_names: Optional[List[str]] = None,
+    inference_cfg: InferenceConfig | str = "configs/inference.yaml",
+    config: AppConfig | None = None,
+) -> PredictEnsembleTopKUseCase:
+    """Top-K d'un ensemble (voir build_probability_ensemble), lignes dédupliquées si configuré."""
+    config = config or load_config()
+    inference = _inference(inference_cfg)
+    return PredictEnsembleTopKUseCase(
+        ensemble=build_probability_ensemble(model_names, inference, config),
+        top_k=config.training.top_k,
+        deduplicator=build_row_deduplicator(inference),
+    )
+
+
+# ======================================================
+# 10. Blending (poids optimisés sur les OOF)
+# ======================================================
+
+def build_optimize_blend_weights_use_case(config: AppConfig | None = None) -> OptimizeBlendWeightsUseCase:
+    config = config or load_config()
+    return OptimizeBlendWeightsUseCase(
+        oof_store=build_oof_store(config),
+        top_k=config.training.top_k,
+        seed=config.project.seed,
+    )
+
+
+def optimize_blend_weights(
+    run_names: List[str],
+    model_names: Optional[List[str]] = None,
+    inference_cfg: InferenceConfig | str = "configs/inference.yaml",
+    config: AppConfig | None = None,
+) -> BlendResult:
+    """Cherche les poids sur les OOF et écrit ensemble.blend_config."""
+    result = build_optimize_blend_weights_use_case(config).execute(run_names, model_names)
+
+    save_yaml_config(result.as_config(), _inference(inference_cfg).ensemble.blend_config)
+    return result
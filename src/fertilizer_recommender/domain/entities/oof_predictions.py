@@ -0,0 +1,47 @@
+"""
+oof_predictions.py
+
+Pourquoi ce fichier existe ?
+- Les probabilités out-of-fold (OOF) d'une CV sont la matière première du
+  blending, du stacking et de la calibration.
+- Les recalculer = relancer toute la CV.
+
+À quoi ça sert réellement ?
+- Décrire les OOF d'une run : une ligne par observation du train, prédite par
+  le seul modèle qui ne l'a pas vue.
+
+Très utile ?
+OUI. C'est ce qui rend le blending rapide (voir blend_optimizer.py).
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class OOFPredictions:
+    """
+    OOF d'une run de CV (tableaux éventuellement en mémoire mappée).
+
+    - proba : float32 (n_rows, n_classes), colonnes dans l'ordre de `classes`
+    - fold_ids : fold (1..n_splits) qui a prédit chaque ligne
+    - row_index : index du DataFrame d'entraînement (alignement entre runs)
+    - y_idx : vraie classe encodée dans `classes` (-1 si inconnue)
+    """
+    run_name: str
+    proba: np.ndarray
+    fold_ids: np.ndarray
+    row_index: np.ndarray
+    y_idx: np.ndarray
+    classes: List[str]
+
+    @property
+    def n_rows(self) -> int:
+        return self.proba.shape[0]
+
+    @property
+    def n_folds(self) -> int:
+        return int(self.fold_ids.max()) if len(self.fold_ids) else 0
@@ -0,0 +1,52 @@
+"""
+cv_checkpoint_store.py
+
+Pourquoi ce fichier existe ?
+- Une CV longue (CatBoost 5 folds) est "tout ou rien" : un process tué au
+  fold 4 (OOM, kernel de notebook redémarré) fait perdre les folds terminés.
+- La CV doit pouvoir sauvegarder / relire ses folds sans savoir OÙ ni
+  COMMENT ils sont stockés.
+
+À quoi ça sert réellement ?
+- Définir un CONTRAT de checkpoint par fold (pipeline appris, OOF, score,
+  temps) et d'état de run (identifiant de la run du tracker), pour une clé
+  = config de la run + empreinte des données.
+
+Est-ce critique ?
+Non pour entraîner, OUI pour reprendre une CV de plusieurs heures.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Mapping, Protocol
+
+
+class CVCheckpoint(Protocol):
+    def completed_folds(self) -> List[int]:
+        """Folds déjà sauvegardés (complets)"""
+        ...
+
+    def load_fold(self, fold: int) -> Any:
+        """Relit le checkpoint d'un fold"""
+        ...
+
+    def save_fold(self, fold: int, checkpoint: Any) -> None:
+        """Sauvegarde (atomique) le checkpoint d'un fold terminé"""
+        ...
+
+    def load_state(self) -> Dict[str, Any]:
+        """État de la run (ex: run_id du tracker), vide si aucun"""
+        ...
+
+    def save_state(self, state: Mapping[str, Any]) -> None:
+        """Sauvegarde l'état de la run"""
+        ...
+
+    def clear(self) -> None:
+        """Supprime les checkpoints (nouvelle CV sans reprise, ou CV terminée)"""
+        ...
+
+
+class CVCheckpointStore(Protocol):
+    def open(self, run_name: str, key: str) -> CVCheckpoint:
+        """Checkpoints d'une run pour une clé (config + données) donnée"""
+        ...
@@ -15,7 +15,7 @@ OUI. C’est le cœur de la Clean Architecture.
 """
 
 from __future__ import annotations
-from typing import Protocol, Any
+from typing import Protocol, Any, Iterator
 
 
 class DatasetRepository(Protocol):
@@ -26,3 +26,7 @@ class DatasetRepository(Protocol):
     def load_test_dataset(self) -> Any:
         """Charge le dataset de test"""
         ...
+
+    def iter_test_dataset(self, batch_size: int) -> Iterator[Any]:
+        """Parcourt le dataset de test par blocs de `batch_size` lignes"""
+        ...
@@ -41,7 +41,12 @@ class ExperimentTracker(Protocol):
         """
         ...
 
-    def start_run(self, run_name: str | None = None) -> None:
+    def start_run(
+        self,
+        run_name: str | None = None,
+        nested: bool = False,
+        run_id: str | None = None,
+    ) -> None:
         """
         Démarre une nouvelle run de tracking.
 
@@ -49,6 +54,18 @@ class ExperimentTracker(Protocol):
         ----------
         run_name : str | None
             Nom optionnel de la run.
+        nested : bool
+            True : run enfant de la run active (ex: un modèle d'un sweep),
+            qui reste ouverte ; `end_run` referme alors l'enfant seulement.
+        run_id : str | None
+            Identifiant d'une run existante à rouvrir (reprise d'une CV
+            interrompue) : les logs s'ajoutent à cette run.
+        """
+        ...
+
+    def active_run_id(self) -> str | None:
+        """
+        Identifiant de la run active (None si aucune).
         """
         ...
 
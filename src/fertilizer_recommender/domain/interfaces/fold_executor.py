@@ -0,0 +1,33 @@
+"""
+fold_executor.py
+
+Pourquoi ce fichier existe ?
+- La CV peut s'exécuter fold par fold OU en parallèle (process pool, cluster…).
+- L'application ne doit pas savoir COMMENT les folds sont exécutés.
+
+À quoi ça sert réellement ?
+- Définir un CONTRAT : "exécute cette fonction pour chaque fold,
+  rends-moi les résultats au fur et à mesure".
+
+Très utile ?
+OUI dès que la CV devient longue (750k lignes, boosters).
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Iterator, Protocol, Sequence, Tuple
+
+
+class FoldExecutor(Protocol):
+    def map_folds(
+        self,
+        fold_fn: Callable[[int], Any],
+        folds: Sequence[int],
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Exécute `fold_fn(fold)` pour chaque fold.
+
+        Les couples (fold, résultat) sont rendus dans l'ordre de FIN
+        d'exécution (pas forcément l'ordre des folds) : c'est à l'appelant
+        de réordonner s'il a besoin d'un ordre déterministe.
+        """
+        ...
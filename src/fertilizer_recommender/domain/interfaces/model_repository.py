@@ -14,7 +14,7 @@ OUI. Sans ce port, ton application est couplée au stockage.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, Sequence
 
 
 class ModelRepository(ABC):
@@ -26,4 +26,8 @@ class ModelRepository(ABC):
     @abstractmethod
     def load(self, name: str) -> Any:
         """Charge un modèle"""
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def load_many(self, names: Sequence[str]) -> Dict[str, Any]:
+        """Charge plusieurs modèles (séquentiel par défaut ; parallèle si l'implémentation le permet)"""
+        return {name: self.load(name) for name in names}
@@ -0,0 +1,60 @@
+"""
+oof_store.py
+
+Pourquoi ce fichier existe ?
+- La CV doit pouvoir conserver ses prédictions out-of-fold sans savoir
+  OÙ ni COMMENT elles sont stockées (.npy, Parquet, S3…).
+
+À quoi ça sert réellement ?
+- Définir un CONTRAT d'écriture (fold par fold) et de relecture des OOF.
+
+Est-ce critique ?
+Non pour entraîner, OUI pour blender / stacker sans ré-entraîner.
+"""
+
+from __future__ import annotations
+from typing import List, Protocol, Sequence
+
+import numpy as np
+
+from fertilizer_recommender.domain.entities.oof_predictions import OOFPredictions
+
+
+class OOFWriter(Protocol):
+    def write_fold(
+        self,
+        fold: int,
+        positions: np.ndarray,
+        proba: np.ndarray,
+        classes: Sequence[str],
+    ) -> None:
+        """Écrit les probabilités d'un fold (positions = lignes de validation)"""
+        ...
+
+    def close(self) -> str:
+        """Finalise la run (toutes les lignes écrites) et retourne son manifeste"""
+        ...
+
+    def abort(self) -> None:
+        """Abandonne l'écriture (CV interrompue) : rien n'est publié"""
+        ...
+
+
+class OOFStore(Protocol):
+    def open_writer(
+        self,
+        run_name: str,
+        row_index: np.ndarray,
+        y_idx: np.ndarray,
+        classes: Sequence[str],
+    ) -> OOFWriter:
+        """Prépare le stockage des OOF d'une run"""
+        ...
+
+    def load(self, run_name: str) -> OOFPredictions:
+        """Relit les OOF d'une run (sans copie si possible)"""
+        ...
+
+    def list_runs(self) -> List[str]:
+        """Runs disponibles"""
+        ...
@@ -0,0 +1,32 @@
+"""
+row_deduplicator.py
+
+Pourquoi ce fichier existe ?
+- Le test contient des lignes aux features identiques : les prédire une par
+  une recalcule plusieurs fois exactement le même résultat.
+- L'application ne doit pas savoir COMMENT les doublons sont détectés.
+
+À quoi ça sert réellement ?
+- Définir un CONTRAT : "applique cette fonction aux lignes uniques de X,
+  rends-moi le résultat pour toutes les lignes, dans l'ordre d'origine".
+
+Très utile ?
+OUI pour la submission et les gros batchs d'inférence.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Protocol
+
+import numpy as np
+
+
+class RowDeduplicator(Protocol):
+    def apply(self, X_df: Any, fn: Callable[[Any], np.ndarray]) -> np.ndarray:
+        """
+        `fn` appliquée aux lignes uniques de X_df (features identiques = même
+        ligne), résultat ré-indexé vers les lignes d'origine (n, ...).
+
+        `fn` doit traiter chaque ligne indépendamment des autres (predict_proba,
+        top-k) : la sortie est alors identique à `fn(X_df)`.
+        """
+        ...
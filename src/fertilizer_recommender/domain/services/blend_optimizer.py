@@ -0,0 +1,209 @@
+"""
+blend_optimizer.py
+
+Pourquoi ce fichier existe ?
+- Trouver les poids d'un ensemble par essais / erreurs dans un notebook, avec
+  un predict_proba complet par essai, prend des heures.
+- Les probabilités out-of-fold (OOFStore) suffisent : aucun modèle à relancer.
+
+À quoi ça sert réellement ?
+- `BlendScorer` / `map_at_k_weight_batch` : MAP@K de B pondérations
+  candidates d'un coup. Le rang de la vraie classe se compte sans tri :
+      rang = 1 + #(score > score_vrai) + #(score == score_vrai, indice < vrai)
+  (mêmes égalités que top_k_indices : tri stable, indice croissant).
+- `optimize_blend_weights` : recherche par montée de gradient discrète
+  (hill climbing) : transferts de poids entre paires de membres, pas
+  décroissants, chaque itération évaluant tous les voisins en un seul lot.
+
+Très utile ?
+OUI. Le réglage d'un blend passe de plusieurs heures à quelques secondes.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+# Éléments (B x lignes) traités par bloc : borne la mémoire de travail
+_CHUNK_ELEMENTS = 1 << 22
+
+
+@dataclass(frozen=True)
+class BlendSearchResult:
+    weights: np.ndarray          # (m,), positifs, somme = 1
+    score: float                 # MAP@K OOF du blend retenu
+    uniform_score: float         # MAP@K OOF de la moyenne simple
+    n_evaluations: int           # pondérations évaluées
+
+
+class BlendScorer:
+    """
+    Score MAP@K de lots de pondérations sur des OOF fixes.
+
+    Préparation (une fois) : lignes regroupées par vraie classe, probabilités
+    réorganisées en (m, c, n) contiguës. Pour le bloc des lignes de classe t :
+        rang = 1 + Σ_{j<t} [blend_j >= blend_t] + Σ_{j>t} [blend_j > blend_t]
+    (égalités départagées par indice croissant, comme top_k_indices).
+    Chaque terme est un produit (B, m) x (m, lignes) suivi d'une comparaison :
+    aucun tri, aucun masque, uniquement des tableaux contigus.
+    """
+
+    def __init__(self, probas: np.ndarray, y_idx: np.ndarray, k: int = 3):
+        n_members, n_rows, n_classes = probas.shape
+        y_idx = np.asarray(y_idx)
+        if len(y_idx) != n_rows:
+            raise ValueError("y_idx et probas doivent avoir le même nombre de lignes.")
+
+        self.k = k
+        self.n_members = n_members
+        self.n_rows = n_rows  # dénominateur : les lignes inconnues (-1) comptent 0
+
+        order = np.argsort(y_idx, kind="stable")
+        order = order[y_idx[order] >= 0]
+        self._columns = np.ascontiguousarray(
+            np.asarray(probas, dtype=np.float32)[:, order, :].transpose(0, 2, 1)
+        )
+        counts = np.bincount(y_idx[order], minlength=n_classes)
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        self._blocks = [
+            (t, int(bounds[t]), int(bounds[t + 1])) for t in range(n_classes) if counts[t]
+        ]
+        # AP par rang : 1/rang si rang <= k, sinon 0 (rang borné par n_classes)
+        self._ap_by_rank = np.array(
+            [0.0] + [1.0 / r if r <= k else 0.0 for r in range(1, n_classes + 1)]
+        )
+
+    def score(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            weights: (B, m) pondérations candidates (positives)
+
+        Returns:
+            np.ndarray: (B,) scores MAP@K
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float32))
+        n_candidates = weights.shape[0]
+        if weights.shape[1] != self.n_members:
+            raise ValueError(f"{weights.shape[1]} poids pour {self.n_members} membres.")
+        if self.n_rows == 0:
+            return np.zeros(n_candidates)
+
+        n_classes = self._columns.shape[1]
+        row_chunk = max(1, _CHUNK_ELEMENTS // n_candidates)
+        totals = np.zeros(n_candidates, dtype=np.float64)
+
+        for t, block_start, block_stop in self._blocks:
+            for start in range(block_start, block_stop, row_chunk):
+                stop = min(start + row_chunk, block_stop)
+                true_score = weights @ self._columns[:, t, start:stop]
+
+                rank = np.ones(true_score.shape, dtype=np.uint8)
+                for j in range(n_classes):
+                    if j == t:
+                        continue
+                    blended = weights @ self._columns[:, j, start:stop]
+                    beats = (
+                        np.greater_equal(blended, true_score) if j < t
+                        else np.greater(blended, true_score)
+                    )
+                    rank += beats
+                totals += self._ap_by_rank[rank].sum(axis=1)
+
+        return totals / self.n_rows
+
+
+def map_at_k_weight_batch(
+    probas: np.ndarray,
+    y_idx: np.ndarray,
+    weights: np.ndarray,
+    k: int = 3,
+) -> np.ndarray:
+    """
+    MAP@K de plusieurs blends à la fois.
+
+    Args:
+        probas: (m, n, c) probabilités OOF des m membres
+        y_idx: (n,) vraie classe encodée (-1 = inconnue, compte 0)
+        weights: (B, m) pondérations candidates (positives)
+        k: cutoff (3 pour la compétition)
+
+    Returns:
+        np.ndarray: (B,) scores MAP@K
+    """
+    return BlendScorer(probas, y_idx, k=k).score(weights)
+
+
+def _transfer_candidates(weights: np.ndarray, step: float) -> np.ndarray:
+    """Voisins : `step` de poids transféré de j vers i (somme conservée)."""
+    n_members = len(weights)
+    candidates = []
+    for i in range(n_members):
+        for j in range(n_members):
+            move = min(step, weights[j])
+            if i == j or move <= 0:
+                continue
+            candidate = weights.copy()
+            candidate[i] += move
+            candidate[j] -= move
+            candidates.append(candidate)
+    return np.array(candidates).reshape(-1, n_members)
+
+
+def optimize_blend_weights(
+    probas: np.ndarray,
+    y_idx: np.ndarray,
+    k: int = 3,
+    steps: Sequence[float] = (0.2, 0.1, 0.05, 0.02, 0.01),
+    n_random: int = 256,
+    max_iter: int = 200,
+    seed: int = 42,
+    tol: float = 1e-7,
+) -> BlendSearchResult:
+    """
+    Poids de blend maximisant le MAP@K out-of-fold.
+
+    1) Départ : meilleur point parmi moyenne simple, membres seuls et
+       `n_random` tirages de Dirichlet (exploration, reproductible via `seed`).
+    2) Hill climbing : pour chaque pas (décroissant), on accepte le meilleur
+       transfert de poids tant qu'il améliore le score de plus de `tol`.
+    """
+    n_members = probas.shape[0]
+    scorer = BlendScorer(probas, y_idx, k=k)
+    uniform = np.full(n_members, 1.0 / n_members)
+    rng = np.random.default_rng(seed)
+
+    starts = np.vstack([
+        uniform,
+        np.eye(n_members),
+        rng.dirichlet(np.ones(n_members), size=n_random) if n_members > 1 else uniform[None],
+    ])
+    scores = scorer.score(starts)
+    n_evaluations = len(starts)
+
+    best = int(np.argmax(scores))
+    weights, score = starts[best], float(scores[best])
+    uniform_score = float(scores[0])
+
+    iterations = 0
+    for step in steps:
+        while iterations < max_iter:
+            candidates = _transfer_candidates(weights, step)
+            if len(candidates) == 0:
+                break
+            scores = scorer.score(candidates)
+            n_evaluations += len(candidates)
+            iterations += 1
+
+            best = int(np.argmax(scores))
+            if scores[best] <= score + tol:
+                break
+            weights, score = candidates[best], float(scores[best])
+
+    weights = np.clip(weights, 0.0, None)
+    return BlendSearchResult(
+        weights=weights / weights.sum(),
+        score=score,
+        uniform_score=uniform_score,
+        n_evaluations=n_evaluations,
+    )
@@ -9,26 +9,105 @@ Pourquoi ce fichier existe ?
 - Combiner plusieurs matrices de probabilités en une seule.
 - Garantir un comportement cohérent pour MAP@3.
 
+Mémoire :
+- Les membres sont accumulés un par un (liste OU générateur), en float32 et
+  en place : O(n·c) quel que soit le nombre de membres, au lieu du tableau
+  3D (n_membres, n, c) float64 qu'empilait np.mean.
+
 Très utile ?
 OUI. Une mauvaise règle d’ensemble = perte de score Kaggle.
 """
 
 from __future__ import annotations
+from typing import Iterable, Optional, Sequence
+
 import numpy as np
-from typing import List
 
 
-def average_probabilities(probabilities: List[np.ndarray]) -> np.ndarray:
+class ProbabilityAccumulator:
+    """
+    Moyenne (pondérée) incrémentale de matrices (n_samples, n_classes).
+
+    Usage :
+        acc = ProbabilityAccumulator()
+        for proba in members:        # un membre en mémoire à la fois
+            acc.add(proba, weight=w)
+        blended = acc.result()
+    """
+
+    def __init__(self, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self.total_weight = 0.0
+        self.n_members = 0
+        self._sum: Optional[np.ndarray] = None
+        self._scratch: Optional[np.ndarray] = None
+
+    def add(self, proba: np.ndarray, weight: float = 1.0) -> None:
+        proba = np.asarray(proba)
+        if weight < 0:
+            raise ValueError("Les poids de l'ensemble doivent être positifs.")
+
+        if self._sum is None:
+            self._sum = np.empty(proba.shape, dtype=self.dtype)
+            np.multiply(proba, weight, out=self._sum, casting="same_kind")
+        else:
+            if proba.shape != self._sum.shape:
+                raise ValueError(
+                    f"Dimensions incompatibles : {proba.shape} vs {self._sum.shape}"
+                )
+            if weight == 1.0:
+                np.add(self._sum, proba, out=self._sum, casting="same_kind")
+            else:
+                if self._scratch is None:
+                    self._scratch = np.empty_like(self._sum)
+                np.multiply(proba, weight, out=self._scratch, casting="same_kind")
+                self._sum += self._scratch
+
+        self.total_weight += weight
+        self.n_members += 1
+
+    def result(self) -> np.ndarray:
+        """Moyenne pondérée (le buffer interne est rendu, sans copie)."""
+        if self._sum is None:
+            raise ValueError("Aucune probabilité fournie pour l'ensemble.")
+        if self.total_weight <= 0:
+            raise ValueError("La somme des poids de l'ensemble doit être > 0.")
+
+        self._sum /= self.dtype.type(self.total_weight)
+        blended, self._sum, self._scratch = self._sum, None, None
+        return blended
+
+
+def average_probabilities(
+    probabilities: Iterable[np.ndarray],
+    weights: Optional[Sequence[float]] = None,
+    dtype=np.float32,
+) -> np.ndarray:
     """
-    Moyenne simple des probabilités (blending).
+    Moyenne (pondérée) des probabilités (blending).
 
     Args:
-        probabilities: liste de matrices (n_samples, n_classes)
+        probabilities: matrices (n_samples, n_classes), liste ou générateur
+            (consommé un membre à la fois)
+        weights: un poids par membre (None = moyenne simple)
+        dtype: précision de l'accumulateur (float32 par défaut)
 
     Returns:
         np.ndarray: matrice moyennée
     """
-    if not probabilities:
-        raise ValueError("Aucune probabilité fournie pour l'ensemble.")
+    accumulator = ProbabilityAccumulator(dtype=dtype)
+    weights = None if weights is None else list(weights)
+
+    for i, proba in enumerate(probabilities):
+        if weights is None:
+            accumulator.add(proba)
+        elif i < len(weights):
+            accumulator.add(proba, weight=weights[i])
+        else:
+            raise ValueError(f"{len(weights)} poids fournis pour plus de membres.")
 
-    return np.mean(probabilities, axis=0)
\ No newline at end of file
+    if weights is not None and accumulator.n_members != len(weights):
+        raise ValueError(
+            f"{len(weights)} poids fournis pour {accumulator.n_members} membres de l'ensemble."
+        )
+    return accumulator.result()
@@ -1,4 +1,5 @@
 # src/fertilizer_recommender/domain/services/experiment_tracking_service.py
+from __future__ import annotations
 from contextlib import contextmanager
 from loguru import logger
 from typing import Any, Mapping
@@ -23,15 +24,29 @@ class ExperimentTrackingService:
     # -----------------------------------------
     # Cycle de vie des expériences
     # -----------------------------------------
-    def start_experiment(self, *, experiment_name: str, run_name: str) -> None:
-        """Démarre une nouvelle expérience et une run associée."""
+    def start_experiment(
+        self,
+        *,
+        experiment_name: str,
+        run_name: str,
+        run_id: str | None = None,
+    ) -> None:
+        """
+        Démarre une nouvelle expérience et une run associée
+        (ou rouvre la run `run_id`, pour reprendre une CV interrompue).
+        """
         self._logger.info(
             f"Initialisation de l'expérience '{experiment_name}' (run='{run_name}')"
         )
         # Sécurité : fermeture d’une run précédente
         self._tracker.end_run()  # sécurité (si run précédente ouverte)
         self._tracker.setup_experiment(experiment_name)
-        self._tracker.start_run(run_name)
+        self._tracker.start_run(run_name, run_id=run_id)
+
+    @property
+    def run_id(self) -> str | None:
+        """Identifiant de la run active (à conserver pour une reprise)."""
+        return self._tracker.active_run_id()
 
     # -----------------------------------------
     # Logging contextuel
@@ -64,15 +79,29 @@ class ExperimentTrackingService:
     # API CONTEXTUELLE (recommandée)
     # -----------------------------------------
     @contextmanager
-    def experiment(self, *, experiment_name: str, run_name: str):
+    def experiment(self, *, experiment_name: str, run_name: str, run_id: str | None = None):
         """
         Point d’entrée UNIQUE pour les use cases.
         """
         self.start_experiment(
             experiment_name=experiment_name,
             run_name=run_name,
+            run_id=run_id,
         )
         try:
             yield
         finally:
-            self.close()
\ No newline at end of file
+            self.close()
+
+    @contextmanager
+    def child_run(self, *, run_name: str):
+        """
+        Run enfant de l'expérience en cours (ex: un modèle d'un sweep).
+        Les logs vont dans l'enfant ; la run parente reprend à la sortie.
+        """
+        self._logger.info(f"Run enfant '{run_name}'")
+        self._tracker.start_run(run_name, nested=True)
+        try:
+            yield
+        finally:
+            self._tracker.end_run()
\ No newline at end of file
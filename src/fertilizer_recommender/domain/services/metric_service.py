@@ -11,10 +11,18 @@ Pourquoi ce fichier existe ?
 
 Ce fichier est-il “très utile” ?
 Oui, critique : si tu calcules mal MAP@3, tu optimises dans le mauvais sens.
+
+Implémentation :
+- `map_at_k_indices` est le moteur vectorisé (NumPy) sur labels encodés en entiers.
+- `map_at_k` (API strings) encode les labels puis délègue au moteur.
+- `average_precision_at_k` reste la référence "un exemple" lisible de la règle Kaggle.
 """
 
 from __future__ import annotations
-from typing import List, Sequence
+from itertools import chain, repeat
+from typing import Any, Sequence, Tuple
+
+import numpy as np
 
 
 def average_precision_at_k(y_true: str, y_pred_topk: Sequence[str], k: int = 3) -> float:
@@ -42,6 +50,78 @@ def average_precision_at_k(y_true: str, y_pred_topk: Sequence[str], k: int = 3)
     return 0.0
 
 
+def map_at_k_indices(
+    y_true_idx: np.ndarray,
+    topk_idx: np.ndarray,
+    k: int = 3,
+) -> float:
+    """
+    MAP@K vectorisé sur labels encodés en entiers.
+
+    Args:
+        y_true_idx: shape (n_samples,), indice de la classe correcte
+        topk_idx: shape (n_samples, >=k), indices ordonnés des prédictions
+            (-1 = pas de prédiction à ce rang)
+        k: cutoff (3 pour la compétition)
+
+    Returns:
+        float: moyenne des AP@K
+
+    Note:
+    Le score d'une ligne vaut 1/rang du PREMIER match. Les doublons ne
+    décalent pas les rangs et un doublon du bon label arrive forcément après
+    le premier match : ignorer les doublons (règle Kaggle) ne change donc rien.
+    """
+    y_true_idx = np.asarray(y_true_idx)
+    topk_idx = np.asarray(topk_idx)
+
+    if topk_idx.ndim != 2 or y_true_idx.ndim != 1:
+        raise ValueError("y_true_idx doit être 1-D et topk_idx 2-D.")
+    if len(y_true_idx) != len(topk_idx):
+        raise ValueError("y_true et y_pred_topk doivent avoir la même longueur.")
+    if len(y_true_idx) == 0:
+        return 0.0
+
+    # k est petit (3) : une passe vectorisée par rang, sans matrice (n, k)
+    found = np.zeros(len(y_true_idx), dtype=bool)
+    total = 0.0
+    for rank in range(min(k, topk_idx.shape[1])):
+        hit = (topk_idx[:, rank] == y_true_idx) & ~found
+        total += np.count_nonzero(hit) / (rank + 1)
+        found |= hit
+    return total / len(y_true_idx)
+
+
+def _encode_labels(
+    y_true: Sequence[Any],
+    y_pred_topk: Sequence[Sequence[Any]],
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode labels vrais et prédictions dans un vocabulaire commun d'entiers.
+
+    Une prédiction absente de y_true ne peut jamais matcher : elle est encodée -1.
+    """
+    lookup = {label: i for i, label in enumerate(set(y_true))}
+    n = len(y_true)
+    y_idx = np.fromiter(map(lookup.__getitem__, y_true), dtype=np.int64, count=n)
+
+    widths = set(map(len, y_pred_topk))
+    if len(widths) == 1:
+        width = widths.pop()
+        flat = chain.from_iterable(y_pred_topk)
+        topk_idx = np.fromiter(
+            map(lookup.get, flat, repeat(-1)), dtype=np.int64, count=n * width
+        ).reshape(n, width)[:, :k]
+    else:  # lignes de longueurs différentes
+        topk_idx = np.full((n, k), -1, dtype=np.int64)
+        for row, preds in enumerate(y_pred_topk):
+            for rank, pred in enumerate(list(preds)[:k]):
+                topk_idx[row, rank] = lookup.get(pred, -1)
+
+    return y_idx, topk_idx
+
+
 def map_at_k(y_true: Sequence[str], y_pred_topk: Sequence[Sequence[str]], k: int = 3) -> float:
     """
     MAP@K sur un dataset.
@@ -56,6 +136,8 @@ def map_at_k(y_true: Sequence[str], y_pred_topk: Sequence[Sequence[str]], k: int
     """
     if len(y_true) != len(y_pred_topk):
         raise ValueError("y_true et y_pred_topk doivent avoir la même longueur.")
+    if len(y_true) == 0:
+        return 0.0
 
-    scores = [average_precision_at_k(t, p, k=k) for t, p in zip(y_true, y_pred_topk)]
-    return sum(scores) / len(scores) if scores else 0.0
\ No newline at end of file
+    y_idx, topk_idx = _encode_labels(y_true, y_pred_topk, k)
+    return map_at_k_indices(y_idx, topk_idx, k=k)
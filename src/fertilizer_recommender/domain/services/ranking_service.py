@@ -9,14 +9,146 @@ Pourquoi ce fichier existe ?
 - Convertir des probabilités en recommandations top-K.
 - Garantir un comportement cohérent partout (train, eval, submit).
 
+Implémentation :
+- `top_k_indices` est le moteur : il retourne une matrice compacte d'indices
+  de classes (n_samples, k), sans aucune chaîne de caractères.
+- Les labels ne sont matérialisés qu'en sortie (`indices_to_labels`,
+  `join_top_k_labels`), une fois par combinaison unique et non par ligne.
+- Règle de départage : probabilité décroissante, puis indice de classe
+  croissant en cas d'égalité stricte (déterministe).
+
 Est-ce critique ?
 OUI. Une erreur ici = score Kaggle faux.
 """
 
 from __future__ import annotations
-from typing import List, Sequence
+from typing import Any, List, Sequence
 import numpy as np
 
+# En dessous de ce nombre de classes, un tri complet stable est plus rapide
+# qu'une sélection partielle (argpartition a un surcoût fixe par ligne).
+_PARTIAL_SORT_MIN_CLASSES = 64
+
+# Au-delà, join_top_k_labels passe par np.unique au lieu d'une table directe
+_MAX_DIRECT_COMBOS = 1 << 20
+
+
+def _index_dtype(n_classes: int) -> np.dtype:
+    """Plus petit entier signé capable de stocker un indice de classe (ou -1)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_classes <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _partial_top_k(proba: np.ndarray, k: int) -> np.ndarray:
+    """
+    Sélection partielle des k meilleures classes (ordre NON trié).
+
+    Les égalités au seuil du k-ième sont départagées par indice croissant,
+    pour que la sélection soit déterministe (argpartition seul ne l'est pas).
+    Exige une matrice sans NaN (exactement k classes retenues par ligne).
+    """
+    kth = -np.partition(-proba, k - 1, axis=1)[:, k - 1 : k]
+    above = proba > kth
+    at_kth = proba == kth
+    n_missing = k - above.sum(axis=1, keepdims=True)
+    selected = above | (at_kth & (np.cumsum(at_kth, axis=1) <= n_missing))
+    # np.nonzero parcourt en ordre ligne par ligne, indices croissants
+    return np.nonzero(selected)[1].reshape(len(proba), k)
+
+
+def top_k_indices(proba: np.ndarray, k: int = 3) -> np.ndarray:
+    """
+    Indices des K classes les plus probables, ordonnés.
+
+    Args:
+        proba: shape (n_samples, n_classes)
+        k: nombre de prédictions
+
+    Returns:
+        np.ndarray: shape (n_samples, k), entiers compacts (int8 pour 7 classes)
+    """
+    proba = np.asarray(proba)
+    n_classes = proba.shape[1]
+    k = min(k, n_classes)
+
+    # NaN : pas d'ordre total pour la sélection partielle -> tri complet
+    # (NaN classés en dernier, comme pour toute autre ligne triée)
+    if n_classes < _PARTIAL_SORT_MIN_CLASSES or k == n_classes or np.isnan(proba).any():
+        # Tri stable sur -proba : égalités -> indice croissant
+        topk = np.argsort(-proba, axis=1, kind="stable")[:, :k]
+    else:
+        candidates = _partial_top_k(proba, k)
+        # Tri de k éléments seulement ; stable car candidates est croissant
+        order = np.argsort(
+            -np.take_along_axis(proba, candidates, axis=1), axis=1, kind="stable"
+        )
+        topk = np.take_along_axis(candidates, order, axis=1)
+
+    return topk.astype(_index_dtype(n_classes), copy=False)
+
+
+def encode_labels(labels: Sequence[Any], class_labels: Sequence[Any]) -> np.ndarray:
+    """
+    Encode des labels dans l'espace d'indices de `class_labels`.
+
+    Un label inconnu est encodé -1 (il ne matchera jamais une prédiction).
+    """
+    lookup = {label: i for i, label in enumerate(np.asarray(class_labels).tolist())}
+    return np.fromiter(
+        (lookup.get(label, -1) for label in labels), dtype=np.int64, count=len(labels)
+    )
+
+
+def indices_to_labels(topk_idx: np.ndarray, class_labels: Sequence[Any]) -> np.ndarray:
+    """
+    Matérialise les labels d'une matrice d'indices top-K.
+
+    Returns:
+        np.ndarray: shape (n_samples, k) de labels
+    """
+    return np.asarray(class_labels)[topk_idx]
+
+
+def join_top_k_labels(
+    topk_idx: np.ndarray,
+    class_labels: Sequence[Any],
+    sep: str = " ",
+) -> np.ndarray:
+    """
+    Format Kaggle "label1 label2 label3" pour chaque ligne.
+
+    Les chaînes sont construites une fois par combinaison présente d'indices
+    (au plus 210 pour 7 classes / top-3), puis rediffusées par indexation.
+
+    Returns:
+        np.ndarray: shape (n_samples,), dtype object
+    """
+    topk_idx = np.asarray(topk_idx)
+    n_samples, k = topk_idx.shape
+    class_labels = np.asarray(class_labels)
+    n_classes = len(class_labels)
+
+    if n_classes**k > _MAX_DIRECT_COMBOS:
+        combos, inverse = np.unique(topk_idx, axis=0, return_inverse=True)
+        joined = np.array(
+            [sep.join(map(str, row)) for row in class_labels[combos]], dtype=object
+        )
+        return joined[inverse.reshape(-1)]
+
+    # Chaque ligne -> un code entier unique en base n_classes
+    codes = np.zeros(n_samples, dtype=np.int64)
+    for rank in range(k):
+        codes = codes * n_classes + topk_idx[:, rank]
+
+    table = np.empty(n_classes**k, dtype=object)
+    present = np.flatnonzero(np.bincount(codes, minlength=n_classes**k))
+    for code in present:
+        ranks = np.unravel_index(code, (n_classes,) * k)
+        table[code] = sep.join(str(class_labels[i]) for i in ranks)
+    return table[codes]
+
 
 def predict_top_k(
     proba: np.ndarray,
@@ -26,6 +158,9 @@ def predict_top_k(
     """
     Convertit une matrice de probabilités en top-K labels ordonnés.
 
+    Adaptateur "listes de strings" au-dessus de `top_k_indices`,
+    conservé pour les notebooks ; le code applicatif consomme les indices.
+
     Args:
         proba: shape (n_samples, n_classes)
         class_labels: mapping index -> label
@@ -34,5 +169,4 @@ def predict_top_k(
     Returns:
         List[List[str]]: top-K labels par ligne
     """
-    topk_indices = np.argsort(proba, axis=1)[:, ::-1][:, :k]
-    return [[class_labels[i] for i in row] for row in topk_indices]
+    return indices_to_labels(top_k_indices(proba, k=k), class_labels).tolist()
@@ -15,6 +15,7 @@ Important mais remplaçable.
 
 from __future__ import annotations
 from pathlib import Path
+from typing import Iterator
 from pandas import DataFrame, read_csv
 
 
@@ -29,3 +30,13 @@ def load_csv(path: Path) -> DataFrame:
         pd.DataFrame
     """
     return read_csv(path)
+
+
+def iter_csv(path: Path, batch_size: int) -> Iterator[DataFrame]:
+    """
+    Lit un CSV par blocs de `batch_size` lignes (mémoire bornée).
+
+    L'index continue d'un bloc à l'autre, comme pour une lecture complète.
+    """
+    with read_csv(path, chunksize=batch_size) as reader:
+        yield from reader
@@ -0,0 +1,155 @@
+"""
+parquet_loader.py
+
+Pourquoi ce fichier existe ?
+- `read_csv` re-parse le texte à chaque chargement et infère int64 / float64 /
+  object : lent et gourmand en mémoire (chaque CLI, chaque notebook).
+- Parquet stocke les types compacts une fois pour toutes.
+
+À quoi ça sert réellement ?
+- Convertir UNE fois train.csv / test.csv en Parquet typé :
+  catégories pour Soil Type / Crop Type / target, int16 / float32 pour le numérique.
+- Relire ces fichiers en mémoire mappée, en ne lisant que les colonnes utiles.
+
+Est-ce critique ?
+Non. Utilisé seulement avec `data.format: parquet` (training.yaml) ; le
+format par défaut reste csv.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dépendance optionnelle (extra "parquet")
+    pa = None
+    pq = None
+
+
+def _require_pyarrow() -> None:
+    if pq is None:
+        raise ImportError(
+            "pyarrow est requis pour le format Parquet "
+            "(poetry install --extras parquet)."
+        )
+
+
+def _smallest_int_dtype(values: pd.Series) -> np.dtype:
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if values.min() >= info.min and values.max() <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def downcast_frame(
+    df: pd.DataFrame,
+    categorical_cols: Iterable[str] = (),
+) -> pd.DataFrame:
+    """
+    Types compacts : category pour les catégorielles, plus petit entier
+    (int16 / int32) pour les entiers, float32 pour les flottants.
+    """
+    categorical_cols = set(categorical_cols)
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if col in categorical_cols or values.dtype == object:
+            columns[col] = values.astype("category")
+        elif pd.api.types.is_integer_dtype(values) and len(values):
+            columns[col] = values.astype(_smallest_int_dtype(values))
+        elif pd.api.types.is_float_dtype(values):
+            columns[col] = values.astype(np.float32)
+        else:
+            columns[col] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def convert_csv_to_parquet(
+    csv_path: Path,
+    parquet_path: Path,
+    categorical_cols: Sequence[str] = (),
+) -> Path:
+    """
+    Conversion one-shot CSV -> Parquet typé.
+
+    Args:
+        csv_path: fichier source
+        parquet_path: fichier cible (dossier créé si besoin)
+        categorical_cols: colonnes à stocker en dictionnaire (category)
+
+    Returns:
+        Path: chemin du Parquet écrit
+    """
+    _require_pyarrow()
+
+    df = downcast_frame(pd.read_csv(csv_path), categorical_cols=categorical_cols)
+
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, parquet_path)
+
+    logger.info(
+        f"Parquet écrit : {parquet_path} ({len(df)} lignes, "
+        f"{df.memory_usage(deep=True).sum() / 1e6:.1f} Mo en mémoire)"
+    )
+    return parquet_path
+
+
+def load_parquet(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Charge un Parquet en mémoire mappée, avec projection de colonnes.
+
+    Args:
+        path: chemin du fichier Parquet
+        columns: colonnes à lire (None = toutes)
+
+    Returns:
+        pd.DataFrame (catégories conservées, types compacts)
+    """
+    _require_pyarrow()
+
+    columns = _file_ordered_columns(path, columns)
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    # self_destruct libère les buffers Arrow au fil de la conversion
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def iter_parquet(
+    path: Path,
+    batch_size: int,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lit un Parquet par blocs de `batch_size` lignes (mémoire bornée).
+
+    L'index continue d'un bloc à l'autre, comme pour une lecture complète.
+    """
+    _require_pyarrow()
+
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    columns = _file_ordered_columns(path, columns)
+    start = 0
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        df = batch.to_pandas()
+        df.index = pd.RangeIndex(start, start + len(df))
+        start += len(df)
+        yield df
+
+
+def _file_ordered_columns(path: Path, columns: Optional[List[str]]) -> Optional[List[str]]:
+    """Projection dans l'ordre des colonnes du fichier (identique au CSV d'origine)."""
+    if columns is None:
+        return None
+
+    file_columns = pq.read_schema(path, memory_map=True).names
+    missing = set(columns) - set(file_columns)
+    if missing:
+        raise KeyError(f"Colonnes absentes du Parquet {path}: {missing}")
+    return [col for col in file_columns if col in set(columns)]
@@ -10,25 +10,126 @@ Pourquoi ce fichier existe ?
 - Calculer predict_proba pour chacun
 - Retourner une probabilité agrégée
 
+Performance :
+- Le feature engineering (sans état) est calculé UNE fois sur l'entrée, puis
+  partagé : chaque FeaturePipeline membre détecte le DataFrame déjà enrichi.
+- Les predict_proba des membres tournent en parallèle dans un pool de threads
+  (les boosters relâchent le GIL), avec un budget total de threads réparti
+  entre les membres. Latence ≈ celle du membre le plus lent.
+- Le budget s'applique à des copies des membres (`with_n_threads`) : les
+  pipelines du cache de modèles gardent leur propre nombre de threads.
+
 Très utile ?
 OUI. C’est la brique “Top Kaggle”.
 """
 
 from __future__ import annotations
-from typing import List
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
 import numpy as np
+from threadpoolctl import threadpool_limits
 
 from fertilizer_recommender.domain.services.ensemble_service import average_probabilities
+from fertilizer_recommender.infrastructure.ml.preprocessors.feature_engineering import FeatureEngineer
+
+
+def _member_feature_engineer(pipeline) -> Optional[FeatureEngineer]:
+    # TrainingPipeline(transformer=FeaturePipeline) ; None pour les autres membres
+    return getattr(getattr(pipeline, "transformer", None), "feature_engineer", None)
+
+
+def _with_n_threads(pipeline, n_threads: int):
+    # Copie superficielle du pipeline, modèle remplacé par sa copie budgétée
+    with_n_threads = getattr(getattr(pipeline, "model", None), "with_n_threads", None)
+    if with_n_threads is None:
+        return pipeline
+    member = copy.copy(pipeline)
+    member.model = with_n_threads(n_threads)
+    return member
 
 
 class ProbabilityEnsemble:
-    def __init__(self, pipelines: List):
+    def __init__(
+        self,
+        pipelines: List,
+        n_workers: int = 1,
+        thread_budget: Optional[int] = None,
+        weights: Optional[Sequence[float]] = None,
+    ):
+        """
+        Args:
+            pipelines: pipelines entraînés (mêmes classes_)
+            weights: un poids par pipeline (None = moyenne simple),
+                ex: issus de OptimizeBlendWeightsUseCase
+            n_workers: membres prédits en parallèle (1 = séquentiel)
+            thread_budget: threads au total ; chaque membre reçoit
+                thread_budget // n_workers threads (None = pas de limite)
+        """
         self.pipelines = pipelines
+        self.n_workers = max(1, min(n_workers, len(pipelines)))
+        self.thread_budget = thread_budget
+        self.weights = None if weights is None else list(weights)
+        if self.weights is not None and len(self.weights) != len(pipelines):
+            raise ValueError(f"{len(self.weights)} poids pour {len(pipelines)} pipelines.")
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Union des features dérivées des membres : calculées une seule fois
+        engineers = [fe for fe in map(_member_feature_engineer, pipelines) if fe is not None]
+        self.shared_engineer = FeatureEngineer(
+            enable_ratios=any(fe.enable_ratios for fe in engineers),
+            enable_interactions=any(fe.enable_interactions for fe in engineers),
+            enable_transforms=any(fe.enable_transforms for fe in engineers),
+        ) if engineers else None
+
+        if thread_budget is not None:
+            # Copies budgétées : les pipelines reçus (souvent partagés par le
+            # cache de modèles) ne sont jamais modifiés
+            self.pipelines = [
+                _with_n_threads(pipeline, self.threads_per_member) for pipeline in pipelines
+            ]
+
+    @property
+    def threads_per_member(self) -> Optional[int]:
+        if self.thread_budget is None:
+            return None
+        return max(1, self.thread_budget // self.n_workers)
 
     def predict_proba(self, X_df) -> np.ndarray:
-        probas = [pipeline.predict_proba(X_df) for pipeline in self.pipelines]
-        return average_probabilities(probas)
+        X_shared = self._engineer_once(X_df)
+
+        # Générateurs : chaque sortie est accumulée puis libérée (mémoire O(n·c))
+        if self.n_workers == 1:
+            return average_probabilities(
+                (pipeline.predict_proba(X_shared) for pipeline in self.pipelines),
+                weights=self.weights,
+            )
+
+        # BLAS / OpenMP (logreg, scaler…) : limite globale le temps du fan-out
+        with threadpool_limits(limits=self.threads_per_member):
+            probas = self._pool().map(
+                lambda pipeline: pipeline.predict_proba(X_shared), self.pipelines
+            )
+            return average_probabilities(probas, weights=self.weights)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _engineer_once(self, X_df):
+        if self.shared_engineer is None or self.shared_engineer.is_engineered(X_df):
+            return X_df
+        return self.shared_engineer.transform(X_df)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.n_workers, thread_name_prefix="ensemble"
+            )
+        return self._executor
 
     @property
     def classes_(self):
-        return self.pipelines[0].classes_
\ No newline at end of file
+        return self.pipelines[0].classes_
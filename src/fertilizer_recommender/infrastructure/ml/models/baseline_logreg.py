@@ -14,18 +14,25 @@ Modèle remplaçable, mais pipeline indispensable.
 """
 
 from __future__ import annotations
+import numpy as np
 from sklearn.linear_model import LogisticRegression
 
+from fertilizer_recommender.infrastructure.ml.preprocessors.matrix_layout import MatrixLayout
+
 
 class BaselineLogisticRegression:
+    # lbfgs travaille en float64 : le recevoir directement évite une copie
+    input_layout = MatrixLayout(dtype=np.float64)
+
     def __init__(self, random_state: int = 42):
         self.model = LogisticRegression(
             max_iter=1000,
             random_state=random_state,
         )
 
-    def fit(self, X, y):
-        self.model.fit(X, y)
+    def fit(self, X, y, eval_set=None, sample_weight=None):
+        # Pas d'itérations boostées : l'eval_set est ignoré
+        self.model.fit(X, y, sample_weight=sample_weight)
         return self
 
     def predict_proba(self, X):
@@ -0,0 +1,113 @@
+"""
+booster_dataset_cache.py
+
+Pourquoi ce fichier existe ?
+- À chaque fold et à chaque essai d'hyperparamètres, LightGBM reconstruit
+  son `Dataset` binné et XGBoost sa matrice d'histogrammes (quantiles), alors
+  que les features du fold n'ont pas changé.
+- Ce binning coûte une part importante d'un fit court (sweeps, early stopping).
+
+À quoi ça sert réellement ?
+- Conserver les datasets natifs déjà binnés (lgb.Dataset free_raw_data=False,
+  xgb.QuantileDMatrix), indexés par :
+    empreinte du contenu (matrice, labels, poids) + paramètres de binning.
+  Même fold + mêmes features = même empreinte, sans dépendre du numéro de fold.
+- Un sweep qui ne fait varier que learning_rate, profondeur ou régularisation
+  ne rebinne plus jamais.
+- `encode_labels` : encodage des labels (train + eval_set) partagé par les
+  wrappers, pour que labels et empreintes soient identiques d'un chemin à l'autre.
+
+Très utile ?
+OUI pour la CV répétée et les recherches d'hyperparamètres.
+"""
+
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+def array_fingerprint(*arrays: Optional[np.ndarray]) -> str:
+    """Empreinte du contenu (forme, dtype, octets) de plusieurs tableaux."""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        if array is None:
+            digest.update(b"none")
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}|{array.dtype.str}|".encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def encode_labels(y, eval_set=None) -> Tuple[np.ndarray, np.ndarray, Optional[Tuple[Any, np.ndarray]]]:
+    """
+    Labels -> indices 0..n-1 (classes triées, comme LabelEncoder) ;
+    l'eval_set est encodé avec les MÊMES classes.
+
+    Returns:
+        (classes, y_idx, eval_set encodé ou None)
+
+    Raises:
+        ValueError: label de validation absent du train.
+    """
+    classes, y_idx = np.unique(np.asarray(y), return_inverse=True)
+    if eval_set is None:
+        return classes, y_idx, None
+
+    X_val, y_val = eval_set
+    y_val = np.asarray(y_val)
+    y_val_idx = np.searchsorted(classes, y_val)
+    unknown = (y_val_idx >= len(classes)) | (
+        classes[np.minimum(y_val_idx, len(classes) - 1)] != y_val
+    )
+    if unknown.any():
+        raise ValueError(
+            f"Labels de validation absents du train : {sorted(set(y_val[unknown].tolist()))}"
+        )
+    return classes, y_idx, (X_val, y_val_idx)
+
+
+class BoosterDatasetCache:
+    """
+    Cache LRU (borné en nombre d'entrées) de datasets natifs de boosters.
+
+    Thread-safe : deux constructions concurrentes de la même clé sont
+    possibles (la seconde gagne), jamais un état incohérent.
+    """
+
+    def __init__(self, max_entries: int = 10):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.logger = logger
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        dataset = build()
+        if self.max_entries <= 0:
+            return dataset
+
+        with self._lock:
+            self._entries[key] = dataset
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self.logger.debug(f"Dataset booster binné et mis en cache ({len(self._entries)} entrées)")
+        return dataset
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -8,28 +8,111 @@ Pourquoi ce fichier existe ?
 À quoi ça sert réellement ?
 - Fournir un modèle multiclass CatBoost compatible avec nos pipelines.
 - Être interchangeable avec les autres modèles (LogReg, LGBM…).
+- Catégorielles natives (`cat_features` = indices des codes du profil
+  "native") : CatBoost exige des entiers, les codes float32 de la matrice
+  sont convertis (NaN = catégorie inconnue -> -1).
+- Les données passent par un `catboost.Pool` construit UNE fois par matrice :
+  celui de l'eval_set est réutilisé par le predict_proba qui suit sur la même
+  matrice (validation du fold), au lieu d'une seconde conversion.
+- Early stopping sur l'eval_set du fold (`early_stopping_rounds`), le
+  meilleur modèle étant conservé (use_best_model).
 
 Est-ce critique ?
 Oui, CatBoost est souvent SOTA sur ce type de dataset tabulaire.
 """
 
 from __future__ import annotations
-from catboost import CatBoostClassifier
+import copy
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostClassifier, Pool
+
+from fertilizer_recommender.infrastructure.ml.models.booster_dataset_cache import array_fingerprint
+from fertilizer_recommender.infrastructure.ml.preprocessors.matrix_layout import DEFAULT_LAYOUT
 
 
 class CatBoostMulticlass:
-    def __init__(self, **kwargs):
+    # float32, lignes contiguës : conversion directe en Pool CatBoost
+    input_layout = DEFAULT_LAYOUT
+
+    def __init__(self, early_stopping_rounds: Optional[int] = None, **kwargs):
+        self.early_stopping_rounds = early_stopping_rounds
+        self.best_iteration_: Optional[int] = None
+        self.cat_features: List[int] = list(kwargs.get("cat_features") or [])
+        # (empreinte, Pool) de l'eval_set du dernier fit, consommé par predict_proba
+        self._eval_pool = None
         self.model = CatBoostClassifier(
             **kwargs,
         )
 
-    def fit(self, X, y):
-        self.model.fit(X, y)
+    def _pool(self, X, label=None, weight=None) -> Pool:
+        """Pool CatBoost : une seule conversion (codes catégoriels -> int32)."""
+        if isinstance(X, Pool):
+            return X
+        data = X
+        if self.cat_features and isinstance(X, np.ndarray):
+            # Colonnes construites en une passe (pas de DataFrame(X) puis réaffectations)
+            cat_features = set(self.cat_features)
+            data = pd.DataFrame({
+                i: np.nan_to_num(X[:, i], nan=-1).astype(np.int32) if i in cat_features else X[:, i]
+                for i in range(X.shape[1])
+            })
+        return Pool(data, label=label, weight=weight, cat_features=self.cat_features or None)
+
+    def fit(self, X, y, eval_set=None, sample_weight=None):
+        self._eval_pool = None
+        train_pool = self._pool(X, label=y, weight=sample_weight)
+        if eval_set is None or not self.early_stopping_rounds:
+            self.model.fit(train_pool)
+            self.best_iteration_ = None
+            return self
+
+        X_val, y_val = eval_set
+        eval_pool = self._pool(X_val, label=y_val)
+        self.model.fit(
+            train_pool,
+            eval_set=eval_pool,
+            early_stopping_rounds=self.early_stopping_rounds,
+            use_best_model=True,
+        )
+        # get_best_iteration CatBoost : index 0-based -> nombre d'arbres
+        self.best_iteration_ = int(self.model.get_best_iteration()) + 1
+        if isinstance(X_val, np.ndarray):
+            self._eval_pool = (array_fingerprint(X_val), eval_pool)
         return self
 
     def predict_proba(self, X):
-        return self.model.predict_proba(X)
+        pool = None
+        cached, self._eval_pool = getattr(self, "_eval_pool", None), None
+        if cached is not None and isinstance(X, np.ndarray) and cached[0] == array_fingerprint(X):
+            pool = cached[1]
+        # predict_proba a son propre thread_count (-1 par défaut = tous les cœurs)
+        return self.model.predict_proba(
+            pool if pool is not None else self._pool(X),
+            thread_count=getattr(self, "predict_threads", -1),
+        )
+
+    def with_n_threads(self, n_threads: int) -> "CatBoostMulticlass":
+        """
+        Copie dont predict_proba utilise `n_threads` (budget d'un ensemble
+        parallèle) ; le modèle CatBoost est partagé, jamais modifié.
+        """
+        clone = copy.copy(self)
+        clone.predict_threads = n_threads
+        return clone
+
+    def set_n_iterations(self, n_iterations: int) -> None:
+        """Nombre d'arbres (entraînement final au meilleur nombre d'itérations de la CV)."""
+        self.model.set_params(iterations=n_iterations)
 
     @property
     def classes_(self):
-        return self.model.classes_
\ No newline at end of file
+        return self.model.classes_
+
+    def __getstate__(self):
+        # Le Pool de validation n'est jamais persisté avec le modèle
+        state = self.__dict__.copy()
+        state["_eval_pool"] = None
+        return state
@@ -8,27 +8,229 @@ Pourquoi ce fichier existe ?
 À quoi ça sert ?
 - Tester un autre algorithme sans changer l’application.
 
+Early stopping :
+- `early_stopping_rounds` est gardé par le wrapper (pas par LGBMClassifier) :
+  il n'est appliqué que si `fit` reçoit un `eval_set` (folds de CV).
+
+Catégorielles natives :
+- `categorical_feature` : indices des colonnes de codes (profil "native"),
+  transmis à fit (LightGBM l'ignore dans les params du constructeur).
+
+Datasets binnés réutilisés :
+- Avec un `dataset_cache` (BoosterDatasetCache), l'entraînement passe par
+  l'API native (lgb.train) sur un `lgb.Dataset` construit une fois par
+  (contenu, paramètres de binning) : les folds et essais suivants sautent le
+  binning. Mêmes paramètres que LGBMClassifier (objectif, num_class,
+  class_weight -> poids, threads) ; sans cache, chemin scikit-learn inchangé.
+
+Poids des lignes :
+- `sample_weight` (ex: effectifs des doublons compactés). Avec
+  class_weight="balanced", les poids de classe sont calculés sur les
+  effectifs pondérés : mêmes poids que sur les lignes dupliquées.
+
 Est-ce critique ?
 Optionnel mais fortement recommandé pour le benchmarking.
 """
 
 from __future__ import annotations
+import copy
+import os
+from typing import Any, Dict, List, Optional
+
 import lightgbm as lgb
+import numpy as np
+from sklearn.utils.class_weight import compute_sample_weight
+
+from fertilizer_recommender.infrastructure.ml.models.booster_dataset_cache import (
+    BoosterDatasetCache,
+    array_fingerprint,
+    encode_labels,
+)
+from fertilizer_recommender.infrastructure.ml.preprocessors.matrix_layout import DEFAULT_LAYOUT
+
+# Paramètres qui déterminent le binning (clé du cache) ; les autres peuvent
+# varier d'un essai à l'autre sur le même Dataset
+_BINNING_PARAMS = (
+    "max_bin", "max_bin_by_feature", "min_data_in_bin",
+    "subsample_for_bin", "bin_construct_sample_cnt",
+    "random_state", "seed", "data_random_seed",
+    "use_missing", "zero_as_missing", "linear_tree",
+)
 
 
 class LightGBMMulticlass:
-    def __init__(self, **kwargs):
+    # float32, lignes contiguës : format natif du booster (aucune copie)
+    input_layout = DEFAULT_LAYOUT
+
+    def __init__(
+        self,
+        early_stopping_rounds: Optional[int] = None,
+        categorical_feature: Optional[List[int]] = None,
+        dataset_cache: Optional[BoosterDatasetCache] = None,
+        **kwargs,
+    ):
+        self.early_stopping_rounds = early_stopping_rounds
+        self.categorical_feature = categorical_feature
+        self.dataset_cache = dataset_cache
+        self.best_iteration_: Optional[int] = None
+        self.booster_: Optional[lgb.Booster] = None
+        self._classes = None
         self.model = lgb.LGBMClassifier(
             **kwargs,
         )
 
-    def fit(self, X, y):
-        self.model.fit(X, y)
+    def fit(self, X, y, eval_set=None, sample_weight=None):
+        if self.dataset_cache is not None:
+            return self._fit_cached(X, y, eval_set, sample_weight)
+
+        self.booster_ = None
+        if sample_weight is None:
+            self._fit_sklearn(X, y, eval_set)
+            return self
+
+        # class_weight appliqué ici (effectifs pondérés), pas par LGBMClassifier
+        class_weight = self.model.class_weight
+        weight = _training_weight(class_weight, y, sample_weight)
+        self.model.set_params(class_weight=None)
+        try:
+            self._fit_sklearn(X, y, eval_set, sample_weight=weight)
+        finally:
+            self.model.set_params(class_weight=class_weight)
+        return self
+
+    def _fit_sklearn(self, X, y, eval_set, sample_weight=None) -> None:
+        categorical_feature = self.categorical_feature or "auto"
+        if eval_set is None or not self.early_stopping_rounds:
+            self.model.fit(X, y, sample_weight=sample_weight, categorical_feature=categorical_feature)
+            self.best_iteration_ = None
+            return
+
+        self.model.fit(
+            X, y,
+            sample_weight=sample_weight,
+            eval_set=[eval_set],
+            categorical_feature=categorical_feature,
+            callbacks=[lgb.early_stopping(self.early_stopping_rounds, verbose=False)],
+        )
+        # best_iteration_ LightGBM : nombre d'arbres retenus (1-based)
+        self.best_iteration_ = int(self.model.best_iteration_) or None
+
+    def _booster_params(self, n_classes: int) -> Dict[str, Any]:
+        """Paramètres natifs équivalents à ceux que LGBMClassifier.fit transmet."""
+        params = {k: v for k, v in self.model.get_params().items() if v is not None}
+        for key in ("n_estimators", "class_weight", "importance_type", "num_class", "n_jobs"):
+            params.pop(key, None)
+        params["objective"] = params.get("objective") or "multiclass"
+        params["num_class"] = n_classes
+        params["num_threads"] = _num_threads(self.model.n_jobs)
+        # Pré-filtrage désactivé : le Dataset reste valable si min_data_in_leaf varie
+        params["feature_pre_filter"] = False
+        return params
+
+    def _fit_cached(self, X, y, eval_set, sample_weight=None):
+        if not self.early_stopping_rounds:
+            eval_set = None
+        self._classes, y_idx, eval_set = encode_labels(y, eval_set)
+        params = self._booster_params(len(self._classes))
+        categorical_feature = self.categorical_feature or "auto"
+
+        weight = _training_weight(self.model.class_weight, y_idx, sample_weight)
+
+        binning = tuple(sorted((k, repr(v)) for k, v in params.items() if k in _BINNING_PARAMS))
+        train_key = (
+            "lightgbm", array_fingerprint(X, y_idx, weight), binning, repr(categorical_feature),
+        )
+        train_set = self.dataset_cache.get_or_build(
+            train_key,
+            lambda: lgb.Dataset(
+                X, label=y_idx, weight=weight, categorical_feature=categorical_feature,
+                params=params, free_raw_data=False,
+            ).construct(),
+        )
+
+        valid_sets, callbacks = [], []
+        if eval_set is not None:
+            X_val, y_val_idx = eval_set
+            valid_key = train_key + (array_fingerprint(X_val, y_val_idx),)
+            valid_sets = [self.dataset_cache.get_or_build(
+                valid_key,
+                lambda: lgb.Dataset(
+                    X_val, label=y_val_idx, reference=train_set,
+                    categorical_feature=categorical_feature, params=params, free_raw_data=False,
+                ).construct(),
+            )]
+            callbacks = [lgb.early_stopping(self.early_stopping_rounds, verbose=False)]
+
+        self.booster_ = lgb.train(
+            params,
+            train_set,
+            num_boost_round=self.model.n_estimators,
+            valid_sets=valid_sets,
+            callbacks=callbacks,
+        )
+        self.best_iteration_ = (self.booster_.best_iteration or None) if valid_sets else None
         return self
 
     def predict_proba(self, X):
-        return self.model.predict_proba(X)
+        # Budget d'un ensemble (with_n_threads) prioritaire sur n_jobs du modèle
+        n_jobs = getattr(self, "predict_threads", None) or self.model.n_jobs
+        if getattr(self, "booster_", None) is not None:
+            return self.booster_.predict(X, num_threads=_num_threads(n_jobs))
+        return self.model.predict_proba(X, num_threads=_num_threads(n_jobs))
+
+    def with_n_threads(self, n_threads: int) -> "LightGBMMulticlass":
+        """
+        Copie dont predict_proba utilise `n_threads` (budget d'un ensemble
+        parallèle). Le nombre de threads est passé à chaque predict : ni le
+        booster ni l'estimateur partagés (ex: cache de modèles) ne sont modifiés.
+        """
+        clone = copy.copy(self)
+        clone.predict_threads = n_threads
+        return clone
+
+    def set_n_iterations(self, n_iterations: int) -> None:
+        """Nombre d'arbres (entraînement final au meilleur nombre d'itérations de la CV)."""
+        self.model.set_params(n_estimators=n_iterations)
 
     @property
     def classes_(self):
-        return self.model.classes_
\ No newline at end of file
+        if getattr(self, "booster_", None) is not None:
+            return self._classes
+        return self.model.classes_
+
+    def __getstate__(self):
+        # Le cache (datasets binnés) n'est jamais persisté avec le modèle
+        state = self.__dict__.copy()
+        state["dataset_cache"] = None
+        return state
+
+
+def _training_weight(class_weight, y, sample_weight: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    Poids d'entraînement = sample_weight x poids de classe.
+
+    "balanced" est calculé sur les effectifs pondérés (n / (k x n_classe)) :
+    une ligne de poids w compte comme w lignes, comme dans compute_sample_weight
+    appliqué aux lignes d'origine.
+    """
+    if class_weight is None:
+        return sample_weight
+    if sample_weight is None:
+        return compute_sample_weight(class_weight, y)
+
+    if class_weight == "balanced":
+        classes, y_idx = np.unique(np.asarray(y), return_inverse=True)
+        totals = np.bincount(y_idx, weights=sample_weight)
+        class_sample_weight = (totals.sum() / (len(classes) * totals))[y_idx]
+    else:
+        class_sample_weight = compute_sample_weight(class_weight, y)
+    return np.asarray(sample_weight, dtype=np.float64) * class_sample_weight
+
+
+def _num_threads(n_jobs: Optional[int]) -> int:
+    """Conventions joblib de LGBMClassifier (None = cœurs, négatif = cœurs + 1 + n)."""
+    if n_jobs is None:
+        return os.cpu_count() or 1
+    if n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return n_jobs
\ No newline at end of file
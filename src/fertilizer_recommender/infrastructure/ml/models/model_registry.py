@@ -0,0 +1,84 @@
+"""
+model_registry.py
+
+Pourquoi ce fichier existe ?
+- Chaque wrapper de modèle importe sa librairie (catboost, lightgbm,
+  xgboost, sklearn) : les importer tous pour en utiliser un seul coûte
+  plusieurs secondes au démarrage.
+- La composition root choisissait le modèle par if/elif, branche par branche.
+
+À quoi ça sert réellement ?
+- Déclarer chaque modèle par son nom + chemin d'import + la façon de le
+  construire (options ci-dessous), sans importer le wrapper.
+- Options :
+    config_key      section de configs/models.yaml (None = aucun hyperparamètre)
+    threads_param   paramètre qui borne les threads (None = non bornable)
+    num_class       le constructeur attend num_class
+    dataset_cache   le wrapper accepte un BoosterDatasetCache
+    categorical     façon de déclarer les codes du profil "native" :
+                    "cat_features", "categorical_feature", "feature_types" ou None
+- Un nouveau modèle = un `register_model(...)`, aucune branche à ajouter.
+
+Très utile ?
+OUI : un seul modèle importé par commande.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+from fertilizer_recommender.infrastructure.utils.plugin_registry import PluginRegistry, PluginSpec
+
+MODEL_REGISTRY = PluginRegistry("Modèle")
+
+
+def register_model(
+    name: str,
+    target: str,
+    config_key: Optional[str] = None,
+    threads_param: Optional[str] = None,
+    num_class: bool = False,
+    dataset_cache: bool = False,
+    categorical: Optional[str] = None,
+) -> PluginSpec:
+    return MODEL_REGISTRY.register(
+        name,
+        target,
+        config_key=config_key,
+        threads_param=threads_param,
+        num_class=num_class,
+        dataset_cache=dataset_cache,
+        categorical=categorical,
+    )
+
+
+_MODELS = "fertilizer_recommender.infrastructure.ml.models"
+
+register_model(
+    "logreg",
+    f"{_MODELS}.baseline_logreg:BaselineLogisticRegression",
+)
+register_model(
+    "catboost",
+    f"{_MODELS}.catboost_multiclass:CatBoostMulticlass",
+    config_key="catboost",
+    threads_param="thread_count",
+    categorical="cat_features",
+)
+register_model(
+    "lightgbm",
+    f"{_MODELS}.lightgbm_multiclass:LightGBMMulticlass",
+    config_key="lightgbm",
+    threads_param="n_jobs",
+    num_class=True,
+    dataset_cache=True,
+    categorical="categorical_feature",
+)
+register_model(
+    "xgboost",
+    f"{_MODELS}.xgboost_multiclass:XGBoostMulticlass",
+    config_key="xgboost",
+    threads_param="n_jobs",
+    num_class=True,
+    dataset_cache=True,
+    categorical="feature_types",
+)
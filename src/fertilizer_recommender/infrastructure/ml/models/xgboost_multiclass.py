@@ -8,33 +8,170 @@ Pourquoi ce fichier existe ?
 Choix d’architecture IMPORTANT :
 - Tous les hyperparamètres passent via **kwargs
 - Le code est totalement découplé du YAML
+- Catégorielles natives : `enable_categorical` + `feature_types` ("c" pour
+  les codes du profil "native"), passés comme les autres hyperparamètres
+- `early_stopping_rounds` est gardé par le wrapper : XGBClassifier refuse
+  de s'entraîner sans eval_set s'il est fixé au constructeur.
+- Avec un `dataset_cache` (BoosterDatasetCache) : entraînement natif
+  (xgb.train) sur une QuantileDMatrix construite une fois par (contenu,
+  max_bin, types de features) ; les folds / essais suivants sautent la
+  quantification. Mêmes paramètres que XGBClassifier.fit.
+- XGBoost exige des labels 0..n-1 : les labels (texte ou non) sont encodés
+  de la même façon sur les deux chemins (`encode_labels`), et `classes_`
+  retourne toujours les labels d'origine.
 
 Très utile ?
 OUI. Indispensable pour benchmark sérieux.
 """
 
 from __future__ import annotations
+import copy
+from typing import Any, Dict, Optional
+
 import xgboost as xgb
 
+from fertilizer_recommender.infrastructure.ml.models.booster_dataset_cache import (
+    BoosterDatasetCache,
+    array_fingerprint,
+    encode_labels,
+)
+from fertilizer_recommender.infrastructure.ml.preprocessors.matrix_layout import DEFAULT_LAYOUT
+
 
 class XGBoostMulticlass:
+    # float32, lignes contiguës : format natif du booster (aucune copie)
+    input_layout = DEFAULT_LAYOUT
+
     def __init__(
         self,
         #num_class: int,
+        early_stopping_rounds: Optional[int] = None,
+        dataset_cache: Optional[BoosterDatasetCache] = None,
         **kwargs,
     ):
+        self.early_stopping_rounds = early_stopping_rounds
+        self.dataset_cache = dataset_cache
+        self.best_iteration_: Optional[int] = None
+        self.booster_: Optional[xgb.Booster] = None
+        self._classes = None
         self.model = xgb.XGBClassifier(
             #num_class=num_class,
             **kwargs,
         )
 
-    def fit(self, X, y):
-        self.model.fit(X, y)
+    def fit(self, X, y, eval_set=None, sample_weight=None):
+        if not self.early_stopping_rounds:
+            eval_set = None
+        self._classes, y_idx, eval_set = encode_labels(y, eval_set)
+
+        if self.dataset_cache is not None:
+            return self._fit_cached(X, y_idx, eval_set, sample_weight)
+
+        self.booster_ = None
+        if eval_set is None:
+            self.model.set_params(early_stopping_rounds=None)
+            self.model.fit(X, y_idx, sample_weight=sample_weight)
+            self.best_iteration_ = None
+            return self
+
+        self.model.set_params(early_stopping_rounds=self.early_stopping_rounds)
+        self.model.fit(X, y_idx, sample_weight=sample_weight, eval_set=[eval_set], verbose=False)
+        # best_iteration XGBoost : index 0-based -> nombre d'arbres
+        self.best_iteration_ = int(self.model.best_iteration) + 1
+        return self
+
+    def _booster_params(self, n_classes: int) -> Dict[str, Any]:
+        """Paramètres natifs équivalents à ceux que XGBClassifier.fit transmet."""
+        params = {k: v for k, v in self.model.get_xgb_params().items() if v is not None}
+        if n_classes > 2:
+            if params.get("objective") != "multi:softmax":
+                params["objective"] = "multi:softprob"
+            params["num_class"] = n_classes
+        return params
+
+    def _quantile_matrix(self, X, label, key, ref=None, weight=None) -> xgb.QuantileDMatrix:
+        return self.dataset_cache.get_or_build(
+            key,
+            lambda: xgb.QuantileDMatrix(
+                X,
+                label=label,
+                weight=weight,
+                ref=ref,
+                missing=self.model.missing,
+                max_bin=self.model.max_bin,
+                enable_categorical=self.model.enable_categorical,
+                feature_types=self.model.feature_types,
+                nthread=self.model.n_jobs,
+            ),
+        )
+
+    def _fit_cached(self, X, y_idx, eval_set, sample_weight=None):
+        """y_idx / eval_set : labels déjà encodés par `_encode_labels`."""
+        params = self._booster_params(len(self._classes))
+
+        binning = (
+            self.model.max_bin, self.model.missing,
+            self.model.enable_categorical, repr(self.model.feature_types),
+        )
+        train_key = ("xgboost", array_fingerprint(X, y_idx, sample_weight), binning)
+        dtrain = self._quantile_matrix(X, y_idx, train_key, weight=sample_weight)
+
+        evals = []
+        early_stopping_rounds = None
+        if eval_set is not None:
+            X_val, y_val_idx = eval_set
+            valid_key = train_key + (array_fingerprint(X_val, y_val_idx),)
+            evals = [(self._quantile_matrix(X_val, y_val_idx, valid_key, ref=dtrain), "validation_0")]
+            early_stopping_rounds = self.early_stopping_rounds
+
+        self.booster_ = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=self.model.n_estimators,
+            evals=evals,
+            early_stopping_rounds=early_stopping_rounds,
+            verbose_eval=False,
+        )
+        # best_iteration XGBoost : index 0-based -> nombre d'arbres
+        self.best_iteration_ = int(self.booster_.best_iteration) + 1 if evals else None
         return self
 
     def predict_proba(self, X):
+        if getattr(self, "booster_", None) is not None:
+            # même plage d'arbres que XGBClassifier (meilleure itération si early stopping)
+            iteration_range = (0, self.best_iteration_ or 0)
+            self.booster_.set_param({"nthread": self.model.n_jobs or 0})
+            return self.booster_.inplace_predict(
+                X, iteration_range=iteration_range, missing=self.model.missing,
+            )
         return self.model.predict_proba(X)
 
+    def with_n_threads(self, n_threads: int) -> "XGBoostMulticlass":
+        """
+        Copie dont predict_proba utilise `n_threads` (budget d'un ensemble
+        parallèle). XGBoost range nthread DANS le booster : la copie a ses
+        propres boosters, l'objet d'origine (ex: cache de modèles) est intact.
+        """
+        clone = copy.copy(self)
+        clone.model = copy.deepcopy(self.model)
+        clone.model.set_params(n_jobs=n_threads)
+        if getattr(self, "booster_", None) is not None:
+            clone.booster_ = self.booster_.copy()
+        return clone
+
+    def set_n_iterations(self, n_iterations: int) -> None:
+        """Nombre d'arbres (entraînement final au meilleur nombre d'itérations de la CV)."""
+        self.model.set_params(n_estimators=n_iterations)
+
     @property
     def classes_(self):
-        return self.model.classes_
\ No newline at end of file
+        # Labels d'origine, quel que soit le chemin d'entraînement
+        if getattr(self, "_classes", None) is not None:
+            return self._classes
+        return self.model.classes_
+
+    def __getstate__(self):
+        # Le cache (matrices quantifiées) n'est jamais persisté avec le modèle
+        state = self.__dict__.copy()
+        state["dataset_cache"] = None
+        return state
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+compiled_pipeline.py
+
+Pourquoi ce fichier existe ?
+- Pour UNE ligne (appel API), TrainingPipeline.predict_proba paie :
+  DataFrame pandas, concat des features dérivées, ColumnTransformer…
+  Des millisecondes de surcoût pour quelques microsecondes de calcul.
+
+À quoi ça sert réellement ?
+- "Compiler" un TrainingPipeline entraîné en artefact d'inférence NumPy pur :
+  - formules du FeatureEngineer (mêmes fonctions, sur des vecteurs),
+  - moyennes / écarts-types du StandardScaler figés,
+  - vocabulaires du OneHotEncoder figés en dictionnaires,
+  - ou, pour le profil "native" (NativeCategoricalTransformer), numériques
+    brutes + codes de catégorie, en float32 comme à l'entraînement.
+- Construire la matrice du modèle directement depuis des dicts ou des tableaux.
+
+Garantie :
+- Matrice identique (bit à bit) au chemin pandas pour des entrées
+  int64 / float64 (dicts JSON, CSV) : mêmes calculs float64, features
+  dérivées stockées en float32 comme dans FeatureEngineer, puis même
+  conversion finale au format du modèle (MatrixLayout du transformer).
+
+Très utile ?
+OUI pour l'API : préparation des features en quelques dizaines de µs par ligne.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from fertilizer_recommender.infrastructure.ml.pipelines.training_pipeline import TrainingPipeline
+from fertilizer_recommender.infrastructure.ml.preprocessors.matrix_layout import (
+    MatrixLayout,
+    to_model_matrix,
+)
+from fertilizer_recommender.infrastructure.ml.preprocessors.native_categorical_transformer import (
+    NativeCategoricalTransformer,
+)
+
+
+class CompiledFeatureBuilder:
+    """
+    Version figée de FeaturePipeline.transform.
+
+    Colonnes de sortie, dans l'ordre du transformer :
+    - one_hot : [numériques standardisées..., one-hot catégorie 1..., ...]
+    - codes   : [numériques brutes..., code catégorie 1, code catégorie 2...]
+      (inconnue = NaN)
+    """
+
+    def __init__(
+        self,
+        feature_engineer,
+        numeric_features: Sequence[str],
+        categorical_features: Sequence[str],
+        mean: Optional[np.ndarray],
+        scale: Optional[np.ndarray],
+        categories: Sequence[Sequence[Any]],
+        categorical_mode: str = "one_hot",
+        layout: Optional[MatrixLayout] = None,
+    ):
+        self.feature_engineer = feature_engineer
+        self.numeric_features = list(numeric_features)
+        self.categorical_features = list(categorical_features)
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float64)
+        self.scale = None if scale is None else np.asarray(scale, dtype=np.float64)
+        self.categorical_mode = categorical_mode
+        self.layout = layout or MatrixLayout(dtype=np.float64)
+
+        # Une colonne numérique vient soit de l'entrée brute, soit du FE
+        derived = {name: i for i, name in enumerate(feature_engineer.feature_names)}
+        raw_names = [name for name in self.numeric_features if name not in derived]
+        self._has_derived = len(raw_names) < len(self.numeric_features)
+
+        # Entrées numériques : colonnes brutes du modèle + sources du FE
+        self._numeric_inputs = list(dict.fromkeys(
+            raw_names + (feature_engineer.source_columns if self._has_derived else [])
+        ))
+
+        # Index de copie (destination, source) : une seule opération par bloc
+        inputs = {name: i for i, name in enumerate(self._numeric_inputs)}
+        self._raw_dst = np.array(
+            [j for j, name in enumerate(self.numeric_features) if name not in derived], dtype=np.intp
+        )
+        self._raw_src = np.array([inputs[name] for name in raw_names], dtype=np.intp)
+        self._derived_dst = np.array(
+            [j for j, name in enumerate(self.numeric_features) if name in derived], dtype=np.intp
+        )
+        self._derived_src = np.array(
+            [derived[name] for name in self.numeric_features if name in derived], dtype=np.intp
+        )
+
+        # Vocabulaires : valeur -> colonne one-hot (inconnue = zéros)
+        #                ou valeur -> code (inconnue = NaN)
+        self._vocabularies: List[Dict[Any, int]] = []
+        offset = len(self.numeric_features)
+        if categorical_mode == "codes":
+            self._vocabularies = [{value: i for i, value in enumerate(values)} for values in categories]
+            offset += len(self._vocabularies)
+        else:
+            for values in categories:
+                self._vocabularies.append({value: offset + i for i, value in enumerate(values)})
+                offset += len(values)
+        self.n_output_features = offset
+
+    @property
+    def input_columns(self) -> List[str]:
+        """Colonnes brutes attendues (ordre des lignes passées à `transform_rows`)."""
+        return self._numeric_inputs + self.categorical_features
+
+    @classmethod
+    def from_pipeline(cls, pipeline: TrainingPipeline) -> "CompiledFeatureBuilder":
+        feature_pipeline = pipeline.transformer
+        sklearn_transformer = feature_pipeline.transformer
+
+        if isinstance(sklearn_transformer, NativeCategoricalTransformer):
+            return cls(
+                feature_engineer=feature_pipeline.feature_engineer,
+                numeric_features=sklearn_transformer.numeric_features,
+                categorical_features=sklearn_transformer.categorical_features,
+                mean=None,
+                scale=None,
+                categories=sklearn_transformer.categories_,
+                categorical_mode="codes",
+                layout=sklearn_transformer.layout,
+            )
+
+        column_transformer = sklearn_transformer.transformer
+
+        scaler = column_transformer.named_transformers_["num"]
+        encoder = column_transformer.named_transformers_["cat"]
+
+        return cls(
+            feature_engineer=feature_pipeline.feature_engineer,
+            numeric_features=sklearn_transformer.numeric_features,
+            categorical_features=sklearn_transformer.categorical_features,
+            mean=scaler.mean_,
+            scale=scaler.scale_,
+            categories=encoder.categories_,
+            layout=sklearn_transformer.layout,
+        )
+
+    def transform_columns(self, columns: Mapping[str, Any]) -> np.ndarray:
+        """
+        Args:
+            columns: {colonne brute: vecteur (n,)}, dict ou DataFrame
+
+        Returns:
+            np.ndarray (n, n_output_features) au format `layout`
+        """
+        # (n_inputs, n) : une seule conversion, lignes contiguës
+        raw = np.array([columns[name] for name in self._numeric_inputs], dtype=np.float64)
+        n_rows = raw.shape[1]
+        out = np.zeros((n_rows, self.n_output_features), dtype=np.float64)
+
+        out[:, self._raw_dst] = raw[self._raw_src].T
+        if self._has_derived:
+            derived = self.feature_engineer.compute(dict(zip(self._numeric_inputs, raw)))
+            out[:, self._derived_dst] = derived[:, self._derived_src]  # float32 -> float64
+
+        if self.categorical_mode == "codes":
+            n_numeric = len(self.numeric_features)
+            for j, (name, vocabulary) in enumerate(zip(self.categorical_features, self._vocabularies)):
+                out[:, n_numeric + j] = [vocabulary.get(value, np.nan) for value in columns[name]]
+            # même arrondi que NativeCategoricalTransformer (float64 -> float32)
+            return to_model_matrix(out.astype(np.float32), self.layout)
+
+        # même séquence d'opérations (float64) que StandardScaler.transform
+        block = out[:, : len(self.numeric_features)]
+        block -= self.mean
+        block /= self.scale
+
+        for name, vocabulary in zip(self.categorical_features, self._vocabularies):
+            for i, value in enumerate(columns[name]):
+                col = vocabulary.get(value)
+                if col is not None:
+                    out[i, col] = 1.0
+        return to_model_matrix(out, self.layout)
+
+    def transform_records(self, records: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """Liste de dicts {colonne: valeur} (ex: payloads JSON)."""
+        return self.transform_columns(
+            {name: [record[name] for record in records] for name in self.input_columns}
+        )
+
+    def transform_record(self, record: Mapping[str, Any]) -> np.ndarray:
+        """Une observation -> matrice (1, n_output_features)."""
+        return self.transform_columns({name: [record[name]] for name in self.input_columns})
+
+    def transform_rows(self, rows: Sequence[Sequence[Any]]) -> np.ndarray:
+        """Lignes (listes / tableau objet) ordonnées selon `input_columns`."""
+        return self.transform_columns(dict(zip(self.input_columns, zip(*rows))))
+
+
+class CompiledPipeline:
+    """
+    Artefact d'inférence : CompiledFeatureBuilder + modèle entraîné.
+
+    Mêmes sorties que TrainingPipeline.predict_proba, sans pandas.
+    """
+
+    def __init__(self, features: CompiledFeatureBuilder, model):
+        self.features = features
+        self.model = model
+
+    @classmethod
+    def from_pipeline(cls, pipeline: TrainingPipeline) -> "CompiledPipeline":
+        return cls(CompiledFeatureBuilder.from_pipeline(pipeline), pipeline.model)
+
+    def predict_proba_record(self, record: Mapping[str, Any]) -> np.ndarray:
+        return self.model.predict_proba(self.features.transform_record(record))
+
+    def predict_proba_records(self, records: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        return self.model.predict_proba(self.features.transform_records(records))
+
+    def predict_proba(self, X_df) -> np.ndarray:
+        """Compatibilité TrainingPipeline (DataFrame ou dict de colonnes)."""
+        return self.model.predict_proba(self.features.transform_columns(X_df))
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+
+def compile_pipeline(pipeline: TrainingPipeline) -> CompiledPipeline:
+    """Exporte un TrainingPipeline entraîné en artefact d'inférence NumPy."""
+    return CompiledPipeline.from_pipeline(pipeline)
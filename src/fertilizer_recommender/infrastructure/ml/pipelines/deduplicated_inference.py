@@ -0,0 +1,146 @@
+"""
+deduplicated_inference.py
+
+Pourquoi ce fichier existe ?
+- predict_proba sur des lignes aux features identiques recalcule le même
+  résultat : sur un test très dupliqué, une grande part de l'inférence est
+  du travail redondant.
+
+À quoi ça sert réellement ?
+- `HashRowDeduplicator` (port RowDeduplicator) :
+    1) chaque colonne de features factorisée par table de hash (pandas),
+       codes combinés en une clé entière exacte par ligne (pas de collision
+       possible, contrairement à un hash de ligne)
+    2) lignes uniques = premières occurrences (ordre d'origine conservé)
+    3) `fn` (predict_proba, top-k...) appliquée aux seules lignes uniques
+    4) retour à l'ordre d'origine par UN gather : result[inverse]
+  La sortie est toujours identique à fn(X_df).
+- En dessous de `min_ratio` (lignes / lignes uniques), pas de sous-sélection :
+  le gain ne paierait pas la copie des lignes uniques.
+- Instrumentation par appel (`last_stats`, log) : taux de doublons, temps de
+  déduplication, temps de calcul et temps économisé estimé.
+
+Très utile ?
+OUI quand le test est dupliqué ; quasi gratuit sinon (une factorisation par colonne).
+"""
+
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Borne des clés de ligne combinées (marge sous 2**63)
+_MAX_KEY = 1 << 62
+
+
+@dataclass(frozen=True)
+class DedupStats:
+    n_rows: int
+    n_unique: int
+    dedup_seconds: float        # hash + sélection + gather
+    compute_seconds: float      # fn sur les lignes calculées
+    deduplicated: bool          # False : fn appliquée à toutes les lignes
+
+    @property
+    def ratio(self) -> float:
+        """Lignes par ligne unique (1.0 = aucun doublon)."""
+        return self.n_rows / max(self.n_unique, 1)
+
+    @property
+    def saved_seconds(self) -> float:
+        """Temps économisé estimé : calcul évité - surcoût de déduplication."""
+        if not self.deduplicated:
+            return -self.dedup_seconds
+        per_row = self.compute_seconds / max(self.n_unique, 1)
+        return per_row * (self.n_rows - self.n_unique) - self.dedup_seconds
+
+
+class HashRowDeduplicator:
+    def __init__(self, columns: Optional[Sequence[str]] = None, min_ratio: float = 1.05):
+        """
+        Args:
+            columns: colonnes de features qui définissent une ligne (jamais l'id).
+                None = toutes les colonnes.
+            min_ratio: taux de doublons minimal pour sous-sélectionner les lignes
+        """
+        self.columns = list(columns) if columns is not None else None
+        self.min_ratio = min_ratio
+        self.logger = logger
+        self._local = threading.local()
+
+    @property
+    def last_stats(self) -> Optional[DedupStats]:
+        """Statistiques du dernier appel de ce thread."""
+        return getattr(self._local, "stats", None)
+
+    def unique_rows(self, X_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (positions, inverse) : positions des premières occurrences (ordre
+            croissant) et, pour chaque ligne, l'indice de sa ligne unique.
+        """
+        columns = list(X_df.columns) if self.columns is None else self.columns
+        n_rows = len(X_df)
+        if n_rows == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        # Clé de ligne exacte : codes par colonne (factorize = table de hash,
+        # égalité stricte, NaN = une valeur), combinés en base mixte.
+        # Re-factorisée avant tout dépassement de int64 : aucune collision.
+        key = np.zeros(n_rows, dtype=np.int64)
+        n_keys = 1
+        for name in columns:
+            codes, uniques = pd.factorize(X_df[name])
+            # Manquant (-1) = une valeur de plus
+            codes[codes < 0] = len(uniques)
+            cardinality = len(uniques) + 1
+            if n_keys * cardinality >= _MAX_KEY:
+                key, key_uniques = pd.factorize(key)
+                n_keys = len(key_uniques)
+            key = key * cardinality + codes
+            n_keys *= cardinality
+
+        # Codes dans l'ordre de première apparition : une ligne est la première
+        # de son groupe exactement quand son code dépasse tous les précédents
+        inverse, _ = pd.factorize(key)
+        is_first = np.empty(n_rows, dtype=bool)
+        is_first[0] = True
+        np.greater(inverse[1:], np.maximum.accumulate(inverse[:-1]), out=is_first[1:])
+        return np.flatnonzero(is_first), inverse
+
+    def apply(self, X_df: pd.DataFrame, fn: Callable[[Any], np.ndarray]) -> np.ndarray:
+        start = time.perf_counter()
+        positions, inverse = self.unique_rows(X_df)
+        n_rows, n_unique = len(X_df), len(positions)
+        deduplicated = n_rows > 0 and n_rows / max(n_unique, 1) >= self.min_ratio
+        dedup_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = fn(X_df.iloc[positions] if deduplicated else X_df)
+        compute_seconds = time.perf_counter() - start
+
+        if deduplicated:
+            start = time.perf_counter()
+            result = np.asarray(result)[inverse]
+            dedup_seconds += time.perf_counter() - start
+
+        stats = DedupStats(
+            n_rows=n_rows,
+            n_unique=n_unique,
+            dedup_seconds=dedup_seconds,
+            compute_seconds=compute_seconds,
+            deduplicated=deduplicated,
+        )
+        self._local.stats = stats
+        self.logger.info(
+            f"Inférence dédupliquée : {n_rows} lignes, {n_unique} uniques "
+            f"(x{stats.ratio:.2f}{'' if deduplicated else ', sous min_ratio'}) | "
+            f"calcul {compute_seconds:.3f}s, dédup {dedup_seconds:.3f}s, "
+            f"économisé ≈ {stats.saved_seconds:.3f}s"
+        )
+        return result
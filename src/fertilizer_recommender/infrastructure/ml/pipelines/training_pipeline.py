@@ -8,24 +8,85 @@ Pourquoi ce fichier existe ?
 À quoi ça sert réellement ?
 - Fit, predict_proba, accès aux classes.
 - Faciliter le swap de modèles plus tard.
+- Transmettre un eval_set (fold de validation, transformé avec le
+  preprocessing appris sur le train) aux modèles qui font de l'early stopping.
+- Fit / predict sur matrices déjà transformées (`fit_features`), pour
+  partager un preprocessing appris entre plusieurs modèles.
+- Compaction optionnelle des doublons (`compactor`) : le modèle s'entraîne
+  sur les lignes uniques, pondérées par leur nombre d'occurrences.
+- Imposer au preprocessing le format de matrice du modèle (`input_layout`) :
+  dense, bon dtype, bon ordre mémoire -> aucune reconversion dans le modèle.
 
 Est-ce critique ?
 OUI. C’est la brique ML centrale.
 """
 
 from __future__ import annotations
+from typing import Optional
 
 
 class TrainingPipeline:
-    def __init__(self, transformer, model):
+    def __init__(self, transformer, model, compactor=None):
         self.transformer = transformer
         self.model = model
+        self.compactor = compactor
 
-    def fit(self, X_df, y):
-        X = self.transformer.fit_transform(X_df)
-        self.model.fit(X, y)
+        layout = getattr(model, "input_layout", None)
+        if layout is not None and hasattr(transformer, "set_layout"):
+            transformer.set_layout(layout)
+
+    def fit(self, X_df, y, eval_set=None):
+        """
+        Args:
+            eval_set: (X_val_df, y_val) optionnel, pour l'early stopping
+        """
+        sample_weight = None
+        if self.compactor is None:
+            X = self.transformer.fit_transform(X_df)
+        else:
+            X_unique_df, y, sample_weight = self.compactor.compact(X_df, y)
+            # Preprocessing appris sur les lignes d'origine (même scaler qu'un
+            # fit sans compaction) ; seules les lignes uniques sont transformées
+            self.transformer.fit(X_df)
+            X = self.transformer.transform(X_unique_df, reuse_buffer=False)
+
+        if eval_set is None:
+            return self.fit_features(X, y, sample_weight=sample_weight)
+
+        X_val_df, y_val = eval_set
+        # Pas de buffer partagé : le modèle peut conserver l'eval_set
+        X_val = self.transformer.transform(X_val_df, reuse_buffer=False)
+        return self.fit_features(X, y, eval_set=(X_val, y_val), sample_weight=sample_weight)
+
+    def fit_features(self, X, y, eval_set=None, sample_weight=None):
+        """
+        Fit du modèle seul, sur des matrices déjà produites par `transformer`
+        (déjà appris). Utilisé quand plusieurs modèles partagent le même
+        preprocessing appris (CV multi-modèles).
+
+        Args:
+            sample_weight: poids des lignes (effectifs après compaction)
+        """
+        kwargs = {}
+        if eval_set is not None:
+            kwargs["eval_set"] = eval_set
+        if sample_weight is not None:
+            kwargs["sample_weight"] = sample_weight
+        self.model.fit(X, y, **kwargs)
         return self
 
+    def predict_proba_features(self, X):
+        """predict_proba sur une matrice déjà transformée."""
+        return self.model.predict_proba(X)
+
+    @property
+    def best_iteration_(self) -> Optional[int]:
+        """Nombre d'itérations retenu par l'early stopping (None sinon)."""
+        return getattr(self.model, "best_iteration_", None)
+
+    def set_n_iterations(self, n_iterations: int) -> None:
+        self.model.set_n_iterations(n_iterations)
+
     def predict_proba(self, X_df):
         X = self.transformer.transform(X_df)
         return self.model.predict_proba(X)
@@ -0,0 +1,65 @@
+"""
+duplicate_compactor.py
+
+Pourquoi ce fichier existe ?
+- Le dataset Kaggle est synthétique : beaucoup de lignes sont identiques sur
+  les 8 colonnes d'entrée ET la cible.
+- Chaque fit (CV, modèle final) transforme et entraîne pourtant toutes les
+  lignes brutes : temps et mémoire proportionnels au nombre de doublons.
+
+À quoi ça sert réellement ?
+- Regrouper les lignes (features, label) identiques en une ligne unique,
+  avec son nombre d'occurrences comme `sample_weight`.
+- Une ligne de poids k équivaut à k lignes identiques dans la perte des
+  modèles (logloss pondérée) ; les splits de CV restent calculés sur les
+  lignes d'origine (la compaction a lieu dans le fit de chaque fold).
+
+Très utile ?
+OUI quand le taux de doublons est élevé : fit proportionnel aux lignes uniques.
+"""
+
+from __future__ import annotations
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+_TARGET_KEY = "__target__"
+
+
+class DuplicateRowCompactor:
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        """
+        Args:
+            columns: colonnes qui définissent une ligne (ex: les 8 entrées brutes ;
+                les features dérivées, sans état, en découlent). None = toutes.
+        """
+        self.columns = list(columns) if columns is not None else None
+        self.logger = logger
+
+    @property
+    def signature(self) -> tuple:
+        return ("duplicates", tuple(self.columns) if self.columns is not None else None)
+
+    def compact(self, X_df: pd.DataFrame, y) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (X_unique, y_unique, counts) : première occurrence de chaque groupe
+            (ordre d'apparition, index d'origine), son label et son effectif.
+        """
+        y = np.asarray(y)
+        columns = self.columns if self.columns is not None else list(X_df.columns)
+        keys = X_df[columns].assign(**{_TARGET_KEY: y})
+
+        # ngroup(sort=False) numérote les groupes dans l'ordre de première
+        # apparition, comme les lignes gardées par duplicated(keep="first")
+        group_ids = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+        first = np.flatnonzero(~keys.duplicated(keep="first").to_numpy())
+        counts = np.bincount(group_ids, minlength=len(first)).astype(np.float64)
+
+        self.logger.debug(
+            f"Compaction des doublons : {len(X_df)} -> {len(first)} lignes "
+            f"(x{len(X_df) / max(len(first), 1):.1f})"
+        )
+        return X_df.iloc[first], y[first], counts
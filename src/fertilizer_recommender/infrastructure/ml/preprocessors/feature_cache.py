@@ -0,0 +1,76 @@
+"""
+feature_cache.py
+
+Pourquoi ce fichier existe ?
+- En CV, FeaturePipeline recalcule le feature engineering à chaque fold
+  (fit ET predict), alors que ces features sont des fonctions ligne à ligne :
+  elles sont identiques d'un fold à l'autre.
+
+À quoi ça sert ?
+- Calculer le feature engineering UNE fois sur le dataset complet.
+- Le mettre en cache, indexé par un hash du contenu + les flags du FeatureEngineer.
+- Les folds découpent ensuite ce DataFrame enrichi par index.
+
+Très utile ?
+Oui pour les modèles rapides (logreg…), où le FE domine le temps de CV.
+"""
+
+from __future__ import annotations
+import hashlib
+from collections import OrderedDict
+from typing import Tuple
+
+import pandas as pd
+from loguru import logger
+
+from fertilizer_recommender.infrastructure.ml.preprocessors.feature_engineering import (
+    FeatureEngineer,
+)
+
+
+def content_fingerprint(df: pd.DataFrame) -> str:
+    """Hash stable du contenu (valeurs + index + colonnes + dtypes) d'un DataFrame."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(repr([str(dtype) for dtype in df.dtypes]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    Cache mémoire (LRU) des DataFrames enrichis par le FeatureEngineer.
+
+    max_entries est volontairement petit : un DataFrame enrichi de 750k lignes
+    pèse plusieurs dizaines de Mo.
+    """
+
+    def __init__(self, max_entries: int = 1):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Tuple[bool, ...]], pd.DataFrame]" = (
+            OrderedDict()
+        )
+        self.logger = logger
+
+    def get_or_compute(
+        self,
+        feature_engineer: FeatureEngineer,
+        df: pd.DataFrame,
+    ) -> pd.DataFrame:
+        key = (content_fingerprint(df), feature_engineer.flags)
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.logger.info(f"Features pré-calculées réutilisées (cache {key[0][:8]})")
+            return self._entries[key]
+
+        self.logger.info(f"Pré-calcul des features sur {len(df)} lignes (cache {key[0][:8]})")
+        df_fe = feature_engineer.transform(df)
+
+        self._entries[key] = df_fe
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return df_fe
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -9,16 +9,60 @@ Pourquoi ce fichier existe ?
 - Ajouter des signaux non linéaires forts aux modèles.
 - Rendre explicites des relations métier implicites.
 
+Implémentation :
+- Toutes les features sont calculées en UNE passe vectorisée NumPy dans une
+  matrice float32 pré-allouée (colonne par colonne, ordre Fortran).
+- Le DataFrame d'entrée n'est jamais copié : soit on le concatène sans copie
+  à la matrice (par défaut), soit on y ajoute les colonnes (inplace=True).
+- `feature_names` expose les noms des features créées pour l'aval.
+- Les features sont des fonctions ligne à ligne : identiques quel que soit le
+  fold, elles peuvent être pré-calculées une fois (voir feature_cache.py).
+
 Très utile ?
 ✅ OUI. Sur Kaggle tabulaire, c’est souvent le facteur clé de performance.
 """
 
 from __future__ import annotations
 
+from typing import List, Mapping, Tuple, Union
+
 import pandas as pd
 import numpy as np
 from loguru import logger
 
+_EPS = 1e-6
+
+_RATIO_FEATURES = [
+    "N_to_P", "N_to_K", "P_to_K",
+    "NPK_sum", "N_ratio", "P_ratio", "K_ratio",
+]
+_INTERACTION_FEATURES = [
+    "Temp_x_Humidity", "Humidity_x_Moisture", "Temp_x_Moisture",
+]
+_TRANSFORM_FEATURES = [
+    "log_Nitrogen", "log_Phosphorous", "log_Potassium",
+    "sqrt_Moisture", "sqrt_Rainfall",
+]
+
+# Colonnes brutes lues par chaque groupe de features
+_RATIO_SOURCES = ["Nitrogen", "Phosphorous", "Potassium"]
+_INTERACTION_SOURCES = ["Temperature", "Humidity", "Moisture"]
+_TRANSFORM_SOURCES = ["Nitrogen", "Phosphorous", "Potassium", "Moisture", "Rainfall"]
+
+
+# DataFrame, ou colonnes déjà extraites {nom: vecteur} (chemin compilé)
+Columns = Union[pd.DataFrame, Mapping[str, np.ndarray]]
+
+
+def _source(df: Columns, name: str) -> np.ndarray:
+    return np.asarray(df[name], dtype=np.float64)
+
+
+def _n_rows(df: Columns) -> int:
+    if isinstance(df, pd.DataFrame):
+        return len(df)
+    return len(next(iter(df.values()))) if df else 0
+
 
 class FeatureEngineer:
     def __init__(
@@ -26,69 +70,158 @@ class FeatureEngineer:
         enable_ratios: bool = True,
         enable_interactions: bool = True,
         enable_transforms: bool = True,
+        inplace: bool = False,
     ):
         self.enable_ratios = enable_ratios
         self.enable_interactions = enable_interactions
         self.enable_transforms = enable_transforms
+        self.inplace = inplace
         self.logger = logger
 
-    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
-        self.logger.info("Starting feature engineering")
-        df = df.copy()
-        initial_n_features = df.shape[1]
-
-        # =========================
-        # 1. Ratios NPK
-        # =========================
-        if self.enable_ratios:
-            self.logger.info("Generating NPK ratio features")
-            eps = 1e-6
-
-            df["N_to_P"] = df["Nitrogen"] / (df["Phosphorous"] + eps)
-            df["N_to_K"] = df["Nitrogen"] / (df["Potassium"] + eps)
-            df["P_to_K"] = df["Phosphorous"] / (df["Potassium"] + eps)
+    # Le logger loguru (sink stderr) n'est pas sérialisable : il est exclu du
+    # pickle et ré-attaché au chargement (sinon joblib.dump du pipeline échoue).
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("logger", None)
+        return state
 
-            df["NPK_sum"] = (
-                df["Nitrogen"] + df["Phosphorous"] + df["Potassium"]
-            )
-
-            df["N_ratio"] = df["Nitrogen"] / (df["NPK_sum"] + eps)
-            df["P_ratio"] = df["Phosphorous"] / (df["NPK_sum"] + eps)
-            df["K_ratio"] = df["Potassium"] / (df["NPK_sum"] + eps)
-
-            self.logger.info("NPK ratio features added (7 features)")
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.logger = logger
 
-        # =========================
-        # 2. Interactions climat / sol
-        # =========================
+    @property
+    def feature_names(self) -> List[str]:
+        """Noms (ordonnés) des features créées, selon les flags actifs."""
+        names: List[str] = []
+        if self.enable_ratios:
+            names += _RATIO_FEATURES
         if self.enable_interactions:
-            self.logger.info("Generating climate × soil interaction features")
-
-            df["Temp_x_Humidity"] = df["Temperature"] * df["Humidity"]
-            df["Humidity_x_Moisture"] = df["Humidity"] * df["Moisture"]
-            df["Temp_x_Moisture"] = df["Temperature"] * df["Moisture"]
-
-            self.logger.info("Climate/soil interaction features added (3 features)")
+            names += _INTERACTION_FEATURES
+        if self.enable_transforms:
+            names += _TRANSFORM_FEATURES
+        return names
 
-        # =========================
-        # 3. Transformations non linéaires (robustes)
-        # =========================
+    @property
+    def source_columns(self) -> List[str]:
+        """Colonnes brutes nécessaires au calcul, selon les flags actifs."""
+        sources: List[str] = []
+        if self.enable_ratios:
+            sources += _RATIO_SOURCES
+        if self.enable_interactions:
+            sources += _INTERACTION_SOURCES
         if self.enable_transforms:
-            self.logger.info("Generating non-linear transformed features")
+            sources += _TRANSFORM_SOURCES
+        return list(dict.fromkeys(sources))
+
+    @property
+    def flags(self) -> Tuple[bool, bool, bool]:
+        """Configuration qui détermine le résultat (clé de cache)."""
+        return (self.enable_ratios, self.enable_interactions, self.enable_transforms)
+
+    def is_engineered(self, df: pd.DataFrame) -> bool:
+        """True si `df` contient déjà toutes les features dérivées (ex: cache CV)."""
+        return set(self.feature_names).issubset(df.columns)
+
+    def compute(self, df: Columns) -> np.ndarray:
+        """
+        Calcule les features dérivées dans une matrice float32 (n, n_features).
+
+        `df` peut aussi être un dict {colonne: vecteur NumPy} : mêmes formules,
+        sans passer par pandas (voir compiled_pipeline.py).
+
+        Les calculs intermédiaires sont faits en float64 (mêmes valeurs que
+        l'ancienne version pandas) dans un buffer réutilisé ; seul le stockage
+        final est en float32. Mémoire de travail : quelques vecteurs de n floats.
+        """
+        n_rows = _n_rows(df)
+        out = np.empty((n_rows, len(self.feature_names)), dtype=np.float32, order="F")
+        scratch = np.empty(n_rows, dtype=np.float64)
+        col = 0
 
-            df["log_Nitrogen"] = np.log1p(df["Nitrogen"])
-            df["log_Phosphorous"] = np.log1p(df["Phosphorous"])
-            df["log_Potassium"] = np.log1p(df["Potassium"])
+        if self.enable_ratios:
+            col = self._add_ratios(df, out, col, scratch)
+        if self.enable_interactions:
+            col = self._add_interactions(df, out, col)
+        if self.enable_transforms:
+            col = self._add_transforms(df, out, col, scratch)
+
+        return out
+
+    # =========================
+    # 1. Ratios NPK
+    # =========================
+    @staticmethod
+    def _add_ratios(df, out: np.ndarray, col: int, scratch: np.ndarray) -> int:
+        nitrogen = _source(df, "Nitrogen")
+        phosphorous = _source(df, "Phosphorous")
+        potassium = _source(df, "Potassium")
+
+        for num, den in (
+            (nitrogen, phosphorous),
+            (nitrogen, potassium),
+            (phosphorous, potassium),
+        ):
+            np.add(den, _EPS, out=scratch)
+            np.divide(num, scratch, out=out[:, col], casting="same_kind")
+            col += 1
+
+        np.add(nitrogen, phosphorous, out=scratch)
+        scratch += potassium
+        out[:, col] = scratch  # NPK_sum
+        col += 1
+
+        scratch += _EPS
+        for num in (nitrogen, phosphorous, potassium):
+            np.divide(num, scratch, out=out[:, col], casting="same_kind")
+            col += 1
+        return col
+
+    # =========================
+    # 2. Interactions climat / sol
+    # =========================
+    @staticmethod
+    def _add_interactions(df, out: np.ndarray, col: int) -> int:
+        temperature = _source(df, "Temperature")
+        humidity = _source(df, "Humidity")
+        moisture = _source(df, "Moisture")
+
+        for left, right in (
+            (temperature, humidity),
+            (humidity, moisture),
+            (temperature, moisture),
+        ):
+            np.multiply(left, right, out=out[:, col], casting="same_kind")
+            col += 1
+        return col
+
+    # =========================
+    # 3. Transformations non linéaires (robustes)
+    # =========================
+    @staticmethod
+    def _add_transforms(df, out: np.ndarray, col: int, scratch: np.ndarray) -> int:
+        for name in ("Nitrogen", "Phosphorous", "Potassium"):
+            np.log1p(_source(df, name), out=out[:, col], casting="same_kind")
+            col += 1
+
+        for name in ("Moisture", "Rainfall"):
+            np.clip(_source(df, name), 0, None, out=scratch)
+            np.sqrt(scratch, out=out[:, col], casting="same_kind")
+            col += 1
+        return col
 
-            df["sqrt_Moisture"] = np.sqrt(df["Moisture"].clip(lower=0))
-            df["sqrt_Rainfall"] = np.sqrt(df["Rainfall"].clip(lower=0))
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        self.logger.info("Starting feature engineering")
+        names = self.feature_names
+        features = pd.DataFrame(self.compute(df), columns=names, index=df.index)
 
-            self.logger.info("Non-linear transformed features added (5 features)")
+        if self.inplace:
+            df[names] = features
+            result = df
+        else:
+            result = pd.concat([df, features], axis=1, copy=False)
 
-        added_features = df.shape[1] - initial_n_features
         self.logger.info(
-            f"Feature engineering completed — {added_features} features added "
-            f"(total: {df.shape[1]})"
+            f"Feature engineering completed — {len(names)} features added "
+            f"(total: {result.shape[1]})"
         )
-
-        return df
\ No newline at end of file
+        return result
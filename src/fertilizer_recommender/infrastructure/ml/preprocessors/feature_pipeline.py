@@ -75,11 +75,30 @@ class FeaturePipeline:
         IMPORTANT :
         - Cette méthode ne doit JAMAIS être appelée en inference.
         """
-        X_fe = self.feature_engineer.transform(X_df)
+        X_fe = self._engineer(X_df)
         self.transformer.fit(X_fe)
         return self
 
-    def transform(self, X_df):
+    def set_layout(self, layout) -> None:
+        """Format de la matrice de sortie (MatrixLayout), imposé par le modèle."""
+        if hasattr(self.transformer, "set_layout"):
+            self.transformer.set_layout(layout)
+
+    @property
+    def signature(self):
+        """
+        Identité complète (features dérivées + transformer), ou None si le
+        transformer n'en déclare pas.
+
+        Deux pipelines de même signature, appris sur le même train, produisent
+        la même matrice : une CV multi-modèles n'en apprend qu'un par fold.
+        """
+        transformer_signature = getattr(self.transformer, "signature", None)
+        if transformer_signature is None:
+            return None
+        return (tuple(self.feature_engineer.feature_names), transformer_signature)
+
+    def transform(self, X_df, reuse_buffer: bool = True):
         """
         Applique les transformations apprises à un dataset.
 
@@ -90,9 +109,11 @@ class FeaturePipeline:
         IMPORTANT :
         - AUCUN apprentissage ici
         - 100 % déterministe
+        - reuse_buffer=True : la matrice retournée peut être réécrite par le
+          transform suivant de même forme (à consommer immédiatement)
         """
-        X_fe = self.feature_engineer.transform(X_df)
-        return self.transformer.transform(X_fe)
+        X_fe = self._engineer(X_df)
+        return self.transformer.transform(X_fe, reuse_buffer=reuse_buffer)
 
     def fit_transform(self, X_df):
         """
@@ -102,5 +123,17 @@ class FeaturePipeline:
         - fit()
         - puis transform()
         """
-        X_fe = self.feature_engineer.transform(X_df)
-        return self.transformer.fit_transform(X_fe)
\ No newline at end of file
+        X_fe = self._engineer(X_df)
+        return self.transformer.fit_transform(X_fe)
+
+    def _engineer(self, X_df):
+        """
+        Feature engineering, sauf si X_df est déjà enrichi.
+
+        En CV, les features dérivées (sans état) peuvent être pré-calculées
+        une fois sur tout le dataset puis découpées par fold : seul le
+        transformer ML (avec état) est alors réappris à chaque fold.
+        """
+        if self.feature_engineer.is_engineered(X_df):
+            return X_df
+        return self.feature_engineer.transform(X_df)
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+matrix_layout.py
+
+Pourquoi ce fichier existe ?
+- Un ColumnTransformer renvoie "ce qu'il veut" : sparse ou dense, float64,
+  ordre mémoire quelconque. Chaque modèle reconvertit (copie) ensuite la
+  matrice dans SON format, à chaque fit et à chaque predict.
+
+À quoi ça sert réellement ?
+- `MatrixLayout` : contrat de sortie des transformers (dtype + ordre C / F),
+  déclaré par le modèle (`input_layout`) et appliqué par TrainingPipeline.
+- `to_model_matrix` : une seule conversion vers ce format (aucune si la
+  matrice est déjà conforme).
+- `MatrixBufferPool` : buffers réutilisés d'un transform à l'autre pour une
+  même forme (un jeu par thread : prédictions concurrentes sans conflit).
+
+Très utile ?
+OUI pour l'inférence répétée (API, batches de submission) et la CV.
+"""
+
+from __future__ import annotations
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+@dataclass(frozen=True)
+class MatrixLayout:
+    dtype: type = np.float32
+    order: str = "C"  # "C" (lignes contiguës) ou "F" (colonnes contiguës)
+
+    def matches(self, X) -> bool:
+        if not isinstance(X, np.ndarray) or X.dtype != self.dtype:
+            return False
+        return X.flags.c_contiguous if self.order == "C" else X.flags.f_contiguous
+
+    def empty(self, shape: Tuple[int, int]) -> np.ndarray:
+        return np.empty(shape, dtype=self.dtype, order=self.order)
+
+
+# Format historique des boosters (float32, lignes contiguës)
+DEFAULT_LAYOUT = MatrixLayout()
+
+
+class MatrixBufferPool:
+    """
+    Buffers de sortie réutilisables, un par (thread, forme).
+
+    Le contenu d'un buffer n'est valable que jusqu'au transform suivant de
+    même forme dans le même thread : à réserver aux matrices consommées tout
+    de suite (predict_proba), pas à celles qu'un modèle peut conserver (fit).
+    """
+
+    def __init__(self, layout: MatrixLayout = DEFAULT_LAYOUT):
+        self.layout = layout
+        self._local = threading.local()
+
+    def get(self, shape: Tuple[int, int]) -> np.ndarray:
+        buffers: Dict[Tuple[int, int], np.ndarray] = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buffer = buffers.get(shape)
+        if buffer is None:
+            # Une seule forme gardée par thread : pas d'accumulation mémoire
+            buffers.clear()
+            buffer = buffers[shape] = self.layout.empty(shape)
+        return buffer
+
+    def __getstate__(self):
+        # Les buffers ne sont jamais persistés (joblib) ni envoyés aux workers
+        return {"layout": self.layout}
+
+    def __setstate__(self, state):
+        self.layout = state["layout"]
+        self._local = threading.local()
+
+
+def to_model_matrix(
+    X,
+    layout: MatrixLayout = DEFAULT_LAYOUT,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Matrice dense au format `layout`.
+
+    Args:
+        X: ndarray, matrice scipy.sparse ou DataFrame
+        out: buffer de destination (même forme, au format `layout`), optionnel
+
+    Returns:
+        np.ndarray: `X` lui-même s'il est déjà conforme et sans `out`,
+        sinon une seule copie convertie (dans `out` si fourni)
+    """
+    if sparse.issparse(X):
+        X = X.toarray()
+    X = np.asarray(X)
+
+    if out is None:
+        if layout.matches(X):
+            return X
+        return np.asarray(X, dtype=layout.dtype, order=layout.order)
+
+    np.copyto(out, X, casting="unsafe")
+    return out
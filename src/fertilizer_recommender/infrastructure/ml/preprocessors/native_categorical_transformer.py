@@ -0,0 +1,93 @@
+"""
+native_categorical_transformer.py
+
+Pourquoi ce fichier existe ?
+- Les modèles d'arbres (LightGBM, XGBoost, CatBoost) n'ont besoin ni de
+  scaling ni de one-hot : ils découpent sur des seuils et gèrent les
+  catégorielles nativement.
+- Le one-hot leur donne une matrice plus large et plus creuse, donc des
+  histogrammes plus longs à construire, pour rien.
+
+À quoi ça sert réellement ?
+- Profil de preprocessing "native" (voir configs/features.yaml) :
+  [numériques brutes..., code entier par catégorielle...]
+- Vocabulaire appris sur le train (trié) ; catégorie inconnue = NaN (valeur
+  manquante pour les boosters).
+- `categorical_indices` : positions des codes, à transmettre aux modèles
+  (categorical_feature / cat_features / feature_types).
+- Écriture directe au format du modèle (`MatrixLayout`), sans matrice
+  intermédiaire, dans un buffer réutilisé pour les transform répétés.
+
+Très utile ?
+OUI pour les boosters : 2 colonnes au lieu d'une par modalité.
+"""
+
+from __future__ import annotations
+from typing import Any, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fertilizer_recommender.infrastructure.ml.preprocessors.matrix_layout import (
+    DEFAULT_LAYOUT,
+    MatrixBufferPool,
+    MatrixLayout,
+)
+
+
+class NativeCategoricalTransformer:
+    def __init__(
+        self,
+        numeric_features: Sequence[str],
+        categorical_features: Sequence[str],
+        layout: MatrixLayout = DEFAULT_LAYOUT,
+    ):
+        self.numeric_features = list(numeric_features)
+        self.categorical_features = list(categorical_features)
+        self.categories_: List[List[Any]] = []
+        self.set_layout(layout)
+
+    def set_layout(self, layout: MatrixLayout) -> None:
+        self.layout = layout
+        self._buffers = MatrixBufferPool(layout)
+
+    @property
+    def signature(self) -> tuple:
+        """Identité du preprocessing : même signature = même matrice pour un même train."""
+        return ("native", tuple(self.numeric_features), tuple(self.categorical_features), self.layout)
+
+    @property
+    def categorical_indices(self) -> List[int]:
+        """Colonnes de sortie contenant des codes de catégorie."""
+        start = len(self.numeric_features)
+        return list(range(start, start + len(self.categorical_features)))
+
+    @property
+    def feature_names_out(self) -> List[str]:
+        return self.numeric_features + self.categorical_features
+
+    def fit(self, df: pd.DataFrame):
+        self.categories_ = [
+            sorted(pd.unique(df[name].dropna())) for name in self.categorical_features
+        ]
+        return self
+
+    def transform(self, df: pd.DataFrame, reuse_buffer: bool = True) -> np.ndarray:
+        n_numeric = len(self.numeric_features)
+        shape = (len(df), n_numeric + len(self.categorical_features))
+        out = self._buffers.get(shape) if reuse_buffer else self.layout.empty(shape)
+
+        # Colonne par colonne : conversion directe dans le buffer (float32 d'abord,
+        # même arrondi quel que soit le dtype de sortie)
+        for j, name in enumerate(self.numeric_features):
+            out[:, j] = np.asarray(df[name], dtype=np.float32)
+
+        for j, (name, categories) in enumerate(zip(self.categorical_features, self.categories_)):
+            codes = pd.Categorical(df[name], categories=categories).codes
+            column = out[:, n_numeric + j]
+            column[:] = codes
+            column[codes < 0] = np.nan  # inconnue / manquante
+        return out
+
+    def fit_transform(self, df: pd.DataFrame) -> np.ndarray:
+        return self.fit(df).transform(df, reuse_buffer=False)
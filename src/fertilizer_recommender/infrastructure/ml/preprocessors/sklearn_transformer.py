@@ -8,35 +8,109 @@ Pourquoi ce fichier existe ?
 À quoi ça sert réellement ?
 - Transformer un DataFrame brut en matrice ML.
 - Garantir que train et test utilisent le même preprocessing.
+- Sortie toujours dense, au format du modèle (`MatrixLayout`), écrite
+  directement colonne par colonne (scaler / encoder appris) dans un buffer
+  réutilisé pour les transform répétés : pas de blocs float64 intermédiaires
+  ni de hstack. Résultat identique au ColumnTransformer.
 
 Est-ce critique ?
 OUI. Sans pipeline propre = data leakage assuré.
 """
 
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
+from fertilizer_recommender.infrastructure.ml.preprocessors.matrix_layout import (
+    DEFAULT_LAYOUT,
+    MatrixBufferPool,
+    MatrixLayout,
+    to_model_matrix,
+)
+
 
 class SklearnFeatureTransformer:
-    def __init__(self, numeric_features, categorical_features):
+    def __init__(self, numeric_features, categorical_features, layout: MatrixLayout = DEFAULT_LAYOUT):
         self.numeric_features = numeric_features
         self.categorical_features = categorical_features
+        self.set_layout(layout)
 
+        # Sortie dense imposée : jamais de matrice sparse à redensifier par le modèle
         self.transformer = ColumnTransformer(
             transformers=[
                 ("num", StandardScaler(), self.numeric_features),
-                ("cat", OneHotEncoder(handle_unknown="ignore"), self.categorical_features),
-            ]
+                ("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=False), self.categorical_features),
+            ],
+            sparse_threshold=0.0,
         )
 
+    def set_layout(self, layout: MatrixLayout) -> None:
+        self.layout = layout
+        self._buffers = MatrixBufferPool(layout)
+
+    @property
+    def signature(self) -> tuple:
+        """Identité du preprocessing : même signature = même matrice pour un même train."""
+        return ("one_hot", tuple(self.numeric_features), tuple(self.categorical_features), self.layout)
+
+    @property
+    def n_output_features(self) -> int:
+        encoder = self.transformer.named_transformers_["cat"]
+        return len(self.numeric_features) + sum(len(c) for c in encoder.categories_)
+
     def fit(self, df: pd.DataFrame):
         self.transformer.fit(df)
         return self
 
-    def transform(self, df: pd.DataFrame):
-        return self.transformer.transform(df)
+    def transform(self, df: pd.DataFrame, reuse_buffer: bool = True):
+        if not self._can_write_directly():
+            X = self.transformer.transform(df)
+            out = self._buffers.get(X.shape) if reuse_buffer else None
+            return to_model_matrix(X, self.layout, out=out)
+
+        shape = (len(df), self.n_output_features)
+        out = self._buffers.get(shape) if reuse_buffer else self.layout.empty(shape)
+        return self._write(df, out)
 
     def fit_transform(self, df: pd.DataFrame):
-        return self.transformer.fit_transform(df)
\ No newline at end of file
+        return self.fit(df).transform(df, reuse_buffer=False)
+
+    def _can_write_directly(self) -> bool:
+        # Catégorie NaN apprise : cas rare, laissé au ColumnTransformer
+        encoder = self.transformer.named_transformers_["cat"]
+        return not any(pd.isna(categories).any() for categories in encoder.categories_)
+
+    def _write(self, df: pd.DataFrame, out: np.ndarray) -> np.ndarray:
+        scaler = self.transformer.named_transformers_["num"]
+        encoder = self.transformer.named_transformers_["cat"]
+
+        # Même dtype de calcul que StandardScaler (celui du bloc numérique)
+        dtype = np.result_type(*(df[name].dtype for name in self.numeric_features))
+        if dtype.kind != "f":
+            dtype = np.dtype(np.float64)
+        mean = scaler.mean_.astype(dtype)
+        scale = scaler.scale_.astype(dtype)
+
+        scratch = np.empty(len(df), dtype=dtype)
+        for j, name in enumerate(self.numeric_features):
+            np.subtract(np.asarray(df[name], dtype=dtype), mean[j], out=scratch)
+            scratch /= scale[j]
+            out[:, j] = scratch
+
+        offset = len(self.numeric_features)
+        for name, categories in zip(self.categorical_features, encoder.categories_):
+            block = out[:, offset: offset + len(categories)]
+            block[:] = 0
+            codes = pd.Categorical(df[name], categories=categories).codes
+            rows = np.flatnonzero(codes >= 0)  # inconnue : ligne de zéros
+            block[rows, codes[rows]] = 1
+            offset += len(categories)
+        return out
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "layout" not in state:
+            # Artefact antérieur au contrat de sortie : float64, comme à l'époque
+            self.set_layout(MatrixLayout(dtype=np.float64))
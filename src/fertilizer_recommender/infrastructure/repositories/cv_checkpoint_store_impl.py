@@ -0,0 +1,96 @@
+"""
+cv_checkpoint_store_impl.py
+
+Pourquoi ce fichier existe ?
+- Implémentation concrète du port CVCheckpointStore : un dossier par
+  (run, clé de config + données).
+
+À quoi ça sert réellement ?
+- <checkpoint_dir>/<run_name>-<clé courte>/
+    fold_<k>.joblib   checkpoint du fold k (pipeline appris, OOF, score, temps)
+    state.json        clé complète, run_id du tracker
+- Écritures atomiques (fichier temporaire + os.replace) : un process tué
+  pendant une sauvegarde laisse au pire un .tmp ignoré, jamais un fold
+  à moitié écrit considéré comme terminé.
+- Une autre config ou d'autres données = une autre clé = un autre dossier :
+  aucun risque de reprendre des folds incompatibles.
+- Le dossier est créé à la première écriture et supprimé par `clear()` :
+  rien ne reste sur disque après une CV terminée.
+
+Est-ce critique ?
+Non pour entraîner, OUI pour reprendre une CV de plusieurs heures.
+"""
+
+from __future__ import annotations
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+import joblib
+from loguru import logger
+
+_STATE_FILE = "state.json"
+_FOLD_PATTERN = re.compile(r"^fold_(\d+)\.joblib$")
+
+
+class JoblibCVCheckpoint:
+    def __init__(self, run_dir: Path, key: str):
+        self.run_dir = run_dir
+        self.key = key
+        self.logger = logger
+
+    def completed_folds(self) -> List[int]:
+        if not self.run_dir.exists():
+            return []
+        folds = []
+        for path in self.run_dir.iterdir():
+            match = _FOLD_PATTERN.match(path.name)
+            if match:
+                folds.append(int(match.group(1)))
+        return sorted(folds)
+
+    def load_fold(self, fold: int) -> Any:
+        return joblib.load(self._fold_path(fold))
+
+    def save_fold(self, fold: int, checkpoint: Any) -> None:
+        path = self._fold_path(fold)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        try:
+            joblib.dump(checkpoint, tmp_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, path)
+        self.logger.debug(f"Checkpoint du fold {fold} : {path}")
+
+    def load_state(self) -> Dict[str, Any]:
+        path = self.run_dir / _STATE_FILE
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def save_state(self, state: Mapping[str, Any]) -> None:
+        path = self.run_dir / _STATE_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        tmp_path.write_text(json.dumps({"key": self.key, **state}, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def _fold_path(self, fold: int) -> Path:
+        return self.run_dir / f"fold_{fold}.joblib"
+
+
+class JoblibCVCheckpointStore:
+    def __init__(self, checkpoint_dir: Path):
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    def open(self, run_name: str, key: str) -> JoblibCVCheckpoint:
+        return JoblibCVCheckpoint(self.checkpoint_dir / f"{run_name}-{key[:16]}", key)
@@ -14,10 +14,17 @@ OUI. C’est l’adaptateur principal des données.
 
 from __future__ import annotations
 from pathlib import Path
+from typing import Iterator, List, Optional
 from pandas import DataFrame
 
+from fertilizer_recommender.domain.entities.fertilizer_features import FertilizerFeaturesSchema
 from fertilizer_recommender.domain.interfaces.dataset_repository import DatasetRepository
-from fertilizer_recommender.infrastructure.data_sources.csv_loader import load_csv
+from fertilizer_recommender.infrastructure.data_sources.csv_loader import iter_csv, load_csv
+from fertilizer_recommender.infrastructure.data_sources.parquet_loader import (
+    convert_csv_to_parquet,
+    iter_parquet,
+    load_parquet,
+)
 
 
 class CsvDatasetRepository(DatasetRepository):
@@ -31,3 +38,92 @@ class CsvDatasetRepository(DatasetRepository):
 
     def load_test_dataset(self) -> DataFrame:
         return load_csv(self.data_dir / self.test_file)
+
+    def iter_test_dataset(self, batch_size: int) -> Iterator[DataFrame]:
+        return iter_csv(self.data_dir / self.test_file, batch_size)
+
+
+class ParquetDatasetRepository(DatasetRepository):
+    """
+    Chargement Parquet (types compacts, mémoire mappée).
+
+    Si un schéma est fourni, seules les colonnes utiles sont lues :
+    id + features du schéma (+ target pour le train).
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        train_file: str,
+        test_file: str,
+        schema: Optional[FertilizerFeaturesSchema] = None,
+        target_col: Optional[str] = None,
+        id_col: Optional[str] = None,
+    ):
+        self.data_dir = data_dir
+        self.train_file = train_file
+        self.test_file = test_file
+        self.schema = schema
+        self.target_col = target_col
+        self.id_col = id_col
+
+    def _columns(self, with_target: bool) -> Optional[List[str]]:
+        if self.schema is None:
+            return None
+        columns = [self.id_col] if self.id_col else []
+        columns += self.schema.all_features
+        if with_target and self.target_col:
+            columns.append(self.target_col)
+        return columns
+
+    def _path(self, file_name: str) -> Path:
+        path = self.data_dir / file_name
+        if not path.exists():
+            raise FileNotFoundError(
+                f"Parquet introuvable: {path} "
+                "(voir convert_csv_dataset_to_parquet pour le générer)"
+            )
+        return path
+
+    def load_train_dataset(self) -> DataFrame:
+        return load_parquet(
+            self._path(self.train_file), columns=self._columns(with_target=True)
+        )
+
+    def load_test_dataset(self) -> DataFrame:
+        return load_parquet(
+            self._path(self.test_file), columns=self._columns(with_target=False)
+        )
+
+    def iter_test_dataset(self, batch_size: int) -> Iterator[DataFrame]:
+        return iter_parquet(
+            self._path(self.test_file),
+            batch_size,
+            columns=self._columns(with_target=False),
+        )
+
+
+def convert_csv_dataset_to_parquet(
+    csv_repository: CsvDatasetRepository,
+    parquet_repository: ParquetDatasetRepository,
+) -> None:
+    """
+    Conversion one-shot des CSV train/test vers les Parquet du repository cible.
+
+    Les catégorielles du schéma et la target sont stockées en category.
+    """
+    categorical_cols: List[str] = []
+    if parquet_repository.schema is not None:
+        categorical_cols += parquet_repository.schema.categorical_features
+    if parquet_repository.target_col:
+        categorical_cols.append(parquet_repository.target_col)
+
+    for csv_file, parquet_file in (
+        (csv_repository.train_file, parquet_repository.train_file),
+        (csv_repository.test_file, parquet_repository.test_file),
+    ):
+        convert_csv_to_parquet(
+            csv_repository.data_dir / csv_file,
+            parquet_repository.data_dir / parquet_file,
+            categorical_cols=categorical_cols,
+        )
@@ -9,13 +9,26 @@ Pourquoi ce fichier existe ?
 - Sauvegarder le pipeline complet (preprocessing + modèle).
 - Le recharger à l’identique pour l’inférence ou la submission.
 
+Deux implémentations :
+- JoblibModelRepository : dé-sérialise le pipeline à chaque `load`.
+- CachedJoblibModelRepository : charge les tableaux NumPy en mémoire mappée
+  (mmap_mode), garde les pipelines déjà chargés dans un LRU borné en mémoire
+  (clé = nom + mtime du fichier) et charge plusieurs modèles en parallèle.
+
 Est-ce critique ?
 OUI. C’est ce qui rend ton travail réutilisable.
 """
 
 from __future__ import annotations
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
 import joblib
+from loguru import logger
 
 from fertilizer_recommender.domain.interfaces.model_repository import ModelRepository
 
@@ -26,11 +39,97 @@ class JoblibModelRepository(ModelRepository):
         self.models_dir.mkdir(parents=True, exist_ok=True)
 
     def save(self, model, name: str) -> None:
-        path = self.models_dir / f"{name}.joblib"
-        joblib.dump(model, path)
+        path = self._path(name)
+        # Écriture atomique : un lecteur ne voit jamais un fichier à moitié écrit.
+        # Non compressé : les tableaux NumPy restent mappables (mmap_mode).
+        tmp_path = path.with_suffix(".joblib.tmp")
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
 
     def load(self, name: str):
-        path = self.models_dir / f"{name}.joblib"
+        return joblib.load(self._existing_path(name))
+
+    def _path(self, name: str) -> Path:
+        return self.models_dir / f"{name}.joblib"
+
+    def _existing_path(self, name: str) -> Path:
+        path = self._path(name)
         if not path.exists():
             raise FileNotFoundError(f"Modèle introuvable: {path}")
-        return joblib.load(path)
\ No newline at end of file
+        return path
+
+
+class CachedJoblibModelRepository(JoblibModelRepository):
+    """
+    JoblibModelRepository + mmap + LRU + chargement parallèle.
+
+    - mmap_mode="r" : les gros tableaux (coefficients, stats du scaler…) ne
+      sont pas copiés en RAM, le noyau partage les pages entre processus.
+    - LRU : clé (nom, mtime_ns). Un modèle ré-entraîné (fichier réécrit)
+      invalide naturellement l'entrée. Coût d'une entrée = taille du fichier,
+      plafond total `max_bytes`.
+    - load_many : les boosters (LightGBM / XGBoost) se reconstruisent via
+      ctypes, qui relâche le GIL ; N modèles se chargent en ~max(temps)
+      au lieu de la somme.
+    """
+
+    def __init__(
+        self,
+        models_dir: Path,
+        max_bytes: int = 2 * 1024 ** 3,
+        mmap_mode: Optional[str] = "r",
+        load_workers: int = 4,
+    ):
+        super().__init__(models_dir)
+        self.max_bytes = max_bytes
+        self.mmap_mode = mmap_mode
+        self.load_workers = load_workers
+        self.logger = logger
+
+        self._entries: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def load(self, name: str):
+        path = self._existing_path(name)
+        stat = path.stat()
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == stat.st_mtime_ns:
+                self._entries.move_to_end(name)
+                return entry[2]
+
+        # Hors verrou : plusieurs modèles peuvent se charger en même temps
+        model = joblib.load(path, mmap_mode=self.mmap_mode)
+        self.logger.info(f"Modèle chargé : {path} ({stat.st_size / 1e6:.1f} Mo)")
+
+        with self._lock:
+            self._evict(name)
+            if stat.st_size <= self.max_bytes:
+                self._entries[name] = (stat.st_mtime_ns, stat.st_size, model)
+                self._total_bytes += stat.st_size
+                while self._total_bytes > self.max_bytes:
+                    self._evict(next(iter(self._entries)))
+        return model
+
+    def load_many(self, names: Sequence[str]) -> Dict[str, Any]:
+        names = list(dict.fromkeys(names))
+        if len(names) <= 1 or self.load_workers <= 1:
+            return super().load_many(names)
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.load_workers, len(names)), thread_name_prefix="model-load"
+        ) as pool:
+            models = list(pool.map(self.load, names))
+        return dict(zip(names, models))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _evict(self, name: str) -> None:
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
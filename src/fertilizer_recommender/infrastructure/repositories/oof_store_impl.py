@@ -0,0 +1,160 @@
+"""
+oof_store_impl.py
+
+Pourquoi ce fichier existe ?
+- Implémentation concrète du port OOFStore : un dossier par run.
+
+À quoi ça sert réellement ?
+- <oof_dir>/<run_name>/
+    proba.npy      float32 (n_rows, n_classes), écrit fold par fold en mémoire mappée
+    fold_ids.npy   int8    (n_rows,)  fold qui a prédit la ligne
+    row_index.npy  int64   (n_rows,)  index du DataFrame d'entraînement
+    y_idx.npy      int16   (n_rows,)  vraie classe encodée
+    meta.json      classes, nombre de folds, dimensions (manifeste de la run)
+- Relecture en mmap_mode="r" : zéro copie, même pour plusieurs runs à la fois.
+- L'index doit être entier (mmap impossible pour des objets) : vérifié avant
+  toute écriture sur disque.
+
+Est-ce critique ?
+Non pour entraîner, OUI pour blender / stacker sans ré-entraîner.
+"""
+
+from __future__ import annotations
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+from loguru import logger
+
+from fertilizer_recommender.domain.entities.oof_predictions import OOFPredictions
+
+_META_FILE = "meta.json"
+
+
+def _int64_row_index(row_index) -> np.ndarray:
+    index = np.asarray(row_index)
+    if index.dtype.kind in "iu":
+        return index.astype(np.int64, copy=False)
+    raise ValueError(
+        f"OOF : l'index des lignes doit être entier (reçu dtype={index.dtype}) ; "
+        "utiliser un RangeIndex ou un index d'ids entiers (ex: df.set_index('id'))."
+    )
+
+
+class NpyOOFWriter:
+    """Écrit les OOF d'une run dans un dossier temporaire, publié par `close`."""
+
+    def __init__(
+        self,
+        run_dir: Path,
+        row_index: np.ndarray,
+        y_idx: np.ndarray,
+        classes: Sequence[str],
+    ):
+        row_index = _int64_row_index(row_index)
+
+        self.run_dir = run_dir
+        self.tmp_dir = run_dir.with_name(f".{run_dir.name}.tmp-{os.getpid()}")
+        self.classes = [str(c) for c in classes]
+        self._class_pos: Dict[str, int] = {c: i for i, c in enumerate(self.classes)}
+        self.logger = logger
+
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        self.tmp_dir.mkdir(parents=True)
+
+        n_rows = len(row_index)
+        self._proba = np.lib.format.open_memmap(
+            self.tmp_dir / "proba.npy", mode="w+", dtype=np.float32,
+            shape=(n_rows, len(self.classes)),
+        )
+        self._fold_ids = np.zeros(n_rows, dtype=np.int8)
+        np.save(self.tmp_dir / "row_index.npy", row_index)
+        np.save(self.tmp_dir / "y_idx.npy", np.asarray(y_idx, dtype=np.int16))
+
+    def write_fold(
+        self,
+        fold: int,
+        positions: np.ndarray,
+        proba: np.ndarray,
+        classes: Sequence[str],
+    ) -> None:
+        classes = [str(c) for c in classes]
+        if classes == self.classes:
+            self._proba[positions] = proba
+        else:
+            # Classe absente du train d'un fold : colonnes réalignées, proba 0
+            block = np.zeros((len(positions), len(self.classes)), dtype=np.float32)
+            block[:, [self._class_pos[c] for c in classes]] = proba
+            self._proba[positions] = block
+        self._fold_ids[positions] = fold
+
+    def close(self) -> str:
+        missing = int((self._fold_ids == 0).sum())
+        if missing:
+            self.abort()
+            raise ValueError(f"OOF incomplets : {missing} lignes sans prédiction.")
+
+        self._proba.flush()
+        del self._proba
+        np.save(self.tmp_dir / "fold_ids.npy", self._fold_ids)
+
+        meta = {
+            "run_name": self.run_dir.name,
+            "classes": self.classes,
+            "n_rows": int(len(self._fold_ids)),
+            "n_folds": int(self._fold_ids.max()) if len(self._fold_ids) else 0,
+        }
+        (self.tmp_dir / _META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+        # Publication : la run précédente du même nom est remplacée
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        os.replace(self.tmp_dir, self.run_dir)
+
+        manifest = self.run_dir / _META_FILE
+        self.logger.info(f"OOF enregistrés : {self.run_dir} ({meta['n_rows']} lignes)")
+        return str(manifest)
+
+    def abort(self) -> None:
+        if hasattr(self, "_proba"):
+            del self._proba
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class NpyOOFStore:
+    def __init__(self, oof_dir: Path):
+        self.oof_dir = oof_dir
+        self.oof_dir.mkdir(parents=True, exist_ok=True)
+
+    def open_writer(
+        self,
+        run_name: str,
+        row_index: np.ndarray,
+        y_idx: np.ndarray,
+        classes: Sequence[str],
+    ) -> NpyOOFWriter:
+        return NpyOOFWriter(self.oof_dir / run_name, row_index, y_idx, classes)
+
+    def load(self, run_name: str) -> OOFPredictions:
+        run_dir = self.oof_dir / run_name
+        meta_path = run_dir / _META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"OOF introuvables: {run_dir}")
+
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return OOFPredictions(
+            run_name=run_name,
+            proba=np.load(run_dir / "proba.npy", mmap_mode="r"),
+            fold_ids=np.load(run_dir / "fold_ids.npy", mmap_mode="r"),
+            row_index=np.load(run_dir / "row_index.npy", mmap_mode="r"),
+            y_idx=np.load(run_dir / "y_idx.npy", mmap_mode="r"),
+            classes=meta["classes"],
+        )
+
+    def list_runs(self) -> List[str]:
+        return sorted(
+            path.name for path in self.oof_dir.iterdir()
+            if (path / _META_FILE).exists()
+        )
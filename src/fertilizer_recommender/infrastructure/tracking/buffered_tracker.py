@@ -0,0 +1,260 @@
+"""
+buffered_tracker.py
+
+Pourquoi ce fichier existe ?
+- Chaque log_params / log_metrics MLflow est une écriture synchrone (file
+  store : fichiers ; serveur : requête HTTP), payée sur le chemin critique
+  de chaque fold de CV et de chaque essai d'hyperparamètres.
+
+À quoi ça sert réellement ?
+- Décorateur du port ExperimentTracker : params, métriques et artefacts
+  sont mis en file, étiquetés avec la run active AU MOMENT du log (runs
+  enfants et threads compris), puis écrits par lots depuis un thread :
+    - dès `max_batch_size` enregistrements, ou `flush_interval_s` après le
+      premier enregistrement en attente,
+    - et toujours de façon synchrone à `end_run` (donc aussi quand un use
+      case lève : ExperimentTrackingService ferme la run dans un finally),
+      à `flush()`, à `close()` et à la sortie de l'interpréteur (atexit).
+- Le tracker décoré doit exposer `log_batch(run_id, params, metrics, artifacts)`
+  (écriture adressée par run_id, indépendante de la run active du thread).
+- Un lot en échec est remis en tête de file (réessayé au lot suivant) ;
+  l'erreur remonte au prochain flush synchrone au lieu d'être perdue.
+
+Contrainte : un artefact est lu au moment du flush (au plus tard à end_run),
+le fichier doit donc exister jusque-là.
+
+Très utile ?
+OUI dès que le backend MLflow est distant ou que les runs sont courtes.
+"""
+
+from __future__ import annotations
+import atexit
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+from loguru import logger
+
+from fertilizer_recommender.domain.interfaces.experiment_tracker import ExperimentTracker
+
+# (clé, valeur, timestamp en ms, step) : format des métriques MLflow
+MetricRecord = Tuple[str, float, int, int]
+
+# (type, run_id, contenu) avec type = "param" | "metric" | "artifact"
+_Record = Tuple[str, str, Any]
+
+
+class BatchLoggingTracker(ExperimentTracker, Protocol):
+    def log_batch(
+        self,
+        run_id: str,
+        params: Mapping[str, Any],
+        metrics: Sequence[MetricRecord],
+        artifacts: Sequence[str],
+    ) -> None:
+        """Écrit params, métriques et artefacts dans la run `run_id`"""
+        ...
+
+
+class BufferedExperimentTracker(ExperimentTracker):
+    def __init__(
+        self,
+        tracker: BatchLoggingTracker,
+        max_batch_size: int = 1000,
+        flush_interval_s: float = 2.0,
+    ):
+        """
+        Args:
+            tracker: tracker décoré (écrit les lots, gère les runs).
+            max_batch_size: enregistrements en attente déclenchant un flush.
+            flush_interval_s: délai maximal entre un log et son écriture.
+        """
+        if not callable(getattr(tracker, "log_batch", None)):
+            raise TypeError(f"{type(tracker).__name__} n'implémente pas log_batch(run_id, ...)")
+
+        self._tracker = tracker
+        self.max_batch_size = max_batch_size
+        self.flush_interval_s = flush_interval_s
+        self.logger = logger
+
+        self._pending: List[_Record] = []
+        self._cond = threading.Condition()
+        # Un seul écrivain à la fois : un lot pris dans la file est écrit
+        # avant que le suivant ne soit pris (ordre préservé)
+        self._write_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        atexit.register(self.close)
+
+    # -------------------------
+    # Runs (synchrone, délégué)
+    # -------------------------
+    def setup_experiment(self, name: str) -> str:
+        return self._tracker.setup_experiment(name)
+
+    def start_run(
+        self,
+        run_name: str | None = None,
+        nested: bool = False,
+        run_id: str | None = None,
+    ) -> None:
+        self._tracker.start_run(run_name, nested=nested, run_id=run_id)
+
+    def active_run_id(self) -> str | None:
+        return self._tracker.active_run_id()
+
+    def end_run(self) -> None:
+        """Écrit tout ce qui est en attente, puis ferme la run (même si l'écriture échoue)."""
+        try:
+            self.flush()
+        finally:
+            self._tracker.end_run()
+
+    # -------------------------
+    # Logging (mis en file)
+    # -------------------------
+    def log_params(self, params: Mapping[str, Any]) -> None:
+        self._enqueue([("param", None, (key, value)) for key, value in params.items()])
+
+    def log_metrics(self, metrics: Mapping[str, float]) -> None:
+        timestamp = int(time.time() * 1000)
+        self._enqueue([
+            ("metric", None, (key, float(value), timestamp, 0)) for key, value in metrics.items()
+        ])
+
+    def log_artifact(self, path: str) -> None:
+        self._enqueue([("artifact", None, str(path))])
+
+    def _enqueue(self, records: List[Tuple[str, None, Any]]) -> None:
+        if not records:
+            return
+
+        run_id = self._tracker.active_run_id()
+        if run_id is None:
+            # Aucune run : comportement du tracker décoré (ex: MLflow en ouvre une)
+            self._write_unbuffered(records)
+            return
+
+        with self._cond:
+            self._pending.extend((kind, run_id, payload) for kind, _, payload in records)
+            closed = self._closed
+            if not closed:
+                self._ensure_worker()
+                if len(self._pending) >= self.max_batch_size:
+                    self._cond.notify_all()
+        if closed:
+            # Après close() (ex: pendant atexit) : écriture immédiate
+            self.flush()
+
+    def _write_unbuffered(self, records: List[Tuple[str, None, Any]]) -> None:
+        params = {key: value for _, _, (key, value) in _only(records, "param")}
+        metrics = {key: value for _, _, (key, value, _, _) in _only(records, "metric")}
+        if params:
+            self._tracker.log_params(params)
+        if metrics:
+            self._tracker.log_metrics(metrics)
+        for _, _, path in _only(records, "artifact"):
+            self._tracker.log_artifact(path)
+
+    # -------------------------
+    # Écriture des lots
+    # -------------------------
+    def flush(self) -> None:
+        """Écrit (synchrone) tout ce qui est en attente ; lève si l'écriture échoue."""
+        with self._write_lock:
+            with self._cond:
+                records, self._pending = self._pending, []
+            if records:
+                self._write(records)
+
+    def _write(self, records: List[_Record]) -> None:
+        # Regroupement par run, dans l'ordre de première apparition
+        by_run: Dict[str, List[_Record]] = {}
+        for record in records:
+            by_run.setdefault(record[1], []).append(record)
+
+        runs = list(by_run.items())
+        for i, (run_id, run_records) in enumerate(runs):
+            params: Dict[str, Any] = {}
+            metrics: List[MetricRecord] = []
+            artifacts: List[str] = []
+            for kind, _, payload in run_records:
+                if kind == "param":
+                    params[payload[0]] = payload[1]
+                elif kind == "metric":
+                    metrics.append(payload)
+                else:
+                    artifacts.append(payload)
+
+            try:
+                self._tracker.log_batch(run_id, params=params, metrics=metrics, artifacts=artifacts)
+            except BaseException:
+                # Runs déjà écrites : pas de doublon ; le reste repart en tête de file
+                unwritten = [record for _, later in runs[i:] for record in later]
+                with self._cond:
+                    self._pending[:0] = unwritten
+                raise
+
+        self.logger.debug(f"Tracking : {len(records)} enregistrements écrits ({len(runs)} run(s))")
+
+    def _ensure_worker(self) -> None:
+        # Appelé sous self._cond : thread démarré au premier enregistrement seulement
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run_worker, name="tracking-flush", daemon=True
+            )
+            self._worker.start()
+
+    def _run_worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                # Lot complet, délai écoulé ou fermeture
+                deadline = time.monotonic() + self.flush_interval_s
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+
+            try:
+                self.flush()
+            except Exception as exc:
+                with self._cond:
+                    pending = len(self._pending)
+                    self.logger.error(
+                        f"Échec d'écriture du tracking ({pending} enregistrements conservés, "
+                        f"nouvel essai dans {self.flush_interval_s}s) : {exc}"
+                    )
+                    # Pause avant de réessayer (interrompue par close())
+                    self._cond.wait(self.flush_interval_s)
+
+    # -------------------------
+    # Fermeture
+    # -------------------------
+    def close(self) -> None:
+        """Arrête le thread et écrit le reste (appelé aussi à la sortie de l'interpréteur)."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            worker = self._worker
+
+        if worker is not None:
+            worker.join()
+        atexit.unregister(self.close)
+
+        try:
+            self.flush()
+        except Exception as exc:
+            with self._cond:
+                lost = len(self._pending)
+            self.logger.error(f"Tracking : {lost} enregistrements non écrits à la fermeture : {exc}")
+
+
+def _only(records: List[Tuple[str, Any, Any]], kind: str):
+    return [record for record in records if record[0] == kind]
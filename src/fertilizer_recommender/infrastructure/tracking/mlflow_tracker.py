@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 import mlflow
-from typing import Mapping, Any
+from typing import Any, Mapping, Sequence, Tuple
+
+from mlflow.entities import Metric, Param
 
 from loguru import logger
 from fertilizer_recommender.domain.interfaces.experiment_tracker import ExperimentTracker
 from fertilizer_recommender.infrastructure.tracking.mlflow_setup import MLflowConfigurator
 
+_MAX_PARAMS_PER_BATCH = 100
+_MAX_METRICS_PER_BATCH = 1000
+
 
 class MLflowExperimentTracker(ExperimentTracker):
     """
@@ -59,15 +64,37 @@ class MLflowExperimentTracker(ExperimentTracker):
     # -------------------------
     # Runs
     # -------------------------
-    def start_run(self, run_name: str | None = None) -> None:
-        """Démarre une run MLflow en fermant la précédente si nécessaire."""
+    def start_run(
+        self,
+        run_name: str | None = None,
+        nested: bool = False,
+        run_id: str | None = None,
+    ) -> None:
+        """
+        Démarre une run MLflow en fermant la précédente si nécessaire (sauf run enfant).
+        Avec `run_id`, rouvre une run existante (reprise d'une CV interrompue).
+        """
+        if nested:
+            mlflow.start_run(run_name=run_name, nested=True)
+            self.logger.info(f"Run enfant démarrée : {run_name}")
+            return
+
         if mlflow.active_run() is not None:
             self.logger.warning("Run déjà active détectée. Fermeture automatique.")
             mlflow.end_run()
 
+        if run_id is not None:
+            mlflow.start_run(run_id=run_id)
+            self.logger.info(f"Run reprise : {run_name} ({run_id})")
+            return
+
         mlflow.start_run(run_name=run_name)
         self.logger.info(f"Run démarrée : {run_name}")
 
+    def active_run_id(self) -> str | None:
+        active = mlflow.active_run()
+        return active.info.run_id if active else None
+
     def end_run(self) -> None:
         """Ferme la run active."""
         active = mlflow.active_run()
@@ -88,4 +115,32 @@ class MLflowExperimentTracker(ExperimentTracker):
 
     def log_artifact(self, path: str) -> None:
         self.logger.debug(f"Artefact enregistré : {path}")
-        mlflow.log_artifact(path)
\ No newline at end of file
+        mlflow.log_artifact(path)
+
+    def log_batch(
+        self,
+        run_id: str,
+        params: Mapping[str, Any],
+        metrics: Sequence[Tuple[str, float, int, int]],
+        artifacts: Sequence[str],
+    ) -> None:
+        """
+        Écriture groupée dans la run `run_id` (MlflowClient.log_batch), sans
+        dépendre de la run active du thread appelant (BufferedExperimentTracker).
+        metrics : (clé, valeur, timestamp en ms, step).
+        """
+        param_entities = [Param(key, str(value)) for key, value in params.items()]
+        metric_entities = [Metric(key, value, timestamp, step) for key, value, timestamp, step in metrics]
+
+        # Limites MLflow par appel : 100 params, 1000 métriques
+        for start in range(0, len(param_entities), _MAX_PARAMS_PER_BATCH):
+            self.client.log_batch(run_id, params=param_entities[start:start + _MAX_PARAMS_PER_BATCH])
+        for start in range(0, len(metric_entities), _MAX_METRICS_PER_BATCH):
+            self.client.log_batch(run_id, metrics=metric_entities[start:start + _MAX_METRICS_PER_BATCH])
+        for path in artifacts:
+            self.client.log_artifact(run_id, path)
+
+        self.logger.debug(
+            f"Lot enregistré ({run_id}) : {len(param_entities)} params, "
+            f"{len(metric_entities)} métriques, {len(artifacts)} artefacts"
+        )
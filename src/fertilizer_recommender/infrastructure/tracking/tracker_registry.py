@@ -0,0 +1,25 @@
+"""
+tracker_registry.py
+
+Pourquoi ce fichier existe ?
+- `import mlflow` coûte plusieurs secondes : une commande qui ne trace
+  rien (predict, submit, API) ne doit pas le payer.
+
+À quoi ça sert réellement ?
+- Déclarer les adaptateurs du port ExperimentTracker par nom ; le module
+  (et mlflow) n'est importé qu'à la création du premier tracker.
+
+Très utile ?
+OUI pour le démarrage des commandes d'inférence.
+"""
+
+from __future__ import annotations
+
+from fertilizer_recommender.infrastructure.utils.plugin_registry import PluginRegistry
+
+TRACKER_REGISTRY = PluginRegistry("Tracker")
+
+TRACKER_REGISTRY.register(
+    "mlflow",
+    "fertilizer_recommender.infrastructure.tracking.mlflow_tracker:MLflowExperimentTracker",
+)
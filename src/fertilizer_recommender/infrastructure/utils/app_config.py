@@ -0,0 +1,525 @@
+"""
+app_config.py
+
+Pourquoi ce fichier existe ?
+- Chaque builder de la composition root relisait les 4 YAML (training,
+  models, features, mlflow) puis lisait des dicts imbriqués par clé texte :
+  une faute de frappe ou une valeur invalide n'apparaissait qu'au moment
+  de l'utiliser (parfois après une CV de plusieurs minutes).
+- En notebook / worker d'API, construire un use case re-parsait tout.
+
+À quoi ça sert réellement ?
+- Transformer les YAML en dataclasses FIGÉES et typées, validées au
+  chargement (clé manquante, type ou valeur invalide -> ConfigError avec
+  le fichier et la clé).
+- Mémoïser par (chemin, mtime) : relire une config inchangée ne coûte
+  qu'un stat() par fichier ; un YAML modifié est rechargé automatiquement.
+- Les valeurs par défaut des clés optionnelles sont définies ICI, une seule
+  fois (plus de `.get(..., défaut)` dispersés).
+- Les configs mémoïsées sont partagées : leurs mappings sont en lecture
+  seule (MappingProxyType, listes -> tuples) ; `ModelsConfig.model_params`
+  rend une copie modifiable.
+
+Très utile ?
+OUI. Une config invalide échoue au démarrage, et les builders sont gratuits.
+"""
+
+from __future__ import annotations
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, TypeVar
+
+from fertilizer_recommender.infrastructure.utils.config_loader import ConfigError, load_yaml_config
+
+T = TypeVar("T")
+
+_REQUIRED = object()
+PREPROCESSING_PROFILES = ("one_hot", "native")
+DATA_FORMATS = ("csv", "parquet")
+
+
+def _frozen(value: Any) -> Any:
+    """Copie en lecture seule (récursive) d'une valeur YAML."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _frozen(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(item) for item in value)
+    return value
+
+
+def _thawed(value: Any) -> Any:
+    """Copie modifiable d'une valeur figée par `_frozen` (YAML n'a pas de tuples)."""
+    if isinstance(value, Mapping):
+        return {key: _thawed(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thawed(item) for item in value]
+    return value
+
+
+def _empty_mapping() -> Mapping[str, Any]:
+    return MappingProxyType({})
+
+
+# ======================================================
+# Lecture validée d'une section
+# ======================================================
+
+class _Section:
+    """Section d'un YAML : lecture typée, erreurs localisées (fichier + clé)."""
+
+    def __init__(self, data: Any, source: str):
+        if not isinstance(data, Mapping):
+            raise ConfigError(f"{source} : section attendue (clé: valeur), reçu {type(data).__name__}")
+        self.data = data
+        self.source = source
+
+    def section(self, key: str, required: bool = True) -> "_Section":
+        if key not in self.data:
+            if required:
+                raise ConfigError(f"{self.source} : clé manquante '{key}'")
+            return _Section({}, self._child(key))
+        return _Section(self.data[key], self._child(key))
+
+    def _child(self, key: str) -> str:
+        # "training.yaml:" (racine) -> "training.yaml:training" -> "training.yaml:training.n_splits"
+        return f"{self.source}{key}" if self.source.endswith(":") else f"{self.source}.{key}"
+
+    def get(self, key: str, kind: type, default: Any = _REQUIRED, optional: bool = False) -> Any:
+        """
+        kind : type attendu (int accepté pour float ; bool refusé pour int).
+        optional : null accepté (retourne None).
+        """
+        if key not in self.data:
+            if default is _REQUIRED:
+                raise ConfigError(f"{self.source} : clé manquante '{key}'")
+            return default
+
+        value = self.data[key]
+        if value is None and optional:
+            return None
+        if kind is float and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        if kind is Path and isinstance(value, str):
+            return Path(value)
+        if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            raise ConfigError(
+                f"{self._child(key)} : {kind.__name__} attendu, reçu {value!r}"
+            )
+        return value
+
+    def check(self, condition: bool, key: str, message: str) -> None:
+        if not condition:
+            raise ConfigError(f"{self._child(key)} : {message} (reçu {self.data.get(key)!r})")
+
+
+# ======================================================
+# training.yaml
+# ======================================================
+
+@dataclass(frozen=True)
+class ProjectConfig:
+    name: str
+    seed: int
+
+
+@dataclass(frozen=True)
+class PathsConfig:
+    data_raw_dir: Path
+    data_processed_dir: Path
+    artifacts_dir: Path
+    models_dir: Path
+    oof_dir: Path
+    reports_dir: Path
+    checkpoints_dir: Path
+
+
+@dataclass(frozen=True)
+class DataConfig:
+    train_file: str
+    test_file: str
+    target_col: str
+    id_col: str
+    format: str = "csv"
+    train_parquet_file: str = "train.parquet"
+    test_parquet_file: str = "test.parquet"
+
+
+@dataclass(frozen=True)
+class TrainingConfig:
+    n_splits: int
+    top_k: int
+    fold_workers: int = 1
+    threads_per_worker: Optional[int] = None
+    precompute_features: bool = False
+    save_oof: bool = False
+    early_stopping: bool = False
+    final_iteration_scale: float = 1.0
+    booster_dataset_cache: int = 0
+    compact_duplicates: bool = False
+    checkpoint_folds: bool = False
+    sweep_model_workers: int = 1
+
+
+def _parse_training(data: Any, source: str) -> Tuple[ProjectConfig, PathsConfig, DataConfig, TrainingConfig]:
+    root = _Section(data, source)
+
+    s = root.section("project")
+    project = ProjectConfig(name=s.get("name", str, default="fertilizer_recommender"), seed=s.get("seed", int))
+
+    s = root.section("paths")
+    paths = PathsConfig(
+        data_raw_dir=s.get("data_raw_dir", Path),
+        data_processed_dir=s.get("data_processed_dir", Path),
+        artifacts_dir=s.get("artifacts_dir", Path),
+        models_dir=s.get("models_dir", Path),
+        oof_dir=s.get("oof_dir", Path, default=Path("artifacts/oof")),
+        reports_dir=s.get("reports_dir", Path, default=Path("artifacts/reports")),
+        checkpoints_dir=s.get("checkpoints_dir", Path, default=Path("artifacts/checkpoints")),
+    )
+
+    s = root.section("data")
+    data_cfg = DataConfig(
+        train_file=s.get("train_file", str),
+        test_file=s.get("test_file", str),
+        target_col=s.get("target_col", str),
+        id_col=s.get("id_col", str),
+        format=s.get("format", str, default=DataConfig.format),
+        train_parquet_file=s.get("train_parquet_file", str, default=DataConfig.train_parquet_file),
+        test_parquet_file=s.get("test_parquet_file", str, default=DataConfig.test_parquet_file),
+    )
+    s.check(data_cfg.format in DATA_FORMATS, "format", f"valeurs possibles : {', '.join(DATA_FORMATS)}")
+
+    s = root.section("training")
+    training = TrainingConfig(
+        n_splits=s.get("n_splits", int),
+        top_k=s.get("top_k", int),
+        fold_workers=s.get("fold_workers", int, default=1),
+        threads_per_worker=s.get("threads_per_worker", int, default=None, optional=True),
+        precompute_features=s.get("precompute_features", bool, default=False),
+        save_oof=s.get("save_oof", bool, default=False),
+        early_stopping=s.get("early_stopping", bool, default=False),
+        final_iteration_scale=s.get("final_iteration_scale", float, default=1.0),
+        booster_dataset_cache=s.get("booster_dataset_cache", int, default=0),
+        compact_duplicates=s.get("compact_duplicates", bool, default=False),
+        checkpoint_folds=s.get("checkpoint_folds", bool, default=False),
+        sweep_model_workers=s.get("sweep_model_workers", int, default=1),
+    )
+    s.check(training.n_splits >= 2, "n_splits", ">= 2 attendu")
+    s.check(training.top_k >= 1, "top_k", ">= 1 attendu")
+    s.check(training.fold_workers >= 1, "fold_workers", ">= 1 attendu")
+    s.check(
+        training.threads_per_worker is None or training.threads_per_worker >= 1,
+        "threads_per_worker", "null ou >= 1 attendu",
+    )
+    s.check(training.final_iteration_scale > 0, "final_iteration_scale", "> 0 attendu")
+    s.check(training.booster_dataset_cache >= 0, "booster_dataset_cache", ">= 0 attendu")
+    s.check(training.sweep_model_workers >= 1, "sweep_model_workers", ">= 1 attendu")
+
+    return project, paths, data_cfg, training
+
+
+# ======================================================
+# features.yaml / models.yaml / mlflow.yaml
+# ======================================================
+
+@dataclass(frozen=True)
+class FeaturesConfig:
+    enable_ratios: bool
+    enable_interactions: bool
+    enable_transforms: bool = False
+    default_profile: str = "one_hot"
+    model_profiles: Mapping[str, str] = field(default_factory=_empty_mapping)
+
+    def profile(self, model_name: Optional[str] = None) -> str:
+        """"one_hot" (scaling + one-hot) ou "native" (numériques brutes + codes)."""
+        return self.model_profiles.get(model_name, self.default_profile)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Contenu sérialisable (clé de checkpoint, params de run)."""
+        return {
+            "enable_ratios": self.enable_ratios,
+            "enable_interactions": self.enable_interactions,
+            "enable_transforms": self.enable_transforms,
+            "default_profile": self.default_profile,
+            "model_profiles": dict(self.model_profiles),
+        }
+
+
+def _parse_features(data: Any, source: str) -> FeaturesConfig:
+    root = _Section(data, source)
+
+    s = root.section("feature_engineering")
+    enable_ratios = s.get("enable_ratios", bool)
+    enable_interactions = s.get("enable_interactions", bool)
+    enable_transforms = s.get("enable_transforms", bool, default=False)
+
+    s = root.section("preprocessing", required=False)
+    default_profile = s.get("default", str, default="one_hot")
+    s.check(default_profile in PREPROCESSING_PROFILES, "default", f"valeurs possibles : {', '.join(PREPROCESSING_PROFILES)}")
+
+    models = s.section("models", required=False)
+    model_profiles = {}
+    for model_name in models.data:
+        profile = models.get(model_name, str)
+        models.check(profile in PREPROCESSING_PROFILES, model_name, f"valeurs possibles : {', '.join(PREPROCESSING_PROFILES)}")
+        model_profiles[model_name] = profile
+
+    return FeaturesConfig(
+        enable_ratios=enable_ratios,
+        enable_interactions=enable_interactions,
+        enable_transforms=enable_transforms,
+        default_profile=default_profile,
+        model_profiles=MappingProxyType(model_profiles),
+    )
+
+
+@dataclass(frozen=True)
+class ModelsConfig:
+    """Hyperparamètres libres par modèle (propres à chaque librairie)."""
+
+    params: Mapping[str, Mapping[str, Any]] = field(default_factory=_empty_mapping, repr=False)
+
+    def model_params(self, model_name: str) -> Dict[str, Any]:
+        """Copie modifiable : la config mémoïsée reste partagée et intacte."""
+        return _thawed(self.params.get(model_name, {}))
+
+
+def _parse_models(data: Any, source: str) -> ModelsConfig:
+    root = _Section(data, source)
+    params = {}
+    for model_name in root.data:
+        params[model_name] = root.section(model_name).data
+    return ModelsConfig(params=_frozen(params))
+
+
+@dataclass(frozen=True)
+class TrackingBufferConfig:
+    enabled: bool = True
+    max_batch_size: int = 1000
+    flush_interval_s: float = 2.0
+
+
+@dataclass(frozen=True)
+class MLflowConfig:
+    tracking_uri: str
+    experiment_name: str
+    tags: Mapping[str, str] = field(default_factory=_empty_mapping)
+    buffering: TrackingBufferConfig = TrackingBufferConfig()
+
+
+def _parse_mlflow(data: Any, source: str) -> MLflowConfig:
+    s = _Section(data, source).section("mlflow")
+
+    b = s.section("buffering", required=False)
+    buffering = TrackingBufferConfig(
+        enabled=b.get("enabled", bool, default=TrackingBufferConfig.enabled),
+        max_batch_size=b.get("max_batch_size", int, default=TrackingBufferConfig.max_batch_size),
+        flush_interval_s=b.get("flush_interval_s", float, default=TrackingBufferConfig.flush_interval_s),
+    )
+    b.check(buffering.max_batch_size >= 1, "max_batch_size", ">= 1 attendu")
+    b.check(buffering.flush_interval_s > 0, "flush_interval_s", "> 0 attendu")
+
+    return MLflowConfig(
+        tracking_uri=s.get("tracking_uri", str),
+        experiment_name=s.get("experiment_name", str),
+        tags=MappingProxyType(
+            {str(k): str(v) for k, v in s.section("tags", required=False).data.items()}
+        ),
+        buffering=buffering,
+    )
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    project: ProjectConfig
+    paths: PathsConfig
+    data: DataConfig
+    training: TrainingConfig
+    features: FeaturesConfig
+    models: ModelsConfig
+    mlflow: MLflowConfig
+
+
+# ======================================================
+# inference.yaml
+# ======================================================
+
+@dataclass(frozen=True)
+class SubmissionConfig:
+    batch_size: int = 100_000
+    prefetch: bool = True
+
+
+@dataclass(frozen=True)
+class DedupConfig:
+    enabled: bool = False
+    min_ratio: float = 1.05
+
+
+@dataclass(frozen=True)
+class ApiConfig:
+    model_name: str
+    max_batch_size: int = 128
+    max_wait_ms: float = 2.0
+    n_threads: int = 4
+    compiled: bool = False
+
+
+@dataclass(frozen=True)
+class ModelCacheConfig:
+    max_mb: float = 2048.0
+    mmap_mode: Optional[str] = None
+    load_workers: int = 1
+
+
+@dataclass(frozen=True)
+class EnsembleConfig:
+    n_workers: int = 1
+    thread_budget: Optional[int] = None
+    blend_config: Path = Path("configs/blend_weights.yaml")
+
+
+@dataclass(frozen=True)
+class InferenceConfig:
+    submission: SubmissionConfig
+    dedup: DedupConfig
+    api: Optional[ApiConfig]
+    model_cache: ModelCacheConfig
+    ensemble: EnsembleConfig
+
+
+def _parse_inference(data: Any, source: str) -> InferenceConfig:
+    root = _Section(data, source)
+
+    s = root.section("submission", required=False)
+    submission = SubmissionConfig(
+        batch_size=s.get("batch_size", int, default=SubmissionConfig.batch_size),
+        prefetch=s.get("prefetch", bool, default=SubmissionConfig.prefetch),
+    )
+    s.check(submission.batch_size >= 1, "batch_size", ">= 1 attendu")
+
+    s = root.section("dedup", required=False)
+    dedup = DedupConfig(
+        enabled=s.get("enabled", bool, default=DedupConfig.enabled),
+        min_ratio=s.get("min_ratio", float, default=DedupConfig.min_ratio),
+    )
+    s.check(dedup.min_ratio >= 1.0, "min_ratio", ">= 1 attendu")
+
+    # api absent : pas de serveur (submission / ensemble seulement)
+    api = None
+    if "api" in root.data:
+        s = root.section("api")
+        api = ApiConfig(
+            model_name=s.get("model_name", str),
+            max_batch_size=s.get("max_batch_size", int, default=ApiConfig.max_batch_size),
+            max_wait_ms=s.get("max_wait_ms", float, default=ApiConfig.max_wait_ms),
+            n_threads=s.get("n_threads", int, default=ApiConfig.n_threads),
+            compiled=s.get("compiled", bool, default=ApiConfig.compiled),
+        )
+        s.check(api.max_batch_size >= 1, "max_batch_size", ">= 1 attendu")
+        s.check(api.n_threads >= 1, "n_threads", ">= 1 attendu")
+
+    s = root.section("model_cache", required=False)
+    model_cache = ModelCacheConfig(
+        max_mb=s.get("max_mb", float, default=ModelCacheConfig.max_mb),
+        mmap_mode=s.get("mmap_mode", str, default=None, optional=True),
+        load_workers=s.get("load_workers", int, default=ModelCacheConfig.load_workers),
+    )
+    s.check(model_cache.mmap_mode in (None, "r", "r+", "c"), "mmap_mode", "null, r, r+ ou c attendu")
+    s.check(model_cache.load_workers >= 1, "load_workers", ">= 1 attendu")
+
+    s = root.section("ensemble", required=False)
+    ensemble = EnsembleConfig(
+        n_workers=s.get("n_workers", int, default=EnsembleConfig.n_workers),
+        thread_budget=s.get("thread_budget", int, default=None, optional=True),
+        blend_config=s.get("blend_config", Path, default=EnsembleConfig.blend_config),
+    )
+    s.check(ensemble.n_workers >= 1, "n_workers", ">= 1 attendu")
+
+    return InferenceConfig(
+        submission=submission,
+        dedup=dedup,
+        api=api,
+        model_cache=model_cache,
+        ensemble=ensemble,
+    )
+
+
+# ======================================================
+# Chargement mémoïsé (chemin + mtime)
+# ======================================================
+
+_CACHE: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+_ASSEMBLED: Dict[Tuple[str, ...], Tuple[tuple, AppConfig]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _load_cached(path: str | Path, parser: Callable[[Any, str], T]) -> T:
+    """Parse + valide un YAML, ou retourne le résultat mémoïsé si le fichier n'a pas changé."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        raise ConfigError(f"Config introuvable: {path}") from None
+
+    key = (os.path.abspath(path), parser.__name__)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    value = parser(load_yaml_config(path), f"{Path(path).name}:")
+    with _CACHE_LOCK:
+        _CACHE[key] = (mtime_ns, value)
+    return value
+
+
+def load_app_config(
+    training_cfg: str | Path = "configs/training.yaml",
+    models_cfg: str | Path = "configs/models.yaml",
+    features_cfg: str | Path = "configs/features.yaml",
+    mlflow_cfg: str | Path = "configs/mlflow.yaml",
+) -> AppConfig:
+    """
+    Même objet retourné tant qu'aucun des fichiers n'a changé
+    (l'identité permet de détecter un rechargement).
+    """
+    sources = tuple(os.path.abspath(p) for p in (training_cfg, models_cfg, features_cfg, mlflow_cfg))
+    parts = (
+        _load_cached(training_cfg, _parse_training),
+        _load_cached(models_cfg, _parse_models),
+        _load_cached(features_cfg, _parse_features),
+        _load_cached(mlflow_cfg, _parse_mlflow),
+    )
+
+    with _CACHE_LOCK:
+        cached = _ASSEMBLED.get(sources)
+        if cached is not None and all(a is b for a, b in zip(cached[0], parts)):
+            return cached[1]
+
+    (project, paths, data, training), models, features, mlflow = parts
+    config = AppConfig(
+        project=project,
+        paths=paths,
+        data=data,
+        training=training,
+        features=features,
+        models=models,
+        mlflow=mlflow,
+    )
+    with _CACHE_LOCK:
+        _ASSEMBLED[sources] = (parts, config)
+    return config
+
+
+def load_inference_config(path: str | Path = "configs/inference.yaml") -> InferenceConfig:
+    return _load_cached(path, _parse_inference)
+
+
+def clear_config_cache() -> None:
+    """Force la relecture des YAML (tests, fichiers modifiés sans changer de mtime)."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _ASSEMBLED.clear()
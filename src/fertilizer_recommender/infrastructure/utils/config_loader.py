@@ -4,7 +4,7 @@ config_loader.py
 Pourquoi ce fichier existe ?
 - Charger les fichiers YAML de manière standardisée.
 - Éviter de relire YAML différemment dans chaque notebook ou script.
-- Préparer la transition vers des dataclasses (plus robuste qu'un dict libre).
+- Brique de base de app_config.py (dataclasses typées, validées, mémoïsées).
 
 À quoi ça sert réellement ?
 - Tous les points d'entrée (CLI, notebooks) lisent training.yaml via cette fonction.
@@ -51,3 +51,17 @@ def load_yaml_config(path: str | Path) -> Dict[str, Any]:
         raise ConfigError(f"Config vide: {path}")
 
     return data
+
+
+def save_yaml_config(data: Dict[str, Any], path: str | Path) -> Path:
+    """
+    Écrit un dictionnaire en YAML (ex: poids d'ensemble générés).
+
+    Returns:
+        Path: chemin écrit (dossier créé si besoin)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
+    return path
@@ -0,0 +1,114 @@
+"""
+import_budget.py
+
+Pourquoi ce fichier existe ?
+- Le temps de démarrage des commandes CLI et des workers d'API dépend
+  surtout des imports : un import lourd (sklearn, lightgbm, xgboost,
+  catboost, mlflow) remonté en tête de module le fait régresser sans bruit.
+
+À quoi ça sert ?
+- Mesurer, chacun dans un interpréteur NEUF (sys.modules vide) :
+    - le temps d'import d'un module (package, composition root),
+    - le temps d'un `python -m <module> --help` (démarrage compris).
+- Relever les librairies lourdes chargées par ces imports / ce --help.
+- Utilisé par tests/test_import_budget.py (gate CI) et par la CLI
+  presentation/cli/import_budget.py (simple affichage).
+"""
+
+from __future__ import annotations
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+# Librairies dont l'import coûte ~1 s ou plus : chargées au premier usage seulement
+HEAVY_MODULES = ("sklearn", "lightgbm", "xgboost", "catboost", "mlflow")
+
+# Budgets par défaut (ms, meilleur de `repeats` mesures), marge incluse
+DEFAULT_IMPORT_BUDGETS: Dict[str, float] = {
+    "fertilizer_recommender": 100.0,
+    "fertilizer_recommender.composition_root_complete": 1500.0,
+}
+DEFAULT_HELP_BUDGET_MS = 1500.0
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"elapsed_ms": elapsed_ms, "heavy": heavy}}))
+"""
+
+# Même chose que `python -m module --help` (runpy), avec les modules chargés en sortie
+_HELP_PROBE = """
+import json, runpy, sys, time
+start = time.perf_counter()
+sys.argv = [{module!r}, "--help"]
+try:
+    runpy.run_module({module!r}, run_name="__main__", alter_sys=True)
+except SystemExit as exc:
+    if exc.code not in (0, None):
+        raise
+elapsed_ms = (time.perf_counter() - start) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"elapsed_ms": elapsed_ms, "heavy": heavy}}))
+"""
+
+
+@dataclass(frozen=True)
+class BudgetResult:
+    check: str
+    elapsed_ms: float
+    budget_ms: float
+    heavy_loaded: Tuple[str, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return self.elapsed_ms <= self.budget_ms and not self.heavy_loaded
+
+
+def _probe(code: str, repeats: int) -> Tuple[float, Tuple[str, ...]]:
+    # Le package mesuré est celui-ci, installé ou non (src/ en tête du PYTHONPATH)
+    package_root = str(Path(__file__).resolve().parents[3])
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+    best, heavy = float("inf"), ()
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+        )
+        payload = json.loads(completed.stdout.strip().splitlines()[-1])
+        best = min(best, payload["elapsed_ms"])
+        heavy = tuple(payload["heavy"])
+    return best, heavy
+
+
+def measure_import(module: str, repeats: int = 3) -> Tuple[float, Tuple[str, ...]]:
+    """Meilleur temps d'import (ms) + librairies lourdes chargées, interpréteur neuf."""
+    return _probe(_IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES), repeats)
+
+
+def measure_help(module: str, repeats: int = 3) -> Tuple[float, Tuple[str, ...]]:
+    """Meilleur temps (ms) de `python -m module --help` + librairies lourdes chargées."""
+    return _probe(_HELP_PROBE.format(module=module, heavy=HEAVY_MODULES), repeats)
+
+
+def run(
+    import_budgets: Dict[str, float],
+    help_modules: Sequence[str] = (),
+    help_budget_ms: float = DEFAULT_HELP_BUDGET_MS,
+    repeats: int = 3,
+) -> List[BudgetResult]:
+    results = []
+    for module, budget_ms in import_budgets.items():
+        elapsed_ms, heavy = measure_import(module, repeats)
+        results.append(BudgetResult(f"import {module}", elapsed_ms, budget_ms, heavy))
+    for module in help_modules:
+        elapsed_ms, heavy = measure_help(module, repeats)
+        results.append(BudgetResult(f"{module} --help", elapsed_ms, help_budget_ms, heavy))
+    return results
@@ -0,0 +1,83 @@
+"""
+plugin_registry.py
+
+Pourquoi ce fichier existe ?
+- catboost, lightgbm, xgboost, sklearn et mlflow coûtent chacun 1 à 3 s
+  d'import. Importés en tête de la composition root, ils sont payés par
+  chaque commande CLI / worker d'API, même pour un seul modèle.
+- Choisir une implémentation par une chaîne if/elif oblige à importer
+  toutes les branches et à modifier la composition root pour en ajouter une.
+
+À quoi ça sert réellement ?
+- Enregistrer des implémentations PAR NOM, sous forme de chemin
+  "package.module:Attribut" (+ options déclaratives), sans rien importer.
+- Importer le module au premier `load(name)` seulement (puis mémoïsé).
+
+Très utile ?
+OUI pour le temps de démarrage, et pour brancher un modèle sans if/elif.
+"""
+
+from __future__ import annotations
+import importlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping
+
+
+@dataclass(frozen=True)
+class PluginSpec:
+    name: str
+    target: str  # "package.module:Attribut"
+    options: Mapping[str, Any] = field(default_factory=dict)
+
+
+class PluginRegistry:
+    def __init__(self, kind: str):
+        """
+        Args:
+            kind: nature des plugins (messages d'erreur), ex: "Modèle".
+        """
+        self.kind = kind
+        self._specs: Dict[str, PluginSpec] = {}
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, target: str, **options: Any) -> PluginSpec:
+        """Enregistre (ou remplace) un plugin, sans l'importer."""
+        module_name, _, attribute = target.partition(":")
+        if not module_name or not attribute:
+            raise ValueError(f"Cible de plugin invalide (attendu 'module:Attribut'): {target}")
+
+        spec = PluginSpec(name=name, target=target, options=dict(options))
+        with self._lock:
+            self._specs[name] = spec
+            self._loaded.pop(name, None)
+        return spec
+
+    def names(self) -> List[str]:
+        return sorted(self._specs)
+
+    def spec(self, name: str) -> PluginSpec:
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise ValueError(
+                f"{self.kind} inconnu: {name} (disponibles: {', '.join(self.names())})"
+            ) from None
+
+    def load(self, name: str) -> Any:
+        """Importe (au premier appel) et retourne l'attribut enregistré."""
+        if name in self._loaded:
+            return self._loaded[name]
+
+        module_name, _, attribute = self.spec(name).target.partition(":")
+        loaded = getattr(importlib.import_module(module_name), attribute)
+        with self._lock:
+            self._loaded[name] = loaded
+        return loaded
+
+    def create(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        return self.load(name)(*args, **kwargs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
@@ -0,0 +1,159 @@
+"""
+fastapi_app.py
+
+Pourquoi ce fichier existe ?
+- Scorer des requêtes en ligne sans passer par un notebook.
+
+À quoi ça sert réellement ?
+- Charger le pipeline UNE fois au démarrage (JoblibModelRepository).
+- POST /predict       : une observation ; les requêtes concurrentes sont
+                        regroupées en micro-batchs (voir micro_batching.py).
+- POST /predict/batch : plusieurs observations, un seul predict_proba.
+- GET  /health        : modèle chargé, classes, politique de batching.
+- Le calcul tourne dans un pool de threads : la boucle asyncio ne bloque jamais.
+
+Lancement :
+    uvicorn fertilizer_recommender.presentation.api.fastapi_app:app
+    python -m fertilizer_recommender.presentation.api.load_test   # charge locale
+
+Très utile ?
+OUI. C'est le point d'entrée de l'inférence en ligne.
+"""
+
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from pydantic import BaseModel, Field
+
+from fertilizer_recommender.application.dto.predict_request import PredictRequest
+from fertilizer_recommender.application.use_cases.predict_topk import PredictTopKUseCase
+from fertilizer_recommender.infrastructure.utils.app_config import load_inference_config
+from fertilizer_recommender.infrastructure.utils.config_loader import ConfigError
+from fertilizer_recommender.presentation.api.micro_batching import MicroBatcher
+
+
+# ======================================================
+# Schémas HTTP (validation) -> DTO applicatifs
+# ======================================================
+
+class PredictBody(BaseModel):
+    features: Dict[str, Any] = Field(
+        ..., description="Colonnes brutes de test.csv (hors id)"
+    )
+
+
+class BatchPredictBody(BaseModel):
+    records: List[Dict[str, Any]] = Field(..., min_length=1)
+
+
+class PredictionOut(BaseModel):
+    labels: List[str]
+    probabilities: List[float]
+    prediction: str = Field(..., description="Format Kaggle : labels séparés par un espace")
+
+
+class BatchPredictionOut(BaseModel):
+    predictions: List[PredictionOut]
+
+
+def _to_out(response) -> PredictionOut:
+    return PredictionOut(
+        labels=response.labels,
+        probabilities=response.probabilities,
+        prediction=response.as_kaggle_string(),
+    )
+
+
+# ======================================================
+# Application
+# ======================================================
+
+def create_app(
+    predictor: Optional[PredictTopKUseCase] = None,
+    inference_cfg: str = "configs/inference.yaml",
+) -> FastAPI:
+    """
+    Args:
+        predictor: PredictTopKUseCase déjà construit (sinon chargé au
+            démarrage depuis `api.model_name` de la config d'inférence)
+        inference_cfg: chemin de configs/inference.yaml
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        api_cfg = load_inference_config(inference_cfg).api
+        if api_cfg is None:
+            raise ConfigError(f"Section 'api' absente de {inference_cfg}")
+
+        if predictor is None:
+            # import local : la composition root charge toute l'infra ML
+            from fertilizer_recommender.composition_root_complete import (
+                build_inference_predictor,
+            )
+            app.state.predictor = build_inference_predictor(
+                api_cfg.model_name, inference_cfg=inference_cfg
+            )
+        else:
+            app.state.predictor = predictor
+
+        app.state.executor = ThreadPoolExecutor(
+            max_workers=api_cfg.n_threads, thread_name_prefix="predict"
+        )
+        app.state.batcher = MicroBatcher(
+            predict_batch=app.state.predictor.predict,
+            executor=app.state.executor,
+            max_batch_size=api_cfg.max_batch_size,
+            max_wait_ms=api_cfg.max_wait_ms,
+            max_concurrent_batches=api_cfg.n_threads,
+        )
+        await app.state.batcher.start()
+        try:
+            yield
+        finally:
+            await app.state.batcher.stop()
+            app.state.executor.shutdown(wait=True)
+
+    app = FastAPI(title="Fertilizer Recommender", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health(request: Request) -> Dict[str, Any]:
+        state = request.app.state
+        return {
+            "status": "ok",
+            "classes": [str(c) for c in state.predictor.pipeline.classes_],
+            "top_k": state.predictor.k,
+            "max_batch_size": state.batcher.max_batch_size,
+            "max_wait_ms": state.batcher.max_wait * 1000.0,
+        }
+
+    @app.post("/predict", response_model=PredictionOut)
+    async def predict(body: PredictBody, request: Request) -> PredictionOut:
+        try:
+            response = await request.app.state.batcher.submit(
+                PredictRequest(features=body.features)
+            )
+        except (KeyError, ValueError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        return _to_out(response)
+
+    @app.post("/predict/batch", response_model=BatchPredictionOut)
+    async def predict_batch(body: BatchPredictBody, request: Request) -> BatchPredictionOut:
+        # Déjà un batch : pas de micro-batching, un seul predict_proba dans le pool
+        state = request.app.state
+        requests = [PredictRequest(features=record) for record in body.records]
+        try:
+            responses = await asyncio.get_running_loop().run_in_executor(
+                state.executor, state.predictor.predict, requests
+            )
+        except (KeyError, ValueError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        return BatchPredictionOut(predictions=[_to_out(r) for r in responses])
+
+    return app
+
+
+app = create_app()
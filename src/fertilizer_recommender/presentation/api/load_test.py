@@ -0,0 +1,84 @@
+"""
+load_test.py
+
+Pourquoi ce fichier existe ?
+- Vérifier localement le débit / la latence de l'API, et l'effet du
+  micro-batching, sans outil externe (stdlib uniquement).
+
+À quoi ça sert ?
+- Envoyer N requêtes POST /predict avec C clients concurrents,
+  des lignes tirées de test.csv.
+- Afficher débit (req/s) et latences p50 / p95 / p99.
+
+Usage :
+    uvicorn fertilizer_recommender.presentation.api.fastapi_app:app --port 8000
+    python -m fertilizer_recommender.presentation.api.load_test \
+        --url http://127.0.0.1:8000 --requests 2000 --concurrency 64
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+def _post(url: str, payload: Dict[str, Any]) -> float:
+    data = json.dumps(payload).encode()
+    request = urllib.request.Request(
+        url, data=data, headers={"Content-Type": "application/json"}, method="POST"
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def load_records(test_csv: str, id_col: str, n: int) -> List[Dict[str, Any]]:
+    df = pd.read_csv(test_csv, nrows=n).drop(columns=[id_col], errors="ignore")
+    # json natif : pas de types NumPy dans la charge utile
+    return json.loads(df.to_json(orient="records"))
+
+
+def run(url: str, records: List[Dict[str, Any]], n_requests: int, concurrency: int) -> Dict[str, float]:
+    endpoint = url.rstrip("/") + "/predict"
+    payloads = [{"features": records[i % len(records)]} for i in range(n_requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.array(list(pool.map(lambda p: _post(endpoint, p), payloads)))
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(latencies * 1000.0, [50, 95, 99])
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "throughput_rps": n_requests / elapsed,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Test de charge local de l'API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--test-csv", default="data/raw/test.csv")
+    parser.add_argument("--id-col", default="id")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    records = load_records(args.test_csv, args.id_col, n=min(args.requests, 10_000))
+    stats = run(args.url, records, args.requests, args.concurrency)
+    for name, value in stats.items():
+        print(f"{name:>15}: {value:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+micro_batching.py
+
+Pourquoi ce fichier existe ?
+- Un predict_proba coûte quasiment le même prix pour 1 ligne ou pour 256 :
+  l'essentiel est un surcoût fixe (pandas, sklearn, booster).
+- Sous charge, l'API reçoit beaucoup de requêtes unitaires concurrentes.
+
+À quoi ça sert ?
+- Regrouper les requêtes unitaires concurrentes en micro-batchs
+  (politique max_batch_size / max_wait_ms) avant UN seul appel de prédiction.
+- Exécuter ce calcul dans un pool de threads : la boucle asyncio ne bloque jamais.
+
+Très utile ?
+OUI dès qu'il y a de la concurrence : le débit est multiplié par ~la taille
+moyenne des batchs, pour une latence ajoutée bornée par max_wait_ms.
+"""
+
+from __future__ import annotations
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Regroupe des appels unitaires `submit(item)` en appels `predict_batch(items)`.
+
+    - Un batch part dès qu'il atteint `max_batch_size`, ou `max_wait_ms` après
+      l'arrivée de son premier élément.
+    - Au plus `max_concurrent_batches` batchs sont calculés en même temps.
+    - `predict_batch` doit retourner un résultat par élément, dans l'ordre.
+    - `stop()` n'abandonne aucune requête : la file et le batch en cours de
+      constitution sont calculés (ou reçoivent l'exception du calcul) avant
+      le retour ; les `submit` suivants sont refusés.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[Sequence[T]], List[R]],
+        executor: Executor,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_concurrent_batches: int = 1,
+    ):
+        self.predict_batch = predict_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrent_batches = max_concurrent_batches
+        self.logger = logger
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._inflight: set = set()
+        # Batch en cours de constitution (récupéré par stop() si le collecteur est annulé)
+        self._collecting: List[Tuple[T, "asyncio.Future[Any]"]] = []
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._collecting = []
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+        self._worker = asyncio.create_task(self._collect_forever())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        # Requêtes non encore parties : batch partiel + file, calculées par batchs
+        pending, self._collecting = self._collecting, []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            self.logger.info(f"Arrêt du micro-batching : {len(pending)} requêtes en attente calculées")
+        for start in range(0, len(pending), self.max_batch_size):
+            await self._dispatch(pending[start:start + self.max_batch_size])
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def submit(self, item: T) -> R:
+        if self._queue is None:
+            raise RuntimeError("MicroBatcher non démarré (appeler start()).")
+        if self._stopping:
+            raise RuntimeError("MicroBatcher arrêté.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._collecting = []
+            batch.append(await self._queue.get())
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(batch)
+            self._collecting = []
+
+    async def _dispatch(self, batch: List[Tuple[T, "asyncio.Future[Any]"]]) -> None:
+        # Backpressure : tant que tous les slots de calcul sont pris, les
+        # requêtes s'accumulent dans la file et le prochain batch grossit.
+        await self._slots.acquire()
+        task = asyncio.create_task(self._run_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: List[Tuple[T, "asyncio.Future[Any]"]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.predict_batch, items)
+            except Exception as exc:
+                if len(batch) == 1:
+                    if not batch[0][1].done():
+                        batch[0][1].set_exception(exc)
+                    return
+                # Une requête invalide ne doit pas faire échouer ses voisines :
+                # on rejoue le batch élément par élément pour isoler l'erreur.
+                self.logger.warning(
+                    f"Micro-batch de {len(items)} requêtes en échec ({exc!r}), "
+                    "repli requête par requête"
+                )
+                await asyncio.gather(*(self._run_single(item, future) for item, future in batch))
+                return
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():  # client éventuellement parti
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+    async def _run_single(self, item: T, future: "asyncio.Future[Any]") -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = (await loop.run_in_executor(self.executor, self.predict_batch, [item]))[0]
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+            return
+        if not future.done():
+            future.set_result(result)
@@ -0,0 +1,158 @@
+"""
+benchmark_matrix_layout.py
+
+Pourquoi ce fichier existe ?
+- Mesurer ce que coûtent les conversions de matrice entre le preprocessing
+  et le modèle (sparse -> dense, float64 -> float32, ordre mémoire), avant /
+  après le contrat de sortie `MatrixLayout`.
+
+À quoi ça sert ?
+- Pour chaque modèle : TrainingPipeline.fit puis predict_proba répétés,
+  avec l'ancien transformer (sortie brute du ColumnTransformer) et le
+  transformer actuel (format du modèle + buffers réutilisés).
+- Afficher temps et pic de mémoire Python (tracemalloc : allocations NumPy,
+  donc les copies de matrice), exprimé aussi en "copies" d'une matrice
+  dense float32 de même forme.
+
+Usage :
+    python -m fertilizer_recommender.presentation.cli.benchmark_matrix_layout \
+        --rows 200000 --repeats 5
+"""
+
+from __future__ import annotations
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from fertilizer_recommender.infrastructure.ml.models.baseline_logreg import BaselineLogisticRegression
+from fertilizer_recommender.infrastructure.ml.models.lightgbm_multiclass import LightGBMMulticlass
+from fertilizer_recommender.infrastructure.ml.models.xgboost_multiclass import XGBoostMulticlass
+from fertilizer_recommender.infrastructure.ml.pipelines.training_pipeline import TrainingPipeline
+from fertilizer_recommender.infrastructure.ml.preprocessors.feature_engineering import FeatureEngineer
+from fertilizer_recommender.infrastructure.ml.preprocessors.feature_pipeline import FeaturePipeline
+from fertilizer_recommender.infrastructure.ml.preprocessors.sklearn_transformer import SklearnFeatureTransformer
+
+NUMERIC = ["Temperature", "Humidity", "Moisture", "Nitrogen", "Potassium", "Phosphorous"]
+CATEGORICAL = ["Soil Type", "Crop Type"]
+
+
+class LegacySklearnTransformer:
+    """Transformer d'origine : sortie brute du ColumnTransformer (sans contrat)."""
+
+    def __init__(self, numeric_features, categorical_features):
+        self.transformer = ColumnTransformer(
+            transformers=[
+                ("num", StandardScaler(), numeric_features),
+                ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_features),
+            ]
+        )
+
+    def fit(self, df):
+        self.transformer.fit(df)
+        return self
+
+    def transform(self, df, reuse_buffer: bool = True):
+        return self.transformer.transform(df)
+
+    def fit_transform(self, df):
+        return self.transformer.fit_transform(df)
+
+
+def make_dataset(n_rows: int, seed: int = 42) -> Tuple[pd.DataFrame, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Temperature": rng.integers(20, 40, n_rows),
+        "Humidity": rng.integers(50, 73, n_rows),
+        "Moisture": rng.integers(25, 66, n_rows),
+        "Nitrogen": rng.integers(4, 43, n_rows),
+        "Potassium": rng.integers(0, 20, n_rows),
+        "Phosphorous": rng.integers(0, 43, n_rows),
+        "Soil Type": rng.choice(["Sandy", "Loamy", "Black", "Red", "Clayey"], n_rows),
+        "Crop Type": rng.choice(
+            ["Maize", "Sugarcane", "Cotton", "Tobacco", "Paddy", "Barley", "Wheat",
+             "Millets", "Oil seeds", "Pulses", "Ground Nuts"], n_rows
+        ),
+    })
+    return df, rng.integers(0, 7, n_rows)
+
+
+def _measure(fn: Callable[[], object]) -> Tuple[object, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def _build(model_factory: Callable[[], object], legacy: bool) -> TrainingPipeline:
+    engineer = FeatureEngineer(enable_ratios=True, enable_interactions=True, enable_transforms=False)
+    numeric = NUMERIC + engineer.feature_names
+    transformer = (
+        LegacySklearnTransformer(numeric, CATEGORICAL) if legacy
+        else SklearnFeatureTransformer(numeric, CATEGORICAL)
+    )
+    return TrainingPipeline(FeaturePipeline(engineer, transformer), model_factory())
+
+
+def run(n_rows: int, repeats: int, n_estimators: int) -> List[Dict[str, object]]:
+    df, y = make_dataset(n_rows)
+    X_fe = FeatureEngineer(enable_ratios=True, enable_interactions=True, enable_transforms=False).transform(df)
+
+    models = {
+        "logreg": lambda: BaselineLogisticRegression(),
+        "lightgbm": lambda: LightGBMMulticlass(n_estimators=n_estimators, verbosity=-1, n_jobs=1),
+        "xgboost": lambda: XGBoostMulticlass(n_estimators=n_estimators, tree_method="hist", n_jobs=1),
+    }
+
+    rows = []
+    for name, factory in models.items():
+        for legacy in (True, False):
+            pipeline = _build(factory, legacy)
+            _, fit_seconds, fit_peak = _measure(lambda: pipeline.fit(X_fe, y))
+
+            X_model = pipeline.transformer.transform(X_fe)
+            # Unité commune : une matrice dense float32 de même forme
+            f32_bytes = X_model.shape[0] * X_model.shape[1] * 4
+            pipeline.predict_proba(X_fe)  # échauffement (buffers alloués)
+
+            times, peaks = [], []
+            for _ in range(repeats):
+                _, seconds, peak = _measure(lambda: pipeline.predict_proba(X_fe))
+                times.append(seconds)
+                peaks.append(peak)
+
+            rows.append({
+                "model": name,
+                "path": "legacy" if legacy else "layout",
+                "input": f"{type(X_model).__name__}/{X_model.dtype}",
+                "fit_s": fit_seconds,
+                "fit_peak_mb": fit_peak / 2**20,
+                "fit_f32_copies": fit_peak / f32_bytes,
+                "predict_s": float(np.median(times)),
+                "predict_peak_mb": float(np.median(peaks)) / 2**20,
+                "predict_f32_copies": float(np.median(peaks)) / f32_bytes,
+            })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des conversions de matrice modèle")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--n-estimators", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = run(args.rows, args.repeats, args.n_estimators)
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+import_budget.py
+
+Pourquoi ce fichier existe ?
+- Afficher les temps d'import / de `--help` mesurés par
+  infrastructure/utils/import_budget.py (le gate CI est
+  tests/test_import_budget.py).
+
+À quoi ça sert ?
+- Diagnostic local : budgets, temps mesurés, librairies lourdes chargées.
+- Code de sortie 1 si un budget (ms) est dépassé ou une librairie lourde chargée.
+
+Usage :
+    python -m fertilizer_recommender.presentation.cli.import_budget
+    python -m fertilizer_recommender.presentation.cli.import_budget \
+        --help-module fertilizer_recommender.presentation.api.load_test --help-budget-ms 1500
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+
+from fertilizer_recommender.infrastructure.utils.import_budget import (
+    DEFAULT_HELP_BUDGET_MS,
+    DEFAULT_IMPORT_BUDGETS,
+    run,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Budget de temps d'import / démarrage")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0,
+        help="Multiplie les budgets (machine lente, CI partagée)",
+    )
+    parser.add_argument(
+        "--help-module", action="append", default=[],
+        help="Module CLI dont `python -m <module> --help` est chronométré (répétable)",
+    )
+    parser.add_argument("--help-budget-ms", type=float, default=DEFAULT_HELP_BUDGET_MS)
+    args = parser.parse_args()
+
+    budgets = {module: ms * args.budget_scale for module, ms in DEFAULT_IMPORT_BUDGETS.items()}
+    results = run(budgets, args.help_module, args.help_budget_ms * args.budget_scale, args.repeats)
+
+    for result in results:
+        status = "OK " if result.ok else "KO "
+        heavy = f"  lourds chargés: {', '.join(result.heavy_loaded)}" if result.heavy_loaded else ""
+        print(f"{status} {result.elapsed_ms:8.1f} ms / {result.budget_ms:8.1f} ms  {result.check}{heavy}")
+
+    sys.exit(0 if all(result.ok for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
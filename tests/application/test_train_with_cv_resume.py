@@ -0,0 +1,129 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import StratifiedKFold
+
+from fertilizer_recommender.application.use_cases.train_with_cv import TrainWithCVUseCase
+from fertilizer_recommender.domain.services.experiment_tracking_service import ExperimentTrackingService
+from fertilizer_recommender.infrastructure.repositories.cv_checkpoint_store_impl import (
+    JoblibCVCheckpointStore,
+)
+
+N_SPLITS = 4
+
+
+class FakeTracker:
+    """Tracker en mémoire : une liste de métriques par run_id."""
+
+    def __init__(self):
+        self.metrics = {}
+        self._active = None
+        self._n_runs = 0
+
+    def setup_experiment(self, name):
+        return "0"
+
+    def start_run(self, run_name=None, nested=False, run_id=None):
+        if run_id is None:
+            self._n_runs += 1
+            run_id = f"run-{self._n_runs}"
+        self._active = run_id
+        self.metrics.setdefault(run_id, [])
+
+    def active_run_id(self):
+        return self._active
+
+    def log_params(self, params):
+        pass
+
+    def log_metrics(self, metrics):
+        self.metrics[self._active].extend(metrics)
+
+    def log_artifact(self, path):
+        pass
+
+    def end_run(self):
+        self._active = None
+
+
+class Killed(Exception):
+    pass
+
+
+class PriorPipeline:
+    """Pipeline minimal : probabilités = fréquences des classes du train."""
+
+    def __init__(self, fits, kill_at):
+        self.fits, self.kill_at = fits, kill_at
+
+    def fit(self, X_df, y, eval_set=None):
+        self.fits.append(len(y))
+        if len(self.fits) == self.kill_at:
+            raise Killed
+        self.classes_, counts = np.unique(y, return_counts=True)
+        self.prior_ = counts / counts.sum()
+        return self
+
+    def predict_proba(self, X_df):
+        return np.tile(self.prior_, (len(X_df), 1))
+
+
+def _data(n=400):
+    rng = np.random.default_rng(0)
+    X_df = pd.DataFrame({"a": rng.normal(size=n), "b": rng.integers(0, 5, n)})
+    y = rng.choice(["DAP", "Urea", "28-28"], n)
+    return X_df, y
+
+
+def _use_case(tracker, checkpoint_dir, fits, kill_at=None):
+    return TrainWithCVUseCase(
+        experiment_service=ExperimentTrackingService(tracker),
+        splitter_factory=lambda: StratifiedKFold(N_SPLITS, shuffle=True, random_state=0),
+        pipeline_factory=lambda: PriorPipeline(fits, kill_at),
+        checkpoint_store=JoblibCVCheckpointStore(checkpoint_dir),
+    )
+
+
+def _execute(use_case, resume):
+    X_df, y = _data()
+    return use_case.execute(
+        X_df, y, experiment_name="exp", run_name="cv", params={"model": "prior"}, resume=resume,
+    )
+
+
+def test_resume_logs_each_fold_metric_exactly_once(tmp_path):
+    tracker = FakeTracker()
+
+    # 1re exécution tuée pendant le fold 3 : folds 1 et 2 checkpointés et loggés
+    fits = []
+    with pytest.raises(Killed):
+        _execute(_use_case(tracker, tmp_path, fits, kill_at=3), resume=False)
+
+    fits = []
+    result = _execute(_use_case(tracker, tmp_path, fits), resume=True)
+    assert len(fits) == N_SPLITS - 2
+
+    # Une seule run, rouverte par la reprise
+    assert list(tracker.metrics) == ["run-1"]
+    counts = Counter(tracker.metrics["run-1"])
+    for fold in range(1, N_SPLITS + 1):
+        assert counts[f"map_3_fold{fold}"] == 1
+    assert counts["map_3_mean"] == 1
+    assert counts["resumed_folds"] == 1
+    assert len(result.fold_scores) == N_SPLITS
+
+    # CV terminée : checkpoints supprimés
+    assert not any(tmp_path.rglob("fold_*.joblib"))
+
+
+def test_checkpoints_are_kept_until_the_cv_completes(tmp_path):
+    tracker = FakeTracker()
+
+    with pytest.raises(Killed):
+        _execute(_use_case(tracker, tmp_path, [], kill_at=3), resume=False)
+    assert len(list(tmp_path.rglob("fold_*.joblib"))) == 2
+
+    _execute(_use_case(tracker, tmp_path, []), resume=True)
+    assert list(tmp_path.iterdir()) == []
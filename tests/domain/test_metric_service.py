@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from fertilizer_recommender.domain.services.metric_service import (
+    average_precision_at_k,
+    map_at_k,
+    map_at_k_indices,
+)
+
+LABELS = ["10-26-26", "14-35-14", "17-17-17", "20-20", "28-28", "DAP", "Urea"]
+
+
+def _reference(y_true, y_pred_topk, k):
+    return float(np.mean([average_precision_at_k(t, p, k=k) for t, p in zip(y_true, y_pred_topk)]))
+
+
+def _random_case(seed, n=500, width=3, vocabulary=LABELS):
+    rng = np.random.default_rng(seed)
+    y_true = list(rng.choice(LABELS, n))
+    y_pred = [list(rng.choice(vocabulary, width)) for _ in range(n)]  # doublons possibles
+    return y_true, y_pred
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("seed", range(5))
+def test_map_at_k_matches_reference_on_random_data(k, seed):
+    y_true, y_pred = _random_case(seed, width=5)
+
+    assert map_at_k(y_true, y_pred, k=k) == pytest.approx(_reference(y_true, y_pred, k))
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4, 5])
+def test_map_at_k_indices_matches_reference(k):
+    rng = np.random.default_rng(42)
+    y_true_idx = rng.integers(0, 7, 400)
+    topk_idx = rng.integers(-1, 7, (400, 5))
+
+    expected = _reference(y_true_idx.tolist(), topk_idx.tolist(), k)
+    assert map_at_k_indices(y_true_idx, topk_idx, k=k) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4, 5])
+def test_duplicates_in_a_prediction_row(k):
+    y_true = ["DAP", "DAP", "Urea", "28-28"]
+    y_pred = [
+        ["DAP", "DAP", "DAP"],
+        ["Urea", "Urea", "DAP"],
+        ["DAP", "Urea", "Urea", "Urea", "Urea"],
+        ["Urea", "Urea", "Urea", "Urea", "28-28"],
+    ]
+
+    assert map_at_k(y_true, y_pred, k=k) == pytest.approx(_reference(y_true, y_pred, k))
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4, 5])
+def test_predictions_absent_from_the_vocabulary(k):
+    y_true, y_pred = _random_case(7, width=5, vocabulary=LABELS[:4] + ["Inconnu", "?", ""])
+
+    assert map_at_k(y_true, y_pred, k=k) == pytest.approx(_reference(y_true, y_pred, k))
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4, 5])
+def test_short_and_ragged_rows(k):
+    rng = np.random.default_rng(3)
+    y_true = list(rng.choice(LABELS, 300))
+    y_pred = [list(rng.choice(LABELS, rng.integers(0, 6))) for _ in range(300)]
+
+    assert map_at_k(y_true, y_pred, k=k) == pytest.approx(_reference(y_true, y_pred, k))
+
+
+@pytest.mark.parametrize("width", [0, 1, 2])
+def test_uniformly_short_rows(width):
+    y_true, y_pred = _random_case(11, width=width)
+
+    for k in range(1, 6):
+        assert map_at_k(y_true, y_pred, k=k) == pytest.approx(_reference(y_true, y_pred, k))
+
+
+def test_kaggle_examples():
+    assert map_at_k(["A"], [["B", "A", "C"]]) == pytest.approx(0.5)
+    assert map_at_k(["A", "B"], [["A", "B", "C"], ["C", "A", "D"]]) == pytest.approx(0.5)
+    assert map_at_k([], []) == 0.0
+
+
+def test_length_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        map_at_k(["A"], [["A"], ["B"]])
+    with pytest.raises(ValueError):
+        map_at_k_indices(np.array([0]), np.array([[0], [1]]))
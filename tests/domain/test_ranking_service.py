@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from fertilizer_recommender.domain.services import ranking_service
+from fertilizer_recommender.domain.services.ranking_service import (
+    join_top_k_labels,
+    predict_top_k,
+    top_k_indices,
+)
+
+
+def _reference(proba, k):
+    # Règle : probabilité décroissante, puis indice de classe croissant
+    return np.argsort(-np.asarray(proba), axis=1, kind="stable")[:, :k]
+
+
+@pytest.fixture(params=["forced", "many_classes"])
+def partial_path(request, monkeypatch):
+    """Nombre de classes pour lequel la sélection partielle (argpartition) est utilisée."""
+    if request.param == "forced":
+        monkeypatch.setattr(ranking_service, "_PARTIAL_SORT_MIN_CLASSES", 1)
+        return 7
+    return ranking_service._PARTIAL_SORT_MIN_CLASSES + 36
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5])
+def test_partial_selection_matches_stable_argsort(partial_path, k):
+    rng = np.random.default_rng(k)
+    proba = rng.dirichlet(np.ones(partial_path), size=500)
+
+    np.testing.assert_array_equal(top_k_indices(proba, k=k), _reference(proba, k))
+
+
+@pytest.mark.parametrize("k", [1, 3, 5])
+def test_partial_selection_breaks_ties_by_class_index(partial_path, k):
+    rng = np.random.default_rng(0)
+    # Peu de valeurs distinctes : nombreuses égalités, y compris au seuil du k-ième
+    proba = rng.integers(0, 3, size=(500, partial_path)).astype(np.float32) / 4
+    proba[0] = 0.25  # ligne entièrement à égalité
+    proba[1, :] = [np.inf if i % 3 == 0 else -np.inf for i in range(partial_path)]
+
+    np.testing.assert_array_equal(top_k_indices(proba, k=k), _reference(proba, k))
+
+
+@pytest.mark.parametrize("k", [1, 3])
+def test_nan_probabilities_rank_last(partial_path, k):
+    rng = np.random.default_rng(1)
+    proba = rng.random((200, partial_path))
+    proba[rng.random(proba.shape) < 0.2] = np.nan
+    proba[0] = np.nan
+
+    topk = top_k_indices(proba, k=k)
+
+    np.testing.assert_array_equal(topk, _reference(proba, k))
+    np.testing.assert_array_equal(topk[0], np.arange(k))
+
+
+def test_k_equal_to_or_above_n_classes(partial_path):
+    rng = np.random.default_rng(2)
+    proba = rng.integers(0, 4, size=(100, partial_path)).astype(np.float64)
+
+    for k in (partial_path, partial_path + 3):
+        np.testing.assert_array_equal(top_k_indices(proba, k=k), _reference(proba, partial_path))
+
+
+def test_compact_index_dtype():
+    proba = np.random.default_rng(0).random((10, 7))
+
+    assert top_k_indices(proba).dtype == np.int8
+    assert top_k_indices(np.random.default_rng(0).random((2, 300))).dtype == np.int16
+
+
+def test_labels_are_materialized_in_rank_order():
+    proba = np.array([[0.1, 0.5, 0.4], [0.3, 0.3, 0.4]])
+    labels = ["DAP", "Urea", "28-28"]
+
+    assert predict_top_k(proba, labels, k=2) == [["Urea", "28-28"], ["28-28", "DAP"]]
+    assert list(join_top_k_labels(top_k_indices(proba, k=3), labels)) == [
+        "Urea 28-28 DAP", "28-28 DAP Urea",
+    ]
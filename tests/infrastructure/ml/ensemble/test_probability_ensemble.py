@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from fertilizer_recommender.infrastructure.ml.ensemble.probability_ensemble import ProbabilityEnsemble
+from fertilizer_recommender.infrastructure.ml.models.booster_dataset_cache import BoosterDatasetCache
+from fertilizer_recommender.infrastructure.ml.models.lightgbm_multiclass import LightGBMMulticlass
+from fertilizer_recommender.infrastructure.ml.models.xgboost_multiclass import XGBoostMulticlass
+
+
+class _ModelPipeline:
+    """Pipeline minimal : pas de preprocessing, juste un modèle."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+
+def _fitted_members():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4)).astype(np.float32)
+    y = np.array(["DAP", "Urea", "28-28"])[rng.integers(0, 3, 300)]
+    members = [
+        LightGBMMulticlass(n_estimators=10, n_jobs=4, verbose=-1),
+        LightGBMMulticlass(n_estimators=10, n_jobs=4, verbose=-1, dataset_cache=BoosterDatasetCache()),
+        XGBoostMulticlass(n_estimators=10, n_jobs=4),
+        XGBoostMulticlass(n_estimators=10, n_jobs=4, dataset_cache=BoosterDatasetCache()),
+    ]
+    return X, [_ModelPipeline(model.fit(X, y)) for model in members]
+
+
+def _predict_threads(model):
+    if isinstance(model, LightGBMMulticlass):
+        return getattr(model, "predict_threads", None) or model.model.n_jobs
+    return model.model.n_jobs
+
+
+def _xgb_nthread(model):
+    booster = model.booster_ if model.booster_ is not None else model.model.get_booster()
+    return int(booster.save_config().split('"nthread":"')[1].split('"')[0])
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_thread_budget_never_mutates_shared_pipelines(n_workers):
+    X, pipelines = _fitted_members()
+    expected = [pipeline.predict_proba(X) for pipeline in pipelines]
+
+    ensemble = ProbabilityEnsemble(pipelines, n_workers=n_workers, thread_budget=2)
+    try:
+        proba = ensemble.predict_proba(X)
+    finally:
+        ensemble.close()
+
+    np.testing.assert_allclose(proba, np.mean(expected, axis=0), rtol=1e-5)
+    for pipeline, member in zip(pipelines, ensemble.pipelines):
+        assert member is not pipeline
+        assert _predict_threads(member.model) == ensemble.threads_per_member
+        assert pipeline.model.model.get_params()["n_jobs"] == 4
+        assert _predict_threads(pipeline.model) == 4
+        if isinstance(pipeline.model, XGBoostMulticlass):
+            pipeline.predict_proba(X)
+            assert _xgb_nthread(pipeline.model) == 4
+
+
+def test_no_thread_budget_keeps_pipelines_as_is():
+    _, pipelines = _fitted_members()
+
+    ensemble = ProbabilityEnsemble(pipelines)
+
+    assert all(member is pipeline for member, pipeline in zip(ensemble.pipelines, pipelines))
+
+
+@pytest.mark.parametrize("model_cls", [LightGBMMulticlass, XGBoostMulticlass])
+def test_with_n_threads_leaves_the_source_model_untouched(model_cls):
+    X, y = np.random.default_rng(0).normal(size=(100, 3)), np.array(["a", "b"] * 50)
+    kwargs = {"verbose": -1} if model_cls is LightGBMMulticlass else {}
+    model = model_cls(n_estimators=5, n_jobs=6, **kwargs).fit(X, y)
+
+    clone = model.with_n_threads(1)
+
+    assert model.model.get_params()["n_jobs"] == 6
+    assert getattr(model, "predict_threads", None) is None
+    np.testing.assert_allclose(clone.predict_proba(X), model.predict_proba(X))
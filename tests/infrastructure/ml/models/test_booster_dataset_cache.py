@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from fertilizer_recommender.infrastructure.ml.models.booster_dataset_cache import (
+    BoosterDatasetCache,
+    encode_labels,
+)
+from fertilizer_recommender.infrastructure.ml.models.lightgbm_multiclass import LightGBMMulticlass
+
+
+def test_encode_labels_uses_train_classes_for_eval_set():
+    classes, y_idx, (X_val, y_val_idx) = encode_labels(
+        ["b", "a", "c", "a"], ("X_val", ["c", "a"])
+    )
+
+    assert list(classes) == ["a", "b", "c"]
+    assert list(y_idx) == [1, 0, 2, 0]
+    assert X_val == "X_val"
+    assert list(y_val_idx) == [2, 0]
+
+
+@pytest.mark.parametrize("unknown", ["zz", "0"])
+def test_encode_labels_rejects_unknown_eval_labels(unknown):
+    with pytest.raises(ValueError, match=unknown):
+        encode_labels(["b", "a"], (None, ["a", unknown]))
+
+
+def test_lightgbm_cached_fit_rejects_unknown_eval_labels():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3)).astype(np.float32)
+    y = np.array(["DAP", "Urea"])[rng.integers(0, 2, 200)]
+    model = LightGBMMulticlass(
+        n_estimators=5, early_stopping_rounds=2, verbose=-1,
+        dataset_cache=BoosterDatasetCache(max_entries=2),
+    )
+
+    with pytest.raises(ValueError, match="28-28"):
+        model.fit(X, y, eval_set=(X[:10], np.array(["28-28"] * 10)))
+
+    model.fit(X, y, eval_set=(X[:50], y[:50]))
+    assert list(model.classes_) == ["DAP", "Urea"]
+    assert model.predict_proba(X).shape == (200, 2)
@@ -0,0 +1,65 @@
+import pickle
+
+import numpy as np
+import pytest
+
+pytest.importorskip("catboost")
+
+from fertilizer_recommender.infrastructure.ml.models.catboost_multiclass import CatBoostMulticlass
+
+LABELS = np.array(["DAP", "Urea", "28-28"])
+
+
+def _data(n, seed):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.normal(size=n),
+        rng.integers(0, 5, n),  # codes catégoriels (profil "native")
+        rng.normal(size=n),
+    ]).astype(np.float32)
+    X[rng.random(n) < 0.05, 1] = np.nan  # catégorie inconnue
+    y = LABELS[(X[:, 0] > 0).astype(int) + (np.nan_to_num(X[:, 1]) > 2)]
+    return X, y
+
+
+def _model(**kwargs):
+    return CatBoostMulticlass(
+        iterations=30, depth=3, cat_features=[1], verbose=False, thread_count=1,
+        allow_writing_files=False, **kwargs,
+    )
+
+
+def test_fit_predict_with_native_codes_and_early_stopping():
+    X, y = _data(500, 0)
+    X_val, y_val = _data(200, 1)
+
+    model = _model(early_stopping_rounds=5).fit(X, y, eval_set=(X_val, y_val))
+
+    assert 1 <= model.best_iteration_ <= 30
+    assert sorted(model.classes_) == sorted(LABELS)
+    # Pool de validation réutilisé une fois, puis relâché
+    proba = model.predict_proba(X_val.copy())
+    assert model._eval_pool is None
+    np.testing.assert_allclose(proba, model.predict_proba(X_val), rtol=1e-6)
+    assert proba.shape == (200, len(LABELS))
+
+
+def test_eval_pool_is_not_reused_for_another_matrix_nor_pickled():
+    X, y = _data(500, 0)
+    X_val, y_val = _data(200, 1)
+    model = _model(early_stopping_rounds=5).fit(X, y, eval_set=(X_val, y_val))
+
+    restored = pickle.loads(pickle.dumps(model))
+    assert restored._eval_pool is None
+
+    X_other, _ = _data(50, 2)
+    np.testing.assert_allclose(model.predict_proba(X_other), restored.predict_proba(X_other), rtol=1e-6)
+
+
+def test_sample_weight_without_eval_set():
+    X, y = _data(300, 0)
+
+    model = _model().fit(X, y, sample_weight=np.full(len(y), 2.0))
+
+    assert model.best_iteration_ is None
+    assert model.predict_proba(X).shape == (300, len(LABELS))
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from fertilizer_recommender.infrastructure.ml.models.booster_dataset_cache import BoosterDatasetCache
+from fertilizer_recommender.infrastructure.ml.models.xgboost_multiclass import XGBoostMulticlass
+
+LABELS = np.array(["10-26-26", "14-35-14", "17-17-17", "20-20", "28-28", "DAP", "Urea"])
+
+
+def _data(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5)).astype(np.float32)
+    y = LABELS[rng.integers(0, len(LABELS), n)]
+    return X, y
+
+
+def _model(dataset_cache=None):
+    return XGBoostMulticlass(
+        n_estimators=30,
+        max_depth=3,
+        tree_method="hist",
+        n_jobs=1,
+        early_stopping_rounds=5,
+        dataset_cache=dataset_cache,
+    )
+
+
+@pytest.mark.parametrize("dataset_cache", [None, BoosterDatasetCache(max_entries=4)])
+def test_fit_with_string_labels_and_early_stopping(dataset_cache):
+    X, y = _data()
+    X_val, y_val = _data(200, seed=1)
+
+    model = _model(dataset_cache).fit(X, y, eval_set=(X_val, y_val))
+
+    assert list(model.classes_) == list(LABELS)
+    assert 1 <= model.best_iteration_ <= 30
+    proba = model.predict_proba(X_val)
+    assert proba.shape == (200, len(LABELS))
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0, rtol=1e-5)
+
+
+@pytest.mark.parametrize("dataset_cache", [None, BoosterDatasetCache(max_entries=4)])
+def test_fit_without_eval_set(dataset_cache):
+    X, y = _data()
+
+    model = _model(dataset_cache).fit(X, y)
+
+    assert model.best_iteration_ is None
+    assert list(model.classes_) == list(LABELS)
+    assert model.predict_proba(X).shape == (len(X), len(LABELS))
+
+
+def test_cached_and_uncached_paths_predict_the_same():
+    X, y = _data()
+    X_val, y_val = _data(200, seed=1)
+
+    plain = _model().fit(X, y, eval_set=(X_val, y_val))
+    cached = _model(BoosterDatasetCache(max_entries=4)).fit(X, y, eval_set=(X_val, y_val))
+
+    assert plain.best_iteration_ == cached.best_iteration_
+    np.testing.assert_allclose(plain.predict_proba(X_val), cached.predict_proba(X_val), atol=1e-6)
+
+
+def test_unknown_validation_label_is_rejected():
+    X, y = _data()
+    X_val, y_val = _data(50, seed=1)
+    y_val[0] = "Inconnu"
+
+    with pytest.raises(ValueError, match="Inconnu"):
+        _model().fit(X, y, eval_set=(X_val, y_val))
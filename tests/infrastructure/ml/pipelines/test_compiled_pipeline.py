@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fertilizer_recommender.composition_root_complete import build_feature_pipeline
+from fertilizer_recommender.infrastructure.ml.pipelines.compiled_pipeline import CompiledFeatureBuilder
+from fertilizer_recommender.infrastructure.ml.pipelines.training_pipeline import TrainingPipeline
+from fertilizer_recommender.infrastructure.ml.preprocessors.matrix_layout import MatrixLayout
+from fertilizer_recommender.infrastructure.utils.app_config import FeaturesConfig
+
+SOILS = ["Sandy", "Loamy", "Black", "Red", "Clayey"]
+CROPS = ["Maize", "Sugarcane", "Cotton", "Tobacco", "Paddy"]
+
+
+class _LayoutModel:
+    """Modèle factice : impose seulement son format de matrice au preprocessing."""
+
+    def __init__(self, layout):
+        self.input_layout = layout
+
+
+def _raw(n, seed, soils=SOILS, crops=CROPS):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Temperature": rng.integers(20, 40, n),
+        "Humidity": rng.integers(50, 73, n),
+        "Moisture": rng.integers(25, 66, n),
+        "Soil Type": rng.choice(soils, n),
+        "Crop Type": rng.choice(crops, n),
+        "Nitrogen": rng.integers(0, 43, n),
+        "Potassium": rng.integers(0, 20, n),
+        "Phosphorous": rng.integers(0, 43, n),
+    })
+
+
+def _fitted(profile, layout):
+    features = FeaturesConfig(enable_ratios=True, enable_interactions=True)
+    feature_pipeline = build_feature_pipeline(features, profile=profile)
+    pipeline = TrainingPipeline(transformer=feature_pipeline, model=_LayoutModel(layout))
+    feature_pipeline.fit(_raw(2000, 0))
+    return feature_pipeline, CompiledFeatureBuilder.from_pipeline(pipeline)
+
+
+def _test_frame():
+    X_df = _raw(300, 1, soils=SOILS + ["Peaty"], crops=CROPS + ["Wheat"])  # catégories inconnues
+    X_df.loc[0, "Nitrogen"] = 0  # ratios : division par zéro
+    return X_df
+
+
+@pytest.mark.parametrize("profile", ["one_hot", "native"])
+@pytest.mark.parametrize("layout", [MatrixLayout(), MatrixLayout(dtype=np.float64, order="F")])
+def test_compiled_features_match_pandas_path_bit_for_bit(profile, layout):
+    feature_pipeline, compiled = _fitted(profile, layout)
+    X_df = _test_frame()
+
+    expected = np.asarray(feature_pipeline.transform(X_df, reuse_buffer=False))
+    records = X_df.to_dict(orient="records")
+
+    for actual in (
+        compiled.transform_columns({name: X_df[name].tolist() for name in compiled.input_columns}),
+        compiled.transform_columns(X_df),
+        compiled.transform_records(records),
+        np.vstack([compiled.transform_record(record) for record in records[:20]]),
+    ):
+        assert actual.dtype == expected.dtype
+        assert np.array_equal(actual, expected[: len(actual)], equal_nan=True)
+
+
+def test_unknown_categories_are_encoded_like_the_pandas_path():
+    for profile in ("one_hot", "native"):
+        feature_pipeline, compiled = _fitted(profile, MatrixLayout())
+        X_df = _test_frame()
+        X_df["Soil Type"] = "Peaty"
+
+        actual = compiled.transform_records(X_df.to_dict(orient="records"))
+        expected = np.asarray(feature_pipeline.transform(X_df, reuse_buffer=False))
+
+        assert np.array_equal(actual, expected, equal_nan=True)
+        if profile == "native":
+            n_numeric = len(compiled.numeric_features)
+            assert np.isnan(actual[:, n_numeric]).all()
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fertilizer_recommender.infrastructure.ml.pipelines.deduplicated_inference import HashRowDeduplicator
+
+
+def _frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    X_df = pd.DataFrame({
+        "Soil Type": rng.choice(["Sandy", "Loamy", "Black"], n),
+        "Nitrogen": rng.integers(0, 4, n).astype(float),
+        "Moisture": rng.integers(0, 3, n),
+    })
+    X_df.loc[rng.random(n) < 0.1, "Nitrogen"] = np.nan
+    return X_df
+
+
+@pytest.mark.parametrize("n", [1, 2, 50, 5000])
+def test_unique_rows_returns_first_occurrences(n):
+    X_df = _frame(n)
+
+    positions, inverse = HashRowDeduplicator().unique_rows(X_df)
+
+    expected = np.flatnonzero(~X_df.duplicated(keep="first").to_numpy())
+    np.testing.assert_array_equal(positions, expected)
+    # Chaque ligne pointe vers une ligne unique identique
+    pd.testing.assert_frame_equal(
+        X_df.iloc[positions[inverse]].reset_index(drop=True), X_df.reset_index(drop=True)
+    )
+
+
+def test_apply_scatters_results_back_to_every_row():
+    X_df = _frame(2000, seed=1)
+    fn = lambda frame: frame["Moisture"].to_numpy()[:, None] * np.array([1.0, 2.0])
+
+    result = HashRowDeduplicator(min_ratio=1.0).apply(X_df, fn)
+
+    np.testing.assert_array_equal(result, fn(X_df))
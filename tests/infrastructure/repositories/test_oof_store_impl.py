@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from fertilizer_recommender.infrastructure.repositories.oof_store_impl import NpyOOFStore
+
+
+def test_round_trip(tmp_path):
+    store = NpyOOFStore(tmp_path)
+    writer = store.open_writer(
+        "run", row_index=np.array([10, 11, 12, 13]), y_idx=np.array([0, 1, 1, 0]), classes=["a", "b"],
+    )
+    writer.write_fold(1, np.array([0, 2]), np.array([[0.9, 0.1], [0.2, 0.8]]), ["a", "b"])
+    writer.write_fold(2, np.array([1, 3]), np.array([[1.0], [1.0]]), ["b"])
+    writer.close()
+
+    oof = store.load("run")
+    np.testing.assert_array_equal(oof.row_index, [10, 11, 12, 13])
+    np.testing.assert_array_equal(oof.fold_ids, [1, 2, 1, 2])
+    np.testing.assert_allclose(oof.proba, [[0.9, 0.1], [0.0, 1.0], [0.2, 0.8], [0.0, 1.0]])
+    assert store.list_runs() == ["run"]
+
+
+@pytest.mark.parametrize("row_index", [
+    np.array(["id-1", "id-2"]),
+    np.array(["id-1", "id-2"], dtype=object),
+    np.array([1.0, 2.0]),
+])
+def test_non_integer_row_index_is_rejected_before_writing(tmp_path, row_index):
+    store = NpyOOFStore(tmp_path)
+
+    with pytest.raises(ValueError, match="index des lignes doit être entier"):
+        store.open_writer("run", row_index=row_index, y_idx=np.array([0, 1]), classes=["a", "b"])
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,199 @@
+import threading
+import time
+
+import pytest
+
+from fertilizer_recommender.infrastructure.tracking.buffered_tracker import BufferedExperimentTracker
+
+
+class FakeBatchTracker:
+    """Tracker en mémoire : pile de runs (runs enfants) + journal des appels."""
+
+    def __init__(self, fail_runs=()):
+        self.calls = []
+        self.batches = []
+        self.fail_runs = set(fail_runs)
+        self._stack = []
+        self._n_runs = 0
+        self._lock = threading.Lock()
+
+    def setup_experiment(self, name):
+        return "0"
+
+    def start_run(self, run_name=None, nested=False, run_id=None):
+        self._n_runs += 1
+        self._stack.append(run_id or run_name or f"run-{self._n_runs}")
+
+    def active_run_id(self):
+        return self._stack[-1] if self._stack else None
+
+    def end_run(self):
+        self.calls.append(("end_run", self._stack.pop()))
+
+    def log_params(self, params):
+        self.calls.append(("log_params", dict(params)))
+
+    def log_metrics(self, metrics):
+        self.calls.append(("log_metrics", dict(metrics)))
+
+    def log_artifact(self, path):
+        self.calls.append(("log_artifact", path))
+
+    def log_batch(self, run_id, params, metrics, artifacts):
+        with self._lock:
+            if run_id in self.fail_runs:
+                self.fail_runs.discard(run_id)  # échoue une seule fois
+                raise ConnectionError(f"backend indisponible pour {run_id}")
+            batch = (run_id, dict(params), [(key, value) for key, value, _, _ in metrics], list(artifacts))
+            self.batches.append(batch)
+            self.calls.append(("log_batch", run_id))
+
+
+@pytest.fixture()
+def make_buffered():
+    created = []
+
+    def make(tracker, **kwargs):
+        kwargs.setdefault("max_batch_size", 1000)
+        kwargs.setdefault("flush_interval_s", 60.0)
+        buffered = BufferedExperimentTracker(tracker, **kwargs)
+        created.append(buffered)
+        return buffered
+
+    yield make
+    for buffered in created:
+        buffered.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition jamais atteinte"
+        time.sleep(0.01)
+
+
+def test_records_are_grouped_per_run_in_order_including_child_runs(make_buffered):
+    fake = FakeBatchTracker()
+    tracker = make_buffered(fake)
+
+    tracker.start_run("parent")
+    tracker.log_params({"model": "lgbm"})
+    tracker.log_metrics({"m1": 1.0})
+    fake.start_run("child", nested=True)  # run enfant ouverte sans flush
+    tracker.log_metrics({"c1": 10.0})
+    tracker.log_artifact("child.json")
+    tracker.log_metrics({"c2": 20.0})
+    fake.end_run()
+    tracker.log_metrics({"m2": 2.0, "m3": 3.0})
+    tracker.flush()
+
+    # Un lot par run, dans l'ordre de première apparition ; ordre préservé dans chaque run
+    assert fake.batches == [
+        ("parent", {"model": "lgbm"}, [("m1", 1.0), ("m2", 2.0), ("m3", 3.0)], []),
+        ("child", {}, [("c1", 10.0), ("c2", 20.0)], ["child.json"]),
+    ]
+
+
+def test_failed_batch_is_retried_without_duplicating_written_runs(make_buffered):
+    fake = FakeBatchTracker(fail_runs={"b"})
+    tracker = make_buffered(fake)
+
+    fake.start_run("a")
+    tracker.log_metrics({"a1": 1.0})
+    fake.start_run("b", nested=True)
+    tracker.log_metrics({"b1": 2.0})
+    fake.start_run("c", nested=True)
+    tracker.log_metrics({"c1": 3.0})
+
+    with pytest.raises(ConnectionError):
+        tracker.flush()
+    assert [run for run, *_ in fake.batches] == ["a"]
+
+    tracker.flush()
+    assert [run for run, *_ in fake.batches] == ["a", "b", "c"]
+    assert fake.batches[1][2] == [("b1", 2.0)]
+
+    tracker.flush()  # plus rien en attente
+    assert len(fake.batches) == 3
+
+
+def test_end_run_flushes_synchronously_before_closing_the_run(make_buffered):
+    fake = FakeBatchTracker()
+    tracker = make_buffered(fake)
+
+    tracker.start_run("run")
+    tracker.log_metrics({"score": 0.3})
+    assert fake.batches == []
+
+    tracker.end_run()
+
+    assert fake.calls == [("log_batch", "run"), ("end_run", "run")]
+
+
+def test_end_run_closes_the_run_even_if_the_write_fails(make_buffered):
+    fake = FakeBatchTracker(fail_runs={"run"})
+    tracker = make_buffered(fake)
+
+    tracker.start_run("run")
+    tracker.log_metrics({"score": 0.3})
+    with pytest.raises(ConnectionError):
+        tracker.end_run()
+
+    assert fake.calls == [("end_run", "run")]
+    tracker.flush()  # lot conservé, écrit au flush suivant
+    assert fake.batches == [("run", {}, [("score", 0.3)], [])]
+
+
+def test_background_flush_on_batch_size(make_buffered):
+    fake = FakeBatchTracker()
+    tracker = make_buffered(fake, max_batch_size=3)
+
+    tracker.start_run("run")
+    tracker.log_metrics({"m1": 1.0, "m2": 2.0})
+    tracker.log_metrics({"m3": 3.0})
+
+    _wait_for(lambda: fake.batches)
+    assert fake.batches == [("run", {}, [("m1", 1.0), ("m2", 2.0), ("m3", 3.0)], [])]
+
+
+def test_background_flush_after_interval(make_buffered):
+    fake = FakeBatchTracker()
+    tracker = make_buffered(fake, flush_interval_s=0.05)
+
+    tracker.start_run("run")
+    tracker.log_metrics({"m1": 1.0})
+
+    _wait_for(lambda: fake.batches)
+    assert fake.batches == [("run", {}, [("m1", 1.0)], [])]
+
+
+def test_close_drains_pending_records_and_writes_later_logs_immediately(make_buffered):
+    fake = FakeBatchTracker()
+    tracker = make_buffered(fake)
+
+    tracker.start_run("run")
+    tracker.log_metrics({"m1": 1.0})
+    tracker.close()
+    assert fake.batches == [("run", {}, [("m1", 1.0)], [])]
+
+    tracker.log_metrics({"m2": 2.0})
+    assert fake.batches[-1] == ("run", {}, [("m2", 2.0)], [])
+
+
+def test_logs_without_active_run_are_not_buffered(make_buffered):
+    fake = FakeBatchTracker()
+    tracker = make_buffered(fake)
+
+    tracker.log_params({"p": 1})
+    tracker.log_metrics({"m": 1.0})
+
+    assert fake.calls == [("log_params", {"p": 1}), ("log_metrics", {"m": 1.0})]
+    assert fake.batches == []
+
+
+def test_tracker_without_log_batch_is_rejected():
+    class NoBatch:
+        pass
+
+    with pytest.raises(TypeError, match="log_batch"):
+        BufferedExperimentTracker(NoBatch())
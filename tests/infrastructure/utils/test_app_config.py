@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from fertilizer_recommender.infrastructure.utils.app_config import clear_config_cache, load_app_config
+
+CONFIGS = Path(__file__).resolve().parents[3] / "configs"
+
+
+@pytest.fixture()
+def config():
+    clear_config_cache()
+    yield load_app_config(
+        CONFIGS / "training.yaml",
+        CONFIGS / "models.yaml",
+        CONFIGS / "features.yaml",
+        CONFIGS / "mlflow.yaml",
+    )
+    clear_config_cache()
+
+
+def test_shared_mappings_are_read_only(config):
+    model_name = next(iter(config.models.params))
+
+    with pytest.raises(TypeError):
+        config.models.params[model_name]["n_estimators"] = 1
+    with pytest.raises(TypeError):
+        config.features.model_profiles["lightgbm"] = "one_hot"
+    with pytest.raises(TypeError):
+        config.mlflow.tags["stage"] = "modifié"
+
+
+def test_model_params_returns_an_independent_mutable_copy(config):
+    model_name = next(iter(config.models.params))
+
+    params = config.models.model_params(model_name)
+    params["n_estimators"] = -1
+    params.setdefault("nested", {})["x"] = 1
+
+    assert isinstance(params, dict)
+    assert config.models.params[model_name].get("n_estimators") != -1
+    assert "nested" not in config.models.params[model_name]
+    assert config.models.model_params(model_name) != params
+
+
+def test_features_as_dict_is_plain(config):
+    as_dict = config.features.as_dict()
+
+    assert type(as_dict["model_profiles"]) is dict
+    assert as_dict["model_profiles"] == dict(config.features.model_profiles)
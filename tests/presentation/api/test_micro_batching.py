@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fertilizer_recommender.presentation.api.micro_batching import MicroBatcher
+
+
+class RecordingPredictor:
+    """predict_batch factice : double chaque élément, échoue sur les négatifs."""
+
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+
+    def __call__(self, items):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(list(items))
+        if any(item < 0 for item in items):
+            raise ValueError(f"entrée invalide dans {list(items)}")
+        return [2 * item for item in items]
+
+
+def _run(coro):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        return asyncio.run(coro(executor))
+
+
+def test_concurrent_requests_are_batched():
+    predictor = RecordingPredictor()
+
+    async def scenario(executor):
+        batcher = MicroBatcher(predictor, executor, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+        await batcher.stop()
+        return results
+
+    assert _run(scenario) == [2 * i for i in range(8)]
+    assert predictor.batches == [list(range(8))]
+
+
+def test_failed_batch_falls_back_to_per_request_calls():
+    predictor = RecordingPredictor()
+
+    async def scenario(executor):
+        batcher = MicroBatcher(predictor, executor, max_batch_size=3, max_wait_ms=50)
+        await batcher.start()
+        results = await asyncio.gather(
+            batcher.submit(1), batcher.submit(-1), batcher.submit(3), return_exceptions=True,
+        )
+        await batcher.stop()
+        return results
+
+    ok_1, error, ok_3 = _run(scenario)
+
+    assert (ok_1, ok_3) == (2, 6)
+    assert isinstance(error, ValueError)
+    assert predictor.batches[0] == [1, -1, 3]
+    assert sorted(predictor.batches[1:]) == [[-1], [1], [3]]
+
+
+def test_stop_resolves_queued_and_partially_collected_requests():
+    gate = threading.Event()
+    predictor = RecordingPredictor(gate=gate)
+
+    async def scenario(executor):
+        # Un seul slot occupé par le premier batch (bloqué) : les requêtes
+        # suivantes restent dans la file / le batch en cours de constitution
+        batcher = MicroBatcher(
+            predictor, executor, max_batch_size=2, max_wait_ms=10_000, max_concurrent_batches=1,
+        )
+        await batcher.start()
+        requests = [asyncio.ensure_future(batcher.submit(i)) for i in range(7)]
+        await asyncio.sleep(0.05)
+
+        stopping = asyncio.ensure_future(batcher.stop())
+        await asyncio.sleep(0.05)
+        gate.set()
+        await asyncio.wait_for(stopping, 5)
+
+        assert all(request.done() for request in requests)
+        with pytest.raises(RuntimeError, match="arrêté"):
+            await batcher.submit(99)
+        return [request.result() for request in requests]
+
+    assert _run(scenario) == [2 * i for i in range(7)]
+    assert sorted(item for batch in predictor.batches for item in batch) == list(range(7))
+    assert all(len(batch) <= 2 for batch in predictor.batches)
+
+
+def test_stop_fails_pending_requests_when_prediction_is_impossible():
+    predictor = RecordingPredictor()
+
+    async def scenario(executor):
+        batcher = MicroBatcher(predictor, executor, max_batch_size=4, max_wait_ms=10_000)
+        await batcher.start()
+        requests = [asyncio.ensure_future(batcher.submit(i)) for i in (1, -2)]
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(batcher.stop(), 5)
+        return await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), 5)
+
+    ok, error = _run(scenario)
+
+    assert ok == 2
+    assert isinstance(error, ValueError)
@@ -0,0 +1,49 @@
+"""
+Gate de démarrage : imports et `--help` mesurés dans un interpréteur neuf.
+
+FERTILIZER_IMPORT_BUDGET_SCALE multiplie les budgets (CI lente / partagée).
+"""
+
+import os
+
+import pytest
+
+from fertilizer_recommender.infrastructure.utils.import_budget import (
+    DEFAULT_HELP_BUDGET_MS,
+    DEFAULT_IMPORT_BUDGETS,
+    HEAVY_MODULES,
+    measure_help,
+    measure_import,
+)
+
+SCALE = float(os.environ.get("FERTILIZER_IMPORT_BUDGET_SCALE", "1"))
+
+# Points d'entrée qui parsent réellement --help. cli/{train,predict,evaluate,submit}.py
+# sont encore vides : à ajouter ici dès qu'ils existent. benchmark_matrix_layout
+# importe volontairement les boosters (outil de benchmark, pas une commande).
+CLI_MODULES = [
+    "fertilizer_recommender.presentation.cli.import_budget",
+    "fertilizer_recommender.presentation.api.load_test",
+]
+
+
+@pytest.mark.parametrize("module, budget_ms", sorted(DEFAULT_IMPORT_BUDGETS.items()))
+def test_import_stays_under_budget_without_heavy_libraries(module, budget_ms):
+    elapsed_ms, heavy = measure_import(module, repeats=3)
+
+    assert heavy == (), f"import {module} charge {heavy}"
+    assert elapsed_ms <= budget_ms * SCALE, f"import {module}: {elapsed_ms:.0f} ms > {budget_ms:.0f} ms"
+
+
+@pytest.mark.parametrize("module", CLI_MODULES)
+def test_cli_help_stays_under_budget_without_heavy_libraries(module):
+    elapsed_ms, heavy = measure_help(module, repeats=2)
+
+    assert heavy == (), f"{module} --help charge {heavy}"
+    assert elapsed_ms <= DEFAULT_HELP_BUDGET_MS * SCALE, (
+        f"{module} --help: {elapsed_ms:.0f} ms > {DEFAULT_HELP_BUDGET_MS:.0f} ms"
+    )
+
+
+def test_heavy_modules_cover_model_and_tracking_libraries():
+    assert {"lightgbm", "xgboost", "catboost", "mlflow"} <= set(HEAVY_MODULES)